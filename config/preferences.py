@@ -88,6 +88,22 @@ class Preferences:
     def set_base_path(self, path: str) -> None:
         """Define o caminho base."""
         self.set("base_path", path)
+
+    def get_log_levels(self) -> Dict[str, str]:
+        """Retorna os níveis mínimos de log ({'default': 'INFO', tool_key: nível})."""
+        return dict(self.get("log_levels", {}) or {})
+
+    def set_log_levels(self, levels: Dict[str, str]) -> None:
+        """Define os níveis mínimos de log."""
+        self.set("log_levels", dict(levels))
+
+    def get_log_limits(self) -> Dict[str, str]:
+        """Retorna os limites de frequência de log ({tool_key: '20/s' ou '1/100'})."""
+        return dict(self.get("log_limits", {}) or {})
+
+    def set_log_limits(self, limits: Dict[str, str]) -> None:
+        """Define os limites de frequência de log."""
+        self.set("log_limits", dict(limits))
     
     def reset(self) -> None:
         """Reseta as preferências para os valores padrão."""
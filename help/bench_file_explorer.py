@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do FileExplorer.
+
+Compara o walker atual (os.scandir + conjunto de extensões) com a
+implementação anterior (os.walk / os.listdir + os.path.isfile + any(endswith))
+em uma árvore sintética ou em uma pasta existente (ex: compartilhamento SMB),
+além da listagem paralela de subpastas. A opção --latency simula a latência
+de cada listagem de pasta de um disco de rede.
+
+Uso:
+    python help/bench_file_explorer.py                  # árvore sintética (100k arquivos)
+    python help/bench_file_explorer.py --files 20000    # árvore menor
+    python help/bench_file_explorer.py --path //servidor/share/fotos
+    python help/bench_file_explorer.py --files 20000 --latency 5 --workers 16
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.FileExplorer import FileExplorer  # noqa: E402
+
+EXTENSIONS = ['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp']
+OTHER_EXTENSIONS = ['.txt', '.pdf', '.docx', '.JPG', '.Png']
+
+
+class LatencyFileExplorer(FileExplorer):
+    """FileExplorer com atraso artificial por listagem de pasta."""
+
+    latency = 0.0
+
+    def scan_dir(self, dir_path, with_stat=False):
+        time.sleep(self.latency)
+        return super().scan_dir(dir_path, with_stat)
+
+
+def legacy_find_files(folder_path: str, extensions: List[str], recursive: bool) -> List[str]:
+    """Implementação anterior do FileExplorer.find_files (referência)."""
+    def matches(filename: str) -> bool:
+        filename_lower = filename.lower()
+        return any(filename_lower.endswith(ext.lower()) for ext in extensions)
+
+    files = []
+    if recursive:
+        for root, dirs, filelist in os.walk(folder_path):
+            for file in filelist:
+                if matches(file):
+                    files.append(os.path.join(root, file))
+    else:
+        for file in os.listdir(folder_path):
+            file_path = os.path.join(folder_path, file)
+            if os.path.isfile(file_path) and matches(file):
+                files.append(file_path)
+    return files
+
+
+def create_tree(root: str, total_files: int, files_per_dir: int = 200) -> None:
+    """Cria uma árvore sintética com `total_files` arquivos vazios."""
+    all_exts = EXTENSIONS + OTHER_EXTENSIONS
+    created = 0
+    dir_index = 0
+    while created < total_files:
+        # Três níveis de profundidade para simular uma árvore real
+        sub = os.path.join(root, f"a{dir_index % 10}", f"b{dir_index // 10 % 10}", f"c{dir_index}")
+        os.makedirs(sub, exist_ok=True)
+        for i in range(min(files_per_dir, total_files - created)):
+            ext = all_exts[(created + i) % len(all_exts)]
+            open(os.path.join(sub, f"file_{i}{ext}"), 'wb').close()
+        created += files_per_dir
+        dir_index += 1
+    # Arquivos na raiz para o modo não recursivo
+    for i in range(files_per_dir):
+        ext = all_exts[i % len(all_exts)]
+        open(os.path.join(root, f"root_{i}{ext}"), 'wb').close()
+
+
+def best_of(func: Callable[[], List[str]], repeat: int) -> tuple:
+    """Executa `func` `repeat` vezes e retorna (melhor tempo, resultado)."""
+    best = float('inf')
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(folder: str, repeat: int, latency_ms: float = 0.0, workers: int = 8) -> None:
+    """Executa o benchmark nos modos recursivo e não recursivo."""
+    LatencyFileExplorer.latency = latency_ms / 1000
+
+    if latency_ms == 0:
+        for recursive in (True, False):
+            explorer = FileExplorer(EXTENSIONS, recursive=recursive)
+            legacy_time, legacy = best_of(lambda: legacy_find_files(folder, EXTENSIONS, recursive), repeat)
+            new_time, new = best_of(lambda: explorer.find_files(folder), repeat)
+
+            assert sorted(legacy) == sorted(new), "Resultados divergentes entre as implementações"
+
+            mode = "recursivo" if recursive else "não recursivo"
+            print(f"[{mode}] {len(new)} arquivos encontrados")
+            print(f"  os.walk/listdir (anterior): {legacy_time * 1000:9.1f} ms")
+            print(f"  os.scandir (atual):         {new_time * 1000:9.1f} ms")
+            print(f"  ganho:                      {legacy_time / new_time:9.2f}x")
+
+    serial = LatencyFileExplorer(EXTENSIONS, recursive=True)
+    parallel = LatencyFileExplorer(EXTENSIONS, recursive=True, parallel=True, max_workers=workers)
+    serial_time, serial_files = best_of(lambda: serial.find_files(folder), repeat)
+    parallel_time, parallel_files = best_of(lambda: parallel.find_files(folder), repeat)
+
+    assert serial_files == parallel_files, "Ordem divergente entre a busca serial e a paralela"
+
+    print(f"[paralelo, {workers} threads, latência {latency_ms:g} ms/pasta] {len(parallel_files)} arquivos")
+    print(f"  serial:                     {serial_time * 1000:9.1f} ms")
+    print(f"  paralelo:                   {parallel_time * 1000:9.1f} ms")
+    print(f"  ganho:                      {serial_time / parallel_time:9.2f}x")
+
+
+def main() -> int:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark do FileExplorer")
+    parser.add_argument('--path', help="Pasta existente a usar (não é modificada)")
+    parser.add_argument('--files', type=int, default=100_000, help="Arquivos da árvore sintética")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições por medição")
+    parser.add_argument('--latency', type=float, default=0.0, help="Latência simulada por listagem (ms)")
+    parser.add_argument('--workers', type=int, default=8, help="Threads da listagem paralela")
+    args = parser.parse_args()
+
+    if args.path:
+        run(os.path.normpath(args.path), args.repeat, args.latency, args.workers)
+        return 0
+
+    tmp_dir = tempfile.mkdtemp(prefix="mtl_bench_fe_")
+    try:
+        print(f"Criando árvore sintética com {args.files} arquivos em {tmp_dir}...")
+        create_tree(tmp_dir, args.files)
+        run(tmp_dir, args.repeat, args.latency, args.workers)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
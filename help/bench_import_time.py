@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do tempo de importação dos módulos de utils.
+
+Cada módulo é importado em um processo Python novo (sem cache de módulos),
+várias vezes, e o menor tempo é reportado (sem a compilação para .pyc, que
+só ocorre na primeira vez). Também verifica se a importação
+cria arquivos na pasta de logs: importar um utilitário não deve gerar I/O
+de log até que algo seja de fato registrado.
+
+Uso:
+    python help/bench_import_time.py
+    python help/bench_import_time.py --repeat 10 utils.LogUtils utils.FileExplorer
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+DEFAULT_MODULES = [
+    "utils.ToolKey",
+    "utils.LogUtils",
+    "utils.FileQuery",
+    "utils.FileIndex",
+    "utils.FolderStats",
+    "utils.FileSortKeys",
+    "utils.FileExplorer",
+    "utils.DuplicateFinder",
+    "utils.ImageUtil",
+    "utils.PDFUtil",
+]
+
+# Executado no processo filho: mede a importação e lista a pasta de logs
+CHILD_CODE = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+log_dir = os.path.join(os.environ['LOCALAPPDATA'], 'MTL_UTIL', 'logs')
+files = os.listdir(log_dir) if os.path.isdir(log_dir) else []
+print(elapsed * 1000, len(files))
+"""
+
+
+def measure(module: str, repeat: int) -> tuple:
+    """
+    Importa o módulo em processos novos.
+
+    Returns:
+        Tupla (menor tempo em ms, arquivos criados na pasta de logs)
+    """
+    best = None
+    created = 0
+    for _ in range(repeat):
+        tmp_dir = tempfile.mkdtemp(prefix="mtl_bench_import_")
+        try:
+            env = dict(os.environ, LOCALAPPDATA=tmp_dir)
+            env.pop('PYTHONDONTWRITEBYTECODE', None)  # Medir sem o custo de recompilar
+            out = subprocess.run([sys.executable, "-c", CHILD_CODE.format(root=str(ROOT), module=module)],
+                                 env=env, capture_output=True, text=True, check=True).stdout.split()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        elapsed, files = float(out[0]), int(out[1])
+        best = elapsed if best is None else min(best, elapsed)
+        created = max(created, files)
+    return best, created
+
+
+def main() -> int:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description="Tempo de importação dos módulos de utils")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="Módulos a medir")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições por módulo")
+    args = parser.parse_args()
+
+    print(f"{'módulo':<24} {'importação':>12} {'arquivos de log':>16}")
+    for module in args.modules:
+        elapsed, created = measure(module, args.repeat)
+        print(f"{module:<24} {elapsed:9.1f} ms {created:>16}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
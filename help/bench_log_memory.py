@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de memória das entradas carregadas no LogViewer.
+
+Gera um arquivo de log sintético (no formato do LogUtils) e compara, ao
+carregar todas as linhas:
+- a representação anterior (um objeto LogEntry por entrada, com __dict__ e
+  todos os campos decodificados)
+- o LogEntryStore (colunas de códigos, timestamps compartilhados e linha
+  original com a mensagem decodificada sob demanda)
+
+A memória é medida com tracemalloc (só as estruturas das entradas; o
+índice de pesquisa fica de fora, igual nos dois casos). Também mede o custo
+de ler as mensagens das linhas visíveis e de ordenar pela mensagem.
+
+Uso:
+    python help/bench_log_memory.py                 # 1M linhas
+    python help/bench_log_memory.py --entries 200000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.LogSearch import LogSearchIndex
+from utils.LogStore import LogEntry, LogEntryStore
+from utils.LogUtils import RecordFormatter
+
+LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARNING", "ERROR"]
+TOOL_KEYS = ["system", "main_window", "file_index", "folder_stats", "duplicate_finder", "pdf_util"]
+CLASSES = ["LogUtils", "FileIndex", "FolderStats", "DuplicateFinder", "PDFUtil", "MainWindow", "Scanner"]
+
+
+class LegacyLogEntry:
+    """Representação anterior do LogViewer: um objeto com os campos decodificados."""
+    def __init__(self, data):
+        self.timestamp = data.get('timestamp', '')
+        self.level = data.get('level', 'INFO')
+        self.tool_key = data.get('tool_key', 'unknown')
+        self.class_name = data.get('class_name', 'Unknown')
+        self.message = data.get('message', '')
+        self.extra_data = data.get('extra_data', {})
+
+
+def write_log(path: Path, count: int) -> None:
+    """Grava um log sintético com o RecordFormatter (10 entradas por segundo)."""
+    formatter = RecordFormatter()
+    rng = random.Random(42)
+    start = time.time() - count / 10
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            extra = {"arquivo": f"img_{i % 5000}.png", "tamanho": rng.randint(1, 10 ** 7)} if i % 5 == 0 else None
+            record = (start + i / 10, rng.choice(LEVELS), rng.choice(TOOL_KEYS), rng.choice(CLASSES),
+                      f"Processando arquivo img_{i % 5000}.png (número {i})", extra)
+            f.write(formatter.format(record))
+
+
+def measure(load) -> tuple:
+    """
+    Carrega as entradas duas vezes: o tempo sem tracemalloc (que deixa cada
+    alocação mais lenta) e a memória com ele.
+
+    Returns:
+        Tupla (entradas carregadas, bytes alocados, segundos)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    entries = load()
+    elapsed = time.perf_counter() - start
+    del entries
+
+    gc.collect()
+    tracemalloc.start()
+    entries = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return entries, size, elapsed
+
+
+def load_legacy(path: Path) -> list:
+    """Carregamento anterior: um LegacyLogEntry e o texto de pesquisa (descartado aqui) por linha."""
+    entries = []
+    with open(path, 'rb') as f:
+        for line in f:
+            entry = LegacyLogEntry(json.loads(line))
+            LogSearchIndex.entry_text(entry.timestamp, entry.tool_key, entry.class_name,
+                                      entry.level, entry.message)
+            entries.append(entry)
+    return entries
+
+
+def load_store(path: Path) -> LogEntryStore:
+    """Carregamento atual: linhas no LogEntryStore (o texto de pesquisa é descartado aqui)."""
+    store = LogEntryStore()
+    with open(path, 'rb') as f:
+        for line in f:
+            store.add_line(line)
+    return store
+
+
+def run(count: int) -> None:
+    """Executa o benchmark."""
+    tmp_dir = Path(tempfile.mkdtemp(prefix="mtl_bench_memory_"))
+    path = tmp_dir / "mtl_util_bench.log"
+    try:
+        write_log(path, count)
+        print(f"{count} linhas, arquivo de {path.stat().st_size / 2 ** 20:.1f} MB")
+        print(f"  {'representação':<26} {'memória':>10} {'por entrada':>12} {'carga':>9}")
+
+        results = {}
+        for label, load in (("LogEntry com __dict__", load_legacy), ("LogEntryStore", load_store)):
+            entries, size, elapsed = measure(lambda: load(path))
+            results[label] = entries
+            print(f"  {label:<26} {size / 2 ** 20:7.1f} MB {size / count:9.0f} B {elapsed:7.2f} s")
+
+        legacy, store = results["LogEntry com __dict__"], results["LogEntryStore"]
+        rows = random.Random(1).sample(range(count), 50)
+        assert all(LogEntry(store, i).message == legacy[i].message for i in rows)
+
+        # Linhas visíveis na tabela: decodificadas a cada pintura
+        start = time.perf_counter()
+        for i in rows:
+            store.message(i)
+        print(f"Mensagens de 50 linhas visíveis: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        indices = list(range(count))
+        start = time.perf_counter()
+        sorted(indices, key=lambda i: legacy[i].message)
+        legacy_sort = time.perf_counter() - start
+        start = time.perf_counter()
+        sorted(indices, key=store.sort_key('message'))
+        print(f"Ordenar pela mensagem: {legacy_sort:.2f} s (anterior), {time.perf_counter() - start:.2f} s (atual)")
+    finally:
+        path.unlink(missing_ok=True)
+        os.rmdir(tmp_dir)
+
+
+def main() -> int:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description="Memória das entradas do LogViewer")
+    parser.add_argument('--entries', type=int, default=1_000_000, help="Linhas do log gerado")
+    args = parser.parse_args()
+    run(args.entries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
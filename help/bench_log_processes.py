@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do log com processos filhos.
+
+Executa tarefas em um ProcessPoolExecutor, cada uma registrando várias
+mensagens, e compara:
+- cada filho abrindo e acrescentando no mesmo arquivo (comportamento sem
+  o modo multiprocesso)
+- filhos enviando os registros pela fila ao processo principal
+  (logger.process_pool_kwargs)
+
+Verifica se todas as linhas do arquivo são JSON válido e se nenhum
+registro foi perdido. Os logs são gravados em uma pasta temporária.
+
+Uso:
+    python help/bench_log_processes.py
+    python help/bench_log_processes.py --workers 8 --jobs 32 --records 5000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def legacy_job(log_file: str, job: int, records: int) -> None:
+    """Tarefa que grava direto no arquivo compartilhado (abrir/gravar/fechar)."""
+    for i in range(records):
+        entry = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "level": "DEBUG",
+                 "tool_key": "system", "class_name": "Bench",
+                 "message": f"Registro {i} da tarefa {job}", "extra_data": {"job_id": job}}
+        with open(log_file, 'a', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+            f.write('\n')
+
+
+def queue_job(job: int, records: int) -> None:
+    """Tarefa que registra pelo logger (enviado ao processo principal)."""
+    from utils.LogUtils import logger
+    with logger.job(job):
+        for i in range(records):
+            logger.debug("system", "Bench", "Registro %d da tarefa %d", i, job)
+
+
+def check_file(log_file: Path) -> tuple:
+    """Conta linhas válidas e inválidas de registros do benchmark."""
+    valid = invalid = 0
+    with open(log_file, encoding='utf-8') as f:
+        for line in f:
+            try:
+                if json.loads(line).get("class_name") == "Bench":
+                    valid += 1
+            except ValueError:
+                invalid += 1
+    return valid, invalid
+
+
+def run(workers: int, jobs: int, records: int) -> None:
+    """Executa o benchmark."""
+    from utils.LogUtils import LogUtils, logger
+
+    expected = jobs * records
+    LogUtils.MAX_FILE_BYTES = 0  # Sem rotação: todos os registros no mesmo arquivo
+    logger.LOG_DIR.mkdir(parents=True, exist_ok=True)
+    legacy_file = logger.LOG_DIR / "legacy_shared.log"
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(legacy_job, [str(legacy_file)] * jobs, range(jobs), [records] * jobs))
+    legacy_time = time.perf_counter() - start
+    legacy_valid, legacy_invalid = check_file(legacy_file)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, **logger.process_pool_kwargs()) as pool:
+        list(pool.map(queue_job, range(jobs), [records] * jobs))
+    logger.flush(timeout=60)
+    queue_time = time.perf_counter() - start
+    queue_valid, queue_invalid = check_file(logger._current_log_file)
+
+    print(f"{workers} processos, {jobs} tarefas x {records} registros = {expected} registros")
+    print(f"  arquivo compartilhado: {legacy_time:6.2f} s  "
+          f"{legacy_valid} válidos, {legacy_invalid} corrompidos")
+    print(f"  fila -> processo pai:  {queue_time:6.2f} s  "
+          f"{queue_valid} válidos, {queue_invalid} corrompidos")
+
+
+def main() -> int:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark do log com processos filhos")
+    parser.add_argument('--workers', type=int, default=4, help="Processos do pool")
+    parser.add_argument('--jobs', type=int, default=16, help="Tarefas")
+    parser.add_argument('--records', type=int, default=2000, help="Registros por tarefa")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="mtl_bench_logmp_")
+    try:
+        # Redirecionar o diretório de logs antes de importar LogUtils
+        os.environ['LOCALAPPDATA'] = tmp_dir
+        os.environ['MTL_UTIL_LOG_LEVEL'] = 'DEBUG'  # Os registros da tarefa são de DEBUG
+        run(args.workers, args.jobs, args.records)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da pesquisa do LogViewer.
+
+Gera entradas sintéticas e compara, por consulta:
+- a pesquisa anterior (montar a string em minúsculas de cada entrada e
+  procurar o texto, a cada tecla)
+- o LogSearchIndex (índice de trigramas por bloco)
+- a digitação de uma consulta letra a letra (refinamento incremental)
+
+Verifica se os resultados são iguais aos da pesquisa anterior.
+
+Limites: o índice descarta blocos de 256 entradas sem os trigramas da
+consulta; as entradas dos blocos restantes são comparadas uma a uma. Em
+1M entradas, consultas seletivas (nome de arquivo, número) ficam em
+~5-25 ms, mas consultas com muitos resultados (ex: 'info', 25% das
+entradas; 'erro ao ler', 2% espalhados por todos os blocos) e consultas
+de 1 a 4 letras presentes em quase todas as entradas examinam o log
+inteiro: ~90-170 ms. O debounce da pesquisa no LogViewer evita pagar esse
+custo a cada tecla.
+
+Uso:
+    python help/bench_log_search.py                 # 1M entradas
+    python help/bench_log_search.py --entries 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.LogSearch import LogSearchBlock, LogSearchIndex
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+TOOL_KEYS = ["system", "file_index", "pdf_util", "image_merger"]
+QUERIES = ["img_4242.png", "erro ao ler", "99999", "zzz", "info", "numero 12345"]
+SLOW_S = 0.1  # Meta por consulta em 1M entradas
+
+
+def make_entries(count: int) -> list:
+    """Entradas no formato (timestamp, tool_key, class_name, level, message)."""
+    entries = []
+    for i in range(count):
+        if i % 50 == 0:
+            message = f"Erro ao ler img_{i % 5000}.png: arquivo corrompido"
+        else:
+            message = f"Processando arquivo img_{i % 5000}.png (numero {i})"
+        entries.append((f"2026-01-01 {i // 3600000 % 24:02d}:{i // 60000 % 60:02d}:{i // 1000 % 60:02d}",
+                        TOOL_KEYS[i % 4], f"Classe{i % 7}", LEVELS[i % 4], message))
+    return entries
+
+
+def legacy_search(entries: list, text: str) -> list:
+    """Pesquisa anterior do LogViewer."""
+    text = text.lower()
+    result = []
+    for i, (timestamp, tool_key, class_name, level, message) in enumerate(entries):
+        searchable = f"{timestamp} {tool_key} {class_name} {level} {message}".lower()
+        if text in searchable:
+            result.append(i)
+    return result
+
+
+def run(count: int) -> None:
+    """Executa o benchmark."""
+    entries = make_entries(count)
+
+    start = time.perf_counter()
+    index = LogSearchIndex()
+    texts = [LogSearchIndex.entry_text(*entry) for entry in entries]
+    for block in LogSearchBlock.split(texts, LogSearchIndex.BLOCK_SIZE):
+        index.add_block(block)
+    build_time = time.perf_counter() - start
+
+    print(f"{count} entradas, índice montado em {build_time:.2f} s (uma vez por arquivo)")
+    print(f"  {'consulta':<16} {'resultados':>10} {'anterior':>11} {'índice':>11}")
+    slow = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        expected = legacy_search(entries, query)
+        legacy_time = time.perf_counter() - start
+
+        index.clear_last_search()
+        start = time.perf_counter()
+        result = index.search(query)
+        index_time = time.perf_counter() - start
+        assert result == expected, f"Resultado diferente para {query!r}"
+        print(f"  {query!r:<16} {len(result):>10} {legacy_time * 1000:8.1f} ms {index_time * 1000:8.1f} ms")
+        if index_time >= SLOW_S:
+            slow.append((query, len(result), index_time))
+
+    print("Digitação letra a letra (com refinamento)")
+    index.clear_last_search()
+    query = QUERIES[0]
+    for size in range(1, len(query) + 1):
+        start = time.perf_counter()
+        result = index.search(query[:size])
+        elapsed = time.perf_counter() - start
+        print(f"  {query[:size]!r:<16} {len(result):>10} {elapsed * 1000:20.1f} ms")
+        if elapsed >= SLOW_S:
+            slow.append((query[:size], len(result), elapsed))
+
+    if slow:
+        # Limite conhecido: poucos blocos descartados, comparação entrada a entrada
+        print(f"Acima de {SLOW_S * 1000:.0f} ms (resultados em quase todos os blocos):")
+        for query, found, elapsed in slow:
+            print(f"  {query!r:<16} {found / count:>9.1%} das entradas {elapsed * 1000:9.1f} ms")
+
+
+def main() -> int:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark da pesquisa do LogViewer")
+    parser.add_argument('--entries', type=int, default=1_000_000, help="Entradas geradas")
+    args = parser.parse_args()
+    run(args.entries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do LogUtils.
+
+Mede o custo por chamada de log no thread chamador, comparando a gravação
+em segundo plano atual com a implementação anterior (abrir o arquivo,
+json.dump e fechar a cada chamada), e o custo de chamadas abaixo do nível
+mínimo (f-string montada pelo chamador vs. formato preguiçoso) e de chamadas
+suprimidas por limite de frequência. Os logs são
+gravados em uma pasta temporária, sem tocar nos logs da aplicação.
+
+Uso:
+    python help/bench_log_utils.py                # 100k chamadas
+    python help/bench_log_utils.py --calls 20000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def legacy_log(log_file: Path, level: str, tool_key: str, class_name: str, message: str,
+               extra_data=None) -> None:
+    """Implementação anterior do LogUtils.log (referência)."""
+    log_entry = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "level": level,
+        "tool_key": tool_key,
+        "class_name": class_name,
+        "message": message,
+        "extra_data": extra_data or {}
+    }
+    with open(log_file, 'a', encoding='utf-8') as f:
+        json.dump(log_entry, f, ensure_ascii=False)
+        f.write('\n')
+
+
+def run(calls: int) -> None:
+    """Executa o benchmark."""
+    from utils.LogUtils import LogUtils
+
+    LogUtils.MAX_FILE_BYTES = 0  # Sem rotação: todos os registros no mesmo arquivo
+    log = LogUtils()
+    log.set_level("DEBUG")  # O padrão (INFO) descartaria os registros medidos
+    legacy_file = LogUtils.APPDATA_LOG_DIR / "legacy.log"
+    legacy_file.parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    for i in range(calls):
+        legacy_log(legacy_file, "DEBUG", "system", "Bench", f"Mensagem {i}")
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(calls):
+        log.debug("system", "Bench", f"Mensagem {i}")
+    call_time = time.perf_counter() - start
+    log.flush(timeout=60)
+    total_time = time.perf_counter() - start
+    log.close()
+
+    written = sum(1 for _ in open(log._current_log_file, encoding='utf-8'))
+    assert written >= calls, f"Apenas {written} de {calls} registros gravados"
+
+    # Chamadas descartadas pelo nível mínimo
+    log.set_level("INFO")
+    start = time.perf_counter()
+    for i in range(calls):
+        log.debug("system", "Bench", f"Mensagem {i} de {calls}")
+    eager_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(calls):
+        log.debug("system", "Bench", "Mensagem %d de %d", i, calls)
+    lazy_time = time.perf_counter() - start
+
+    # Chamadas suprimidas pelo limite de frequência
+    log.set_level("DEBUG")
+    log.set_rate_limit("system", per_second=10)
+    start = time.perf_counter()
+    for i in range(calls):
+        log.debug("system", "Bench", "Mensagem %d de %d", i, calls)
+    limited_time = time.perf_counter() - start
+    log.clear_rate_limit("system")
+
+    print(f"{calls} chamadas de log")
+    print(f"  abrir/gravar/fechar (anterior): {legacy_time / calls * 1e6:8.2f} µs/chamada")
+    print(f"  fila + thread (atual):          {call_time / calls * 1e6:8.2f} µs/chamada")
+    print(f"  até gravar tudo no disco:       {total_time / calls * 1e6:8.2f} µs/registro")
+    print("DEBUG desabilitado (nível INFO)")
+    print(f"  f-string:                       {eager_time / calls * 1e6:8.2f} µs/chamada")
+    print(f"  formato + args (preguiçoso):    {lazy_time / calls * 1e6:8.2f} µs/chamada")
+    print("Limite de 10/s no ponto de chamada")
+    print(f"  suprimidas:                     {limited_time / calls * 1e6:8.2f} µs/chamada")
+
+
+def main() -> int:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark do LogUtils")
+    parser.add_argument('--calls', type=int, default=100_000, help="Chamadas de log")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="mtl_bench_log_")
+    try:
+        # Redirecionar o diretório de logs antes de importar LogUtils
+        os.environ['LOCALAPPDATA'] = tmp_dir
+        run(args.calls)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Testes do DuplicateFinder.
+
+Cobre arquivos que não podem ser lidos em cada etapa de hash e hashes
+guardados no FileIndex para arquivos editados depois da indexação.
+
+Uso:
+    python -m pytest help/test_duplicate_finder.py
+    python help/test_duplicate_finder.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.DuplicateFinder import DuplicateFinder
+from utils.FileIndex import FileIndex
+
+# Maior que dois blocos parciais: passa pelo hash parcial e pelo completo
+SIZE = 5 * DuplicateFinder.PARTIAL_BYTES
+
+
+class UnreadableFinder(DuplicateFinder):
+    """DuplicateFinder em que um arquivo falha ao ser lido em uma das etapas."""
+
+    unreadable = None
+    phase = 'full'
+
+    @classmethod
+    def partial_hash(cls, path, size):
+        if cls.phase == 'partial' and path == cls.unreadable:
+            raise PermissionError(f"Acesso negado: {path}")
+        return super().partial_hash(path, size)
+
+    @classmethod
+    def full_hash(cls, path, stop_event=None):
+        if cls.phase == 'full' and path == cls.unreadable:
+            raise PermissionError(f"Acesso negado: {path}")
+        return super().full_hash(path, stop_event)
+
+
+def write_files(folder: str, contents: dict) -> dict:
+    """Grava os arquivos e devolve {nome: caminho}."""
+    paths = {}
+    for name, data in contents.items():
+        paths[name] = os.path.join(folder, name)
+        with open(paths[name], 'wb') as f:
+            f.write(data)
+    return paths
+
+
+def check_unreadable(phase: str) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = b'x' * SIZE
+        paths = write_files(tmpdir, {'a.bin': data, 'b.bin': data, 'c.bin': data})
+        UnreadableFinder.unreadable, UnreadableFinder.phase = paths['b.bin'], phase
+
+        groups = UnreadableFinder().find_duplicates(sorted(paths.values()))
+        assert groups == [[paths['a.bin'], paths['c.bin']]], groups
+        print(f"✓ Arquivo ilegível no hash {phase} sai da comparação: {len(groups)} grupo")
+
+
+def test_unreadable_in_partial_phase():
+    """Arquivo que não pode ser lido no hash parcial."""
+    check_unreadable('partial')
+
+
+def test_unreadable_in_full_phase():
+    """Arquivo que passa no hash parcial e não pode ser lido no completo."""
+    check_unreadable('full')
+
+
+def test_unreadable_pair_in_full_phase():
+    """Par em que um dos arquivos falha no hash completo: nenhum grupo."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = b'y' * SIZE
+        paths = write_files(tmpdir, {'a.bin': data, 'b.bin': data})
+        UnreadableFinder.unreadable, UnreadableFinder.phase = paths['b.bin'], 'full'
+
+        assert UnreadableFinder().find_duplicates(sorted(paths.values())) == []
+        print("✓ Par com arquivo ilegível no hash completo: nenhum grupo")
+
+
+def test_index_edited_in_place():
+    """Arquivo editado depois da indexação, sem mudar a pasta: os hashes guardados não valem mais."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        folder = os.path.join(tmpdir, 'fotos')
+        os.mkdir(folder)
+        data = b'z' * SIZE
+        paths = write_files(folder, {'a.bin': data, 'b.bin': data})
+        # Pasta antiga: fora da margem em que o índice sempre a relê
+        old = time.time_ns() - 3600 * 10 ** 9
+        os.utime(folder, ns=(old, old))
+        index = FileIndex(os.path.join(tmpdir, 'index.sqlite3'))
+        try:
+            finder = DuplicateFinder(index=index)
+            assert finder.find_in_folder(folder) == [[paths['a.bin'], paths['b.bin']]]
+
+            # Mesmo tamanho, conteúdo diferente no meio (fora do hash parcial)
+            with open(paths['b.bin'], 'r+b') as f:
+                f.seek(SIZE // 2)
+                f.write(b'w')
+            stat = os.stat(paths['b.bin'])
+            os.utime(paths['b.bin'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            os.utime(folder, ns=(old, old))
+
+            assert finder.find_in_folder(folder) == []
+            assert finder.last_stats['full_hashed'] == 1
+            print("✓ Arquivo editado no lugar é relido, apesar do índice da pasta")
+        finally:
+            index.close()
+
+
+def main():
+    """Executa todos os testes."""
+    for test in (test_unreadable_in_partial_phase, test_unreadable_in_full_phase,
+                 test_unreadable_pair_in_full_phase, test_index_edited_in_place):
+        test()
+    print("✅ TESTES DO DUPLICATEFINDER PASSARAM")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
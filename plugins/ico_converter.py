@@ -3,15 +3,13 @@ import sys
 from pathlib import Path
 from typing import List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from io import BytesIO
-from PIL import Image
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QCheckBox, QProgressBar, QFileDialog, QListWidget, QListWidgetItem,
     QSplitter, QGroupBox, QMessageBox, QScrollArea
 )
-from PySide6.QtGui import QPixmap, QImage, QFont
+from PySide6.QtGui import QPixmap, QFont
 from PySide6.QtCore import Qt, QTimer, QSize
 
 from src.base_plugin import BasePlugin
@@ -19,6 +17,9 @@ from src.plugin_ui_helper import PluginUIHelper, PluginContainer, PluginStyleShe
 from styles.ICOConverterStyles import ICOConverterStyles
 from utils.ImageUtil import ImageUtil, ImageFormats
 from utils.FileExplorer import FileExplorer
+from utils.FileIndex import FileIndex
+from utils.FolderWatcher import FolderWatcher
+from utils.QtImageUtil import QtImageUtil
 from utils.ToolKey import ToolKey
 from utils.LogUtils import logger
 
@@ -27,6 +28,7 @@ class ICOConverter(BasePlugin, PluginContainer):
     name = "ICO Converter"
     icon_name = "ico_converter"
     TOOL_KEY = ToolKey.ICO_CONVERTER
+    LOAD_BATCH_SIZE = 16  # Imagens adicionadas por ciclo do event loop
 
     def __init__(self):
         BasePlugin.__init__(self)
@@ -35,6 +37,9 @@ class ICOConverter(BasePlugin, PluginContainer):
         self.current_folder = None
         self.executor = None
         self.file_explorer = None
+        self._load_batches = None
+        self._loaded_count = 0
+        self.folder_watcher = None
         logger.info(self.TOOL_KEY, "ICOConverter", "Plugin ICO Converter inicializado")
 
     def create_widget(self, parent=None) -> QWidget:
@@ -48,7 +53,10 @@ class ICOConverter(BasePlugin, PluginContainer):
             from concurrent.futures import ThreadPoolExecutor
             self.executor = ThreadPoolExecutor(max_workers=4)
             # Inicializar FileExplorer com extensões suportadas
-            self.file_explorer = FileExplorer(ImageFormats.get_supported_extensions(), recursive=True)
+            self.file_explorer = FileExplorer(ImageFormats.get_supported_extensions(), recursive=True,
+                                              index=FileIndex.default())
+            self.folder_watcher = FolderWatcher(self.file_explorer)
+            self.folder_watcher.files_changed.connect(self._apply_folder_changes)
         
         w = QWidget(parent)
         layout = QVBoxLayout(w)
@@ -138,7 +146,7 @@ class ICOConverter(BasePlugin, PluginContainer):
         btn_refresh.setMaximumWidth(40)
         btn_refresh.setToolTip("Atualizar")
         btn_refresh.setStyleSheet(ICOConverterStyles.get_button_style())
-        btn_refresh.clicked.connect(self.load_images_from_current_folder)
+        btn_refresh.clicked.connect(self.refresh_current_folder)
         btn_layout.addWidget(btn_refresh)
 
         btn_clear = QPushButton("✕")
@@ -249,18 +257,109 @@ class ICOConverter(BasePlugin, PluginContainer):
         self.preferences.set("ico_converter_current_folder", folder)
 
     def load_images_from_current_folder(self) -> None:
-        """Carrega imagens da pasta atual usando FileExplorer."""
+        """
+        Carrega imagens da pasta atual usando FileExplorer.
+
+        As imagens são adicionadas em lotes conforme são encontradas,
+        sem esperar a varredura completa da árvore de pastas.
+        """
         logger.info(self.TOOL_KEY, "ICOConverter", f"Carregando imagens de: {self.current_folder}")
+        self._stop_loading()
+        self.folder_watcher.stop()
         self.image_list.clear()
+        self._loaded_count = 0
 
         try:
-            images = self.file_explorer.find_files(self.current_folder)
-            for img_path in images:
-                self.add_image_to_list(img_path)
+            self._load_batches = self.file_explorer.iter_batches(
+                self.current_folder, batch_size=self.LOAD_BATCH_SIZE
+            )
+            self._load_next_batch(self._load_batches)
+        except Exception as e:
+            self._load_batches = None
+            logger.error(self.TOOL_KEY, "ICOConverter", f"Erro ao carregar imagens: {e}")
+
+    def _load_next_batch(self, batches) -> None:
+        """Adiciona o próximo lote de imagens e agenda o seguinte."""
+        if batches is not self._load_batches:
+            return  # Carregamento substituído ou cancelado
 
-            logger.info(self.TOOL_KEY, "ICOConverter", f"Carregadas {len(images)} imagens")
+        try:
+            batch = next(batches, None)
         except Exception as e:
+            self._load_batches = None
             logger.error(self.TOOL_KEY, "ICOConverter", f"Erro ao carregar imagens: {e}")
+            return
+
+        if batch is None:
+            self._load_batches = None
+            logger.info(self.TOOL_KEY, "ICOConverter", f"Carregadas {self._loaded_count} imagens")
+            # A partir daqui, a lista acompanha a pasta apenas pelas diferenças
+            self.folder_watcher.start(self.current_folder, self._get_listed_paths())
+            return
+
+        for img_path in batch:
+            self.add_image_to_list(img_path)
+        self._loaded_count += len(batch)
+        QTimer.singleShot(0, lambda: self._load_next_batch(batches))
+
+    def refresh_current_folder(self) -> None:
+        """
+        Sincroniza a lista com a pasta atual.
+
+        Apenas arquivos novos ou removidos são aplicados; itens existentes
+        mantêm a miniatura.
+        """
+        if self._load_batches is not None:
+            return  # Carregamento em andamento já reflete a pasta
+
+        try:
+            found = self.file_explorer.find_files(self.current_folder)
+        except Exception as e:
+            logger.error(self.TOOL_KEY, "ICOConverter", f"Erro ao atualizar imagens: {e}")
+            return
+
+        found_set = set(found)
+        folder = os.path.normpath(self.current_folder).rstrip(os.sep) + os.sep
+        listed = self._get_listed_paths()
+        listed_set = set(listed)
+
+        added = [p for p in found if p not in listed_set]
+        removed = [p for p in listed if p.startswith(folder) and p not in found_set]
+        self._apply_folder_changes(added, removed, [])
+
+        if not self.folder_watcher.is_active():
+            self.folder_watcher.start(self.current_folder)
+
+    def _apply_folder_changes(self, added: List[str], removed: List[str], modified: List[str]) -> None:
+        """Aplica à lista apenas as alterações detectadas na pasta."""
+        to_remove = set(removed)
+        to_refresh = set(modified)
+        if to_remove or to_refresh:
+            for i in range(self.image_list.count() - 1, -1, -1):
+                item = self.image_list.item(i)
+                path = item.data(Qt.UserRole)
+                if path in to_remove:
+                    self.image_list.takeItem(i)
+                elif path in to_refresh:
+                    pixmap = self._create_thumbnail(path)
+                    if pixmap:
+                        item.setIcon(pixmap)
+
+        for img_path in added:
+            self.add_image_to_list(img_path)
+
+        logger.debug(self.TOOL_KEY, "ICOConverter",
+                     f"Pasta atualizada: +{len(added)} -{len(removed)} ~{len(modified)}")
+
+    def _get_listed_paths(self) -> List[str]:
+        """Retorna os caminhos das imagens na lista."""
+        return [self.image_list.item(i).data(Qt.UserRole) for i in range(self.image_list.count())]
+
+    def _stop_loading(self) -> None:
+        """Cancela o carregamento progressivo em andamento, se houver."""
+        if self._load_batches is not None:
+            self._load_batches.close()
+            self._load_batches = None
 
     def _create_thumbnail(self, file_path: str, size: tuple = (160, 120)) -> QPixmap:
         """
@@ -273,16 +372,7 @@ class ICOConverter(BasePlugin, PluginContainer):
         Returns:
             QPixmap com a miniatura ou None se erro
         """
-        try:
-            img = Image.open(file_path)
-            img.thumbnail(size, Image.LANCZOS)
-            bio = BytesIO()
-            img.convert("RGBA").save(bio, format="PNG")
-            qimg = QImage.fromData(bio.getvalue())
-            return QPixmap.fromImage(qimg)
-        except Exception as e:
-            logger.warning(self.TOOL_KEY, "ICOConverter", f"Erro ao gerar thumbnail: {e}")
-            return None
+        return QtImageUtil.create_thumbnail(file_path, size)
 
     def add_image_to_list(self, path: str) -> None:
         """Adiciona uma imagem à lista."""
@@ -302,6 +392,8 @@ class ICOConverter(BasePlugin, PluginContainer):
 
     def clear_image_list(self) -> None:
         """Limpa a lista de imagens."""
+        self._stop_loading()
+        self.folder_watcher.stop()
         self.image_list.clear()
         logger.info(self.TOOL_KEY, "ICOConverter", "Lista de imagens limpa")
 
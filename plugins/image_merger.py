@@ -14,23 +14,26 @@ redimensionado proporcionalmente. Inclui:
 import os
 from typing import List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from io import BytesIO
 from pathlib import Path
-from PIL import Image
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QCheckBox, QProgressBar, QFileDialog, QListWidget, QListWidgetItem,
-    QSplitter, QGroupBox, QMessageBox, QSpinBox, QApplication
+    QSplitter, QGroupBox, QMessageBox, QSpinBox, QApplication, QComboBox
 )
-from PySide6.QtGui import QPixmap, QImage, QFont
+from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt, QTimer, QSize
 
 from src.base_plugin import BasePlugin
 from src.plugin_ui_helper import PluginUIHelper, PluginContainer, PluginStyleSheet
 from src.styles.ImageMergerStyles import ImageMergerStyles
 from utils.PDFUtil import PDFUtil
+from utils.DuplicateFinder import DuplicateFinder
 from utils.FileExplorer import FileExplorer
+from utils.FileIndex import FileIndex
+from utils.FileSortKeys import FileSortKeys
+from utils.FolderWatcher import FolderWatcher
+from utils.QtImageUtil import QtImageUtil
 from utils.ToolKey import ToolKey
 from utils.LogUtils import logger
 from config.preferences import Preferences
@@ -47,6 +50,8 @@ class ReorderableListWidget(QListWidget):
         self.setDefaultDropAction(Qt.MoveAction)
         self.setSelectionMode(QListWidget.ExtendedSelection)
         self.setIconSize(QSize(120, 80))
+        self._paths = set()
+        self.sort_keys = FileSortKeys(index=FileIndex.default())
 
     def dragEnterEvent(self, event):
         """Aceita drag de URLs (arquivos)."""
@@ -79,40 +84,84 @@ class ReorderableListWidget(QListWidget):
         exts = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp'}
         for p in paths:
             if os.path.isdir(p):
-                # Adicionar todos os arquivos da pasta
-                for fname in sorted(os.listdir(p)):
-                    fp = os.path.join(p, fname)
-                    if os.path.isfile(fp) and os.path.splitext(fname)[1].lower() in exts:
-                        self._add_item(fp)
+                # Adicionar todos os arquivos da pasta em ordem natural (page2 antes de page10)
+                explorer = FileExplorer(list(exts), recursive=False)
+                for fp in explorer.find_sorted(p, FileSortKeys.SORT_NAME, sort_keys=self.sort_keys):
+                    self._add_item(fp)
             else:
                 if os.path.isfile(p) and os.path.splitext(p)[1].lower() in exts:
                     self._add_item(p)
 
+    def add_entries(self, entries: List[Tuple[str, int, int]]) -> None:
+        """Adiciona arquivos já filtrados, registrando tamanho e data para ordenação."""
+        self.sort_keys.register(entries)
+        for path, _, _ in entries:
+            self._add_item(path)
+
+    def sort_paths(self, mode: str, reverse: bool = False) -> None:
+        """
+        Reordena a lista pelas chaves de ordenação.
+
+        Os itens (e miniaturas) são apenas reposicionados; com as chaves já
+        calculadas, não há acesso ao disco.
+        """
+        if mode not in FileSortKeys.SORT_MODES:
+            raise ValueError(f"Modo de ordenação inválido: {mode}")
+
+        items = {}
+        while self.count():
+            item = self.takeItem(self.count() - 1)
+            items[item.data(Qt.UserRole)] = item
+        for path in self.sort_keys.sort(items, mode, reverse):
+            self.addItem(items[path])
+
+    def clear(self) -> None:
+        """Remove todos os itens da lista."""
+        super().clear()
+        self._paths.clear()
+
     def _add_item(self, path: str) -> None:
         """Adiciona um item à lista (evita duplicatas)."""
         # Evitar duplicatas
-        for i in range(self.count()):
-            if self.item(i).data(Qt.UserRole) == path:
-                return
+        if path in self._paths:
+            return
+        self._paths.add(path)
 
         item = QListWidgetItem(os.path.basename(path))
         item.setToolTip(path)
         item.setData(Qt.UserRole, path)
 
-        # Tentar gerar thumbnail
-        try:
-            img = Image.open(path)
-            img.thumbnail((120, 80), Image.LANCZOS)
-            bio = BytesIO()
-            img.convert("RGBA").save(bio, format="PNG")
-            qimg = QImage.fromData(bio.getvalue())
-            pix = QPixmap.fromImage(qimg)
-            item.setIcon(QPixmap(pix))
-        except Exception:
-            pass  # Se falhar, apenas não mostra ícone
+        # Tentar gerar thumbnail (se falhar, apenas não mostra ícone)
+        pix = QtImageUtil.create_thumbnail(path, (120, 80))
+        if pix is not None:
+            item.setIcon(pix)
 
         self.addItem(item)
 
+    def remove_paths(self, paths: List[str]) -> None:
+        """Remove da lista os itens com os caminhos informados."""
+        to_remove = set(paths) & self._paths
+        if not to_remove:
+            return
+        for i in range(self.count() - 1, -1, -1):
+            if self.item(i).data(Qt.UserRole) in to_remove:
+                self.takeItem(i)
+        self._paths -= to_remove
+        self.sort_keys.forget(to_remove)
+
+    def refresh_thumbnails(self, paths: List[str]) -> None:
+        """Regera a miniatura dos itens com os caminhos informados."""
+        to_refresh = set(paths) & self._paths
+        if not to_refresh:
+            return
+        self.sort_keys.forget(to_refresh)
+        for i in range(self.count()):
+            item = self.item(i)
+            if item.data(Qt.UserRole) in to_refresh:
+                pix = QtImageUtil.create_thumbnail(item.data(Qt.UserRole), (120, 80))
+                if pix is not None:
+                    item.setIcon(pix)
+
     def get_ordered_paths(self) -> List[str]:
         """Retorna lista ordenada de caminhos."""
         return [self.item(i).data(Qt.UserRole) for i in range(self.count())]
@@ -124,6 +173,15 @@ class ImageMerger(BasePlugin, PluginContainer):
     name = "Image Merger"
     icon_name = "image_merger"
     TOOL_KEY = ToolKey.IMAGE_MERGER
+    LOAD_BATCH_SIZE = 16  # Imagens adicionadas por ciclo do event loop
+
+    # Opções de ordenação da lista: (rótulo, modo)
+    SORT_OPTIONS = [
+        ("Nome", FileSortKeys.SORT_NAME),
+        ("Data de captura", FileSortKeys.SORT_EXIF_DATE),
+        ("Data de modificação", FileSortKeys.SORT_MTIME),
+        ("Tamanho", FileSortKeys.SORT_SIZE),
+    ]
 
     def __init__(self):
         BasePlugin.__init__(self)
@@ -133,6 +191,12 @@ class ImageMerger(BasePlugin, PluginContainer):
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.file_explorer = None
         self.futures = {}
+        self._load_batches = None
+        self.folder_watcher = None
+        self._duplicates_future = None
+        self._sort_keys_future = None
+        self._sort_keys_paths = set()  # Itens cujas datas EXIF o future acima leu
+        self._sort_waiting = False
         logger.info(self.TOOL_KEY, "ImageMerger", "Plugin Image Merger inicializado")
 
     def create_widget(self, parent=None) -> QWidget:
@@ -146,8 +210,14 @@ class ImageMerger(BasePlugin, PluginContainer):
         self.current_folder = self.preferences.get_base_path()
         self.file_explorer = FileExplorer(
             extensions=['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp'],
-            recursive=False
+            recursive=False,
+            index=FileIndex.default()
         )
+        if self.folder_watcher is None:
+            self.folder_watcher = FolderWatcher(self.file_explorer)
+            self.folder_watcher.files_changed.connect(self._apply_folder_changes)
+        else:
+            self.folder_watcher.file_explorer = self.file_explorer
 
         w = QWidget(parent)
         layout = QVBoxLayout(w)
@@ -230,7 +300,7 @@ class ImageMerger(BasePlugin, PluginContainer):
         btn_refresh.setMaximumWidth(40)
         btn_refresh.setToolTip("Atualizar")
         btn_refresh.setStyleSheet(ImageMergerStyles.get_button_style())
-        btn_refresh.clicked.connect(self.load_images_from_current_folder)
+        btn_refresh.clicked.connect(self.refresh_current_folder)
         btn_layout.addWidget(btn_refresh)
 
         btn_clear = QPushButton("✕")
@@ -241,7 +311,24 @@ class ImageMerger(BasePlugin, PluginContainer):
         btn_clear.clicked.connect(self.clear_image_list)
         btn_layout.addWidget(btn_clear)
 
+        self.btn_duplicates = QPushButton("⧉")
+        self.btn_duplicates.setMinimumHeight(28)
+        self.btn_duplicates.setMaximumWidth(40)
+        self.btn_duplicates.setToolTip("Remover duplicadas da lista")
+        self.btn_duplicates.setStyleSheet(ImageMergerStyles.get_button_style())
+        self.btn_duplicates.clicked.connect(self.remove_duplicates)
+        btn_layout.addWidget(self.btn_duplicates)
+
         btn_layout.addStretch()
+
+        self.sort_combo = QComboBox()
+        self.sort_combo.setMinimumHeight(28)
+        self.sort_combo.setToolTip("Ordenar lista")
+        self.sort_combo.setStyleSheet(ImageMergerStyles.get_combo_style())
+        for label, mode in self.SORT_OPTIONS:
+            self.sort_combo.addItem(label, mode)
+        self.sort_combo.currentIndexChanged.connect(self.apply_sort)
+        btn_layout.addWidget(self.sort_combo)
         list_layout.addLayout(btn_layout)
 
         list_widget = QWidget()
@@ -354,16 +441,130 @@ class ImageMerger(BasePlugin, PluginContainer):
             logger.debug(self.TOOL_KEY, "ImageMerger", f"Pasta atual: {folder}")
 
     def load_images_from_current_folder(self) -> None:
-        """Carrega imagens da pasta atual."""
+        """
+        Carrega imagens da pasta atual progressivamente.
+
+        Os arquivos são adicionados em lotes a cada ciclo do event loop,
+        conforme o FileExplorer os encontra, mantendo a interface responsiva.
+        """
+        self._stop_loading()
+        self.folder_watcher.stop()
         self.image_list.clear()
+        self._sort_keys_future = None  # Datas lidas para a lista anterior
+        self._sort_keys_paths = set()
         if self.current_folder and os.path.isdir(self.current_folder):
-            files = self.file_explorer.find_files(self.current_folder)
-            for file_path in files:
-                self.image_list.add_files([file_path])
+            self._load_batches = self.file_explorer.iter_batches(
+                self.current_folder, batch_size=self.LOAD_BATCH_SIZE, with_stat=True
+            )
+            self._load_next_batch(self._load_batches)
+
+    def _load_next_batch(self, batches) -> None:
+        """Adiciona o próximo lote de imagens e agenda o seguinte."""
+        if batches is not self._load_batches:
+            return  # Carregamento substituído ou cancelado
+
+        batch = next(batches, None)
+        if batch is None:
+            self._load_batches = None
             logger.info(
                 self.TOOL_KEY, "ImageMerger",
                 f"Carregadas {self.image_list.count()} imagens de {self.current_folder}"
             )
+            self._prefetch_sort_keys()
+            self.apply_sort()
+            # A partir daqui, a lista acompanha a pasta apenas pelas diferenças
+            self.folder_watcher.start(self.current_folder, self.image_list.get_ordered_paths())
+            return
+
+        self.image_list.add_entries(batch)
+        QTimer.singleShot(0, lambda: self._load_next_batch(batches))
+
+    def apply_sort(self) -> None:
+        """
+        Reordena a lista pelo modo selecionado.
+
+        Por data EXIF, as datas são sempre lidas em segundo plano: a
+        ordenação é aplicada quando a leitura termina (sem travar a interface).
+        """
+        mode = self.sort_combo.currentData()
+        if mode == FileSortKeys.SORT_EXIF_DATE:
+            if self._sort_keys_future is None or not self._sort_keys_paths.issuperset(
+                    self.image_list.get_ordered_paths()):
+                self._prefetch_sort_keys()  # Itens novos ou alterados desde a última leitura
+            future = self._sort_keys_future
+            if future is not None and not future.done():
+                if not self._sort_waiting:
+                    self._sort_waiting = True
+                    QTimer.singleShot(100, self._apply_sort_when_ready)
+                return
+        self.image_list.sort_paths(mode)
+        logger.debug(self.TOOL_KEY, "ImageMerger",
+                     f"Lista ordenada por {mode}: {self.image_list.count()} imagens")
+
+    def _apply_sort_when_ready(self) -> None:
+        """Reaplica a ordenação que aguardava a leitura das datas EXIF."""
+        self._sort_waiting = False
+        self.apply_sort()
+
+    def _prefetch_sort_keys(self) -> None:
+        """
+        Lê em segundo plano as datas EXIF dos itens da lista, para que ordenar por data seja imediato.
+
+        O future fica guardado mesmo depois de concluído: apply_sort só
+        ordena por data EXIF quando ele termina.
+        """
+        paths = self.image_list.get_ordered_paths()
+        if not paths:
+            return
+        self._sort_keys_paths = set(paths)
+        self._sort_keys_future = self.executor.submit(
+            self.image_list.sort_keys.ensure, paths, FileSortKeys.SORT_EXIF_DATE
+        )
+
+    def refresh_current_folder(self) -> None:
+        """
+        Sincroniza a lista com a pasta atual.
+
+        Apenas arquivos novos ou removidos são aplicados; itens existentes
+        mantêm a posição e a miniatura.
+        """
+        if self._load_batches is not None:
+            return  # Carregamento em andamento já reflete a pasta
+        if not (self.current_folder and os.path.isdir(self.current_folder)):
+            return
+
+        found = self.file_explorer.find_files(self.current_folder)
+        found_set = set(found)
+        folder = os.path.normpath(self.current_folder)
+        listed = self.image_list.get_ordered_paths()
+        listed_set = set(listed)
+
+        added = [p for p in found if p not in listed_set]
+        removed = [p for p in listed if os.path.dirname(p) == folder and p not in found_set]
+        self._apply_folder_changes(added, removed, [])
+
+        if not self.folder_watcher.is_active():
+            self.folder_watcher.start(self.current_folder)
+
+    def _apply_folder_changes(self, added: List[str], removed: List[str], modified: List[str]) -> None:
+        """Aplica à lista apenas as alterações detectadas na pasta."""
+        if removed:
+            self.image_list.remove_paths(removed)
+        if added:
+            self.image_list.add_files(added)
+        if modified:
+            self.image_list.refresh_thumbnails(modified)
+            self._sort_keys_paths.difference_update(modified)  # Datas EXIF descartadas
+        logger.debug(
+            self.TOOL_KEY, "ImageMerger",
+            f"Pasta atualizada: +{len(added)} -{len(removed)} ~{len(modified)}"
+        )
+
+    def _stop_loading(self) -> None:
+        """Cancela o carregamento progressivo em andamento, se houver."""
+        if self._load_batches is not None:
+            self._load_batches.close()
+            self._load_batches = None
 
     def add_files_dialog(self) -> None:
         """Abre dialog para selecionar arquivos."""
@@ -379,9 +580,52 @@ class ImageMerger(BasePlugin, PluginContainer):
 
     def clear_image_list(self) -> None:
         """Limpa a lista de imagens."""
+        self._stop_loading()
+        self.folder_watcher.stop()
         self.image_list.clear()
+        self._sort_keys_future = None  # Datas lidas para a lista anterior
+        self._sort_keys_paths = set()
         logger.debug(self.TOOL_KEY, "ImageMerger", "Lista limpa")
 
+    def remove_duplicates(self) -> None:
+        """Procura imagens de conteúdo idêntico na lista e mantém só a primeira de cada grupo."""
+        paths = self.image_list.get_ordered_paths()
+        if len(paths) < 2 or self._duplicates_future is not None:
+            return
+
+        self.btn_duplicates.setEnabled(False)
+        finder = DuplicateFinder(index=FileIndex.default())
+        self._duplicates_future = self.executor.submit(finder.find_duplicates, paths)
+        QTimer.singleShot(100, self.check_duplicates_progress)
+
+    def check_duplicates_progress(self) -> None:
+        """Aguarda a busca de duplicadas e remove as cópias da lista (os arquivos não são apagados)."""
+        future = self._duplicates_future
+        if future is None:
+            return
+        if not future.done():
+            QTimer.singleShot(100, self.check_duplicates_progress)
+            return
+
+        self._duplicates_future = None
+        self.btn_duplicates.setEnabled(True)
+        try:
+            groups = future.result()
+        except Exception as e:
+            logger.error(self.TOOL_KEY, "ImageMerger", f"Erro ao procurar duplicadas: {e}")
+            QMessageBox.critical(QApplication.activeWindow(), "Erro", f"Erro ao procurar duplicadas:\n{e}")
+            return
+
+        copies = [path for group in groups for path in group[1:]]
+        self.image_list.remove_paths(copies)
+        logger.info(self.TOOL_KEY, "ImageMerger",
+                    f"{len(copies)} imagens duplicadas removidas da lista ({len(groups)} grupos)")
+        QMessageBox.information(
+            QApplication.activeWindow(), "Duplicadas",
+            f"{len(copies)} imagem(ns) duplicada(s) removida(s) da lista." if copies
+            else "Nenhuma imagem duplicada encontrada."
+        )
+
     def start_merge(self) -> None:
         """Inicia o processo de mesclagem."""
         paths = self.image_list.get_ordered_paths()
@@ -2,29 +2,228 @@
 LogViewer - Ferramenta para visualização e análise de logs da aplicação.
 """
 
+import functools
 import json
 import os
+import re
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Optional
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QAbstractItemView,
     QHeaderView, QLineEdit, QPushButton, QLabel, QComboBox, QSplitter,
-    QTextEdit, QGroupBox, QCheckBox, QWidget, QMenu, QListWidget, QListWidgetItem
+    QTextEdit, QGroupBox, QCheckBox, QWidget, QMenu, QListWidget, QListWidgetItem,
+    QProgressBar, QDialogButtonBox
+)
+from PySide6.QtCore import (
+    Qt, QTimer, QAbstractTableModel, QModelIndex, QThread, Signal, QFileSystemWatcher
 )
-from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor, QAction
 from utils.LogUtils import logger, LogLevel, LogUtils
+from utils.LogSearch import LogSearchBlock, LogSearchIndex
+from utils.LogStore import LogEntry, LogEntryStore
+from utils.LogTimeline import LogOffsetIndex, LogRangeReader, merge_readers
+
+
+class LogLoadThread(QThread):
+    """
+    Lê e interpreta arquivos de log em segundo plano, em blocos.
+
+    O primeiro bloco é pequeno para a tabela mostrar entradas logo; os
+    seguintes são maiores. Cada bloco vai acompanhado dos blocos do índice
+    de pesquisa, montados aqui para não ocupar a thread da interface.
+    Cancelado com requestInterruption().
+
+    Com intervalo de tempo ou índice lateral do LogUtils, cada arquivo é
+    indexado antes (LogOffsetIndex) e a contagem por nível é enviada logo,
+    sem interpretar as entradas; a leitura começa no trecho do intervalo.
+    Vários arquivos são combinados por timestamp à medida que são lidos.
+
+    Em um .log, uma última linha ainda sem quebra (sendo gravada) não é
+    lida; offset indica até onde o arquivo foi lido, para o modo acompanhar.
+    """
+
+    FIRST_CHUNK = 1000
+    CHUNK = 10000
+    PROGRESS_MAX = 1000
+
+    # Sinais: (bloco de entradas, blocos de pesquisa), (progresso 0..PROGRESS_MAX),
+    # (entradas por nível no período, pelo índice)
+    chunk_loaded = Signal(object, object)
+    progress = Signal(int)
+    level_counts = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, store: LogEntryStore, log_files: List[Path], start: Optional[str] = None,
+                 end: Optional[str] = None, parent=None):
+        """
+        Args:
+            store: Armazenamento que receberá os blocos (só seus códigos são usados aqui)
+            log_files: Arquivos a carregar (vários formam uma linha do tempo)
+            start: Timestamp inicial do intervalo, ou None
+            end: Timestamp final do intervalo (aceita prefixo), ou None
+        """
+        super().__init__(parent)
+        self.store = store
+        self.log_files = log_files
+        self.range_start = start
+        self.range_end = end
+        self.offset = 0
+        self._fraction = lambda: 0.0  # Fração lida, conforme o modo de leitura
+
+    def run(self):
+        try:
+            self._load(self._read_lines())
+        except Exception as e:
+            self.failed.emit(str(e))
+        self.progress.emit(self.PROGRESS_MAX)
+
+    def _load(self, lines):
+        """Interpreta as linhas (linha, arquivo de origem) e emite os blocos."""
+        chunk = self.store.chunk()
+        texts: List[str] = []
+        limit = self.FIRST_CHUNK
+        for line, source in lines:
+            text = chunk.add_line(line, source)
+            if text is not None:
+                texts.append(text)
+            if len(texts) >= limit:
+                if self.isInterruptionRequested():
+                    return
+                self.chunk_loaded.emit(chunk, LogSearchBlock.split(texts, LogSearchIndex.BLOCK_SIZE))
+                self.progress.emit(min(self.PROGRESS_MAX, int(self._fraction() * self.PROGRESS_MAX)))
+                chunk = self.store.chunk()
+                texts = []
+                limit = self.CHUNK
+        if texts and not self.isInterruptionRequested():
+            self.chunk_loaded.emit(chunk, LogSearchBlock.split(texts, LogSearchIndex.BLOCK_SIZE))
+
+    def _read_lines(self):
+        """Linhas do intervalo de tempo (combinadas por timestamp entre os arquivos)."""
+        readers = []
+        indexes = []
+        ranged = bool(self.range_start or self.range_end)
+        for log_file in self.log_files:
+            index = None
+            if ranged or LogOffsetIndex.has_sidecar(log_file):
+                index = LogOffsetIndex.for_file(log_file, self.isInterruptionRequested)
+                if index is None:
+                    return  # Cancelado durante a indexação
+            readers.append(LogRangeReader(log_file, self.range_start, self.range_end, index))
+            indexes.append(index)
+        if all(index is not None for index in indexes):
+            counts: Dict[str, int] = {}
+            for reader, index in zip(readers, indexes):
+                for level, count in index.level_counts(reader.start, reader.end).items():
+                    counts[level] = counts.get(level, 0) + count
+            self.level_counts.emit(counts)
+
+        total = max(1, sum(reader.total for reader in readers))
+        self._fraction = lambda: sum(reader.position - reader.begin for reader in readers) / total
+        if len(readers) == 1:
+            for _, line in readers[0]:
+                yield line, None
+        else:
+            for _, line, reader in merge_readers(readers):
+                yield line, reader.path.name
+        self.offset = readers[0].position
+
 
+class LogTableModel(QAbstractTableModel):
+    """
+    Modelo da tabela de logs sobre os índices das entradas filtradas.
 
-class LogEntry:
-    """Representa uma entrada de log."""
-    def __init__(self, data: Dict[str, Any]):
-        self.timestamp = data.get('timestamp', '')
-        self.level = data.get('level', 'INFO')
-        self.tool_key = data.get('tool_key', 'unknown')
-        self.class_name = data.get('class_name', 'Unknown')
-        self.message = data.get('message', '')
-        self.extra_data = data.get('extra_data', {})
+    Nenhum item é criado por linha: a view pede apenas as células visíveis
+    em data() (só elas têm a mensagem decodificada), e as cores vêm do papel
+    ForegroundRole.
+    """
+
+    HEADERS = ["Data/Hora", "ToolKey", "Classe", "Nível", "Mensagem"]
+    FIELDS = ["timestamp", "tool_key", "class_name", "level", "message"]
+
+    def __init__(self, tool_key_colors: Dict[str, str], level_colors: Dict[str, str], parent=None):
+        super().__init__(parent)
+        self._entries = LogEntryStore()
+        self._rows: List[int] = []  # Índices em _entries, na ordem exibida
+        self._tool_key_colors = {key: QColor(color) for key, color in tool_key_colors.items()}
+        self._level_colors = {key: QColor(color) for key, color in level_colors.items()}
+        self._default_color = QColor('#FFFFFF')
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def set_rows(self, entries: LogEntryStore, rows: List[int]) -> None:
+        """Substitui as entradas e os índices exibidos (mantém a ordenação atual)."""
+        self.beginResetModel()
+        self._entries = entries
+        self._rows = rows
+        self._sort_rows()
+        self.endResetModel()
+
+    def append_rows(self, rows: List[int]) -> None:
+        """Acrescenta índices de entradas (ex: blocos carregados em segundo plano)."""
+        if not rows:
+            return
+        if self._sort_column >= 0:
+            self.layoutAboutToBeChanged.emit()
+            self._rows.extend(rows)
+            self._sort_rows()
+            self.layoutChanged.emit()
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def newest_first(self) -> bool:
+        """Se a ordenação atual coloca as entradas novas no topo (data decrescente)."""
+        return self._sort_column == 0 and self._sort_order == Qt.DescendingOrder
+
+    def entry(self, row: int) -> LogEntry:
+        """Entrada exibida na linha."""
+        return LogEntry(self._entries, self._rows[row])
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._entries.value(self._rows[index.row()], self.FIELDS[index.column()])
+        if role == Qt.ForegroundRole:
+            column = index.column()
+            if column == 1:
+                tool_key = self._entries.value(self._rows[index.row()], 'tool_key')
+                return self._tool_key_colors.get(tool_key, self._default_color)
+            if column == 3:
+                level = self._entries.value(self._rows[index.row()], 'level')
+                return self._level_colors.get(level, self._default_color)
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        """Ordena os índices exibidos pela coluna (chamado pelo cabeçalho da view)."""
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._sort_rows()
+        self.layoutChanged.emit()
+
+    def _sort_rows(self) -> None:
+        """Aplica a ordenação escolhida aos índices (estável, sem copiar entradas)."""
+        if self._sort_column < 0:
+            return
+        self._rows.sort(key=self._entries.sort_key(self.FIELDS[self._sort_column]),
+                        reverse=self._sort_order == Qt.DescendingOrder)
 
 
 class LogViewer(QDialog):
@@ -45,7 +244,12 @@ class LogViewer(QDialog):
         'theme': '#F8C471',      # Laranja
         'icon_generator': '#82E0AA', # Verde limão
         'draggable_tab': '#F1948A', # Coral
-        'draggable_toolbar': '#AED6F1' # Azul gelo
+        'draggable_toolbar': '#AED6F1', # Azul gelo
+        'file_index': '#D7BDE2', # Lilás
+        'folder_watcher': '#A3E4D7', # Verde claro
+        'folder_stats': '#FAD7A0',  # Pêssego
+        'duplicate_finder': '#F5B7B1', # Rosa
+        'file_sort': '#ABEBC6'      # Verde pastel
     }
 
     # Cores para níveis de log
@@ -57,15 +261,26 @@ class LogViewer(QDialog):
         'CRITICAL': '#7C2D12'    # Marrom escuro
     }
 
+    SEARCH_DEBOUNCE_MS = 250
+    # Limites do período: prefixos de "AAAA-MM-DD HH:MM:SS"
+    RANGE_PATTERN = re.compile(r'\d{4}(-\d{2}(-\d{2}( \d{2}(:\d{2}(:\d{2})?)?)?)?)?')
+    TAIL_POLL_MS = 1000  # Verificação periódica no modo acompanhar (além do watcher)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         logger.info('main_window', 'LogViewer', 'Janela de visualização de logs aberta')
         self.setWindowTitle("Visualizador de Logs - MTL_UTIL")
         self.resize(1200, 800)
 
-        self.log_entries: List[LogEntry] = []
-        self.filtered_entries: List[LogEntry] = []
+        self.log_entries = LogEntryStore()
+        self.search_index = LogSearchIndex()
+        self._search_error = None
         self.current_log_file = None
+        self.loaded_files: List[Path] = []  # Arquivos exibidos (vários = linha do tempo)
+        self._loaded_range = (None, None)    # Período do carregamento atual
+        self._load_thread = None
+        self._cancelled_threads = set()  # Carregamentos cancelados ainda terminando
+        self._tail_offset = 0  # Bytes do arquivo atual já lidos
 
         # Coletar tool keys e classes disponíveis
         self.available_toolkeys = set()
@@ -104,9 +319,53 @@ class LogViewer(QDialog):
         self.file_combo = QComboBox()
         self.file_combo.currentTextChanged.connect(self._on_file_changed)
         file_layout.addWidget(self.file_combo)
+
+        # Modo acompanhar: lê só o que for acrescentado ao arquivo
+        self.follow_check = QCheckBox("Acompanhar")
+        self.follow_check.setToolTip("Exibir novas entradas conforme são gravadas no arquivo")
+        self.follow_check.toggled.connect(self._update_follow)
+        file_layout.addWidget(self.follow_check)
         file_layout.addStretch()
+
+        self.tail_watcher = QFileSystemWatcher(self)
+        self.tail_watcher.fileChanged.connect(self._read_appended)
+        self.tail_timer = QTimer(self)
+        self.tail_timer.setInterval(self.TAIL_POLL_MS)
+        self.tail_timer.timeout.connect(self._read_appended)
+
+        # Progresso do carregamento em segundo plano
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, LogLoadThread.PROGRESS_MAX)
+        self.load_progress.setTextVisible(False)
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.hide()
+        file_layout.addWidget(self.load_progress)
+        self.load_label = QLabel()
+        file_layout.addWidget(self.load_label)
         layout.addLayout(file_layout)
 
+        # Período e linha do tempo com vários arquivos
+        range_layout = QHBoxLayout()
+        range_layout.addWidget(QLabel("Período:"))
+        self.range_start_edit = QLineEdit()
+        self.range_end_edit = QLineEdit()
+        for label, edit in (("De", self.range_start_edit), ("Até", self.range_end_edit)):
+            edit.setPlaceholderText(f"{label}: AAAA-MM-DD HH:MM:SS")
+            edit.setToolTip("Data/hora completa ou prefixo (ex: 2026-10-19 14 = hora 14 inteira)")
+            edit.editingFinished.connect(self._on_range_changed)
+            range_layout.addWidget(edit)
+
+        self.timeline_btn = QPushButton("Linha do tempo...")
+        self.timeline_btn.setToolTip("Combinar vários arquivos de log por data/hora")
+        self.timeline_btn.clicked.connect(self._choose_timeline_files)
+        range_layout.addWidget(self.timeline_btn)
+        range_layout.addStretch()
+
+        # Contagem por nível, vinda do índice (antes de carregar as entradas)
+        self.level_counts_label = QLabel()
+        range_layout.addWidget(self.level_counts_label)
+        layout.addLayout(range_layout)
+
         # Filtros
         filters_group = QGroupBox("Filtros")
         filters_layout = QVBoxLayout(filters_group)
@@ -140,9 +399,20 @@ class LogViewer(QDialog):
         row2.addWidget(QLabel("Pesquisar:"))
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Buscar em todos os campos...")
-        self.search_edit.textChanged.connect(self._apply_filters)
+        self.search_edit.textChanged.connect(self._search_timer_start)
         row2.addWidget(self.search_edit)
 
+        self.regex_check = QCheckBox("Regex")
+        self.regex_check.setToolTip("Interpretar a pesquisa como expressão regular")
+        self.regex_check.toggled.connect(self._apply_filters)
+        row2.addWidget(self.regex_check)
+
+        # Pesquisa só depois de uma pausa na digitação
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._apply_filters)
+
         self.clear_btn = QPushButton("Limpar Filtros")
         self.clear_btn.clicked.connect(self._clear_filters)
         row2.addWidget(self.clear_btn)
@@ -151,26 +421,28 @@ class LogViewer(QDialog):
 
         layout.addWidget(filters_group)
 
-        # Tabela de logs
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Data/Hora", "ToolKey", "Classe", "Nível", "Mensagem"])
+        # Tabela de logs (virtualizada: só as linhas visíveis são consultadas)
+        self.model = LogTableModel(self.TOOL_KEY_COLORS, self.LEVEL_COLORS, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSortingEnabled(True)
         self.table.setAlternatingRowColors(True)
         # Tema escuro com linhas alternadas
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #000000;
                 alternate-background-color: #202124;
                 color: #ffffff;
                 gridline-color: #555555;
             }
-            QTableWidget::item {
+            QTableView::item {
                 border: none;
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #404040;
             }
             QHeaderView::section {
@@ -181,7 +453,7 @@ class LogViewer(QDialog):
                 font-weight: bold;
             }
         """)
-        self.table.itemSelectionChanged.connect(self._on_selection_changed)
+        self.table.selectionModel().selectionChanged.connect(self._on_selection_changed)
         layout.addWidget(self.table)
 
         return widget
@@ -206,12 +478,13 @@ class LogViewer(QDialog):
         # Criar diretório se não existir
         log_dir.mkdir(parents=True, exist_ok=True)
         
-        log_files = sorted(log_dir.glob("mtl_util_*.log"), key=lambda x: x.stat().st_mtime, reverse=True)
+        # Arquivos ativos (.log) e segmentos compactados (.log.gz)
+        log_files = logger.list_log_files()
 
         self.file_combo.clear()
         for log_file in log_files:
             # Formatar nome do arquivo para exibição
-            name = log_file.name.replace("mtl_util_", "").replace(".log", "").replace("_", " ")
+            name = log_file.name.replace("mtl_util_", "").replace(".log", "").replace(".gz", "").replace("_", " ")
             self.file_combo.addItem(f"{name} ({log_file.name})", str(log_file))
 
         if log_files:
@@ -225,35 +498,264 @@ class LogViewer(QDialog):
             self._load_log_file(Path(current_data))
 
     def _load_log_file(self, log_file: Path):
-        """Carrega as entradas de log de um arquivo específico."""
-        self.log_entries.clear()
+        """Inicia o carregamento em segundo plano das entradas de um arquivo."""
+        self._load_files([log_file])
+
+    def _load_files(self, log_files: List[Path]):
+        """Carrega arquivos no período escolhido (vários formam uma linha do tempo)."""
+        self._cancel_loading()
+        self.log_entries = LogEntryStore()
+        self.search_index = LogSearchIndex()
         self.available_toolkeys.clear()
         self.available_classes.clear()
-        self.current_log_file = log_file
-
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            entry = LogEntry(data)
-                            self.log_entries.append(entry)
-                            # Coletar tool keys e classes
-                            self.available_toolkeys.add(entry.tool_key)
-                            self.available_classes.add(entry.class_name)
-                        except json.JSONDecodeError:
-                            continue
-        except Exception as e:
-            logger.error('main_window', 'LogViewer', f'Erro ao carregar arquivo de log: {e}')
+        self.loaded_files = list(log_files)
+        self.current_log_file = log_files[0] if len(log_files) == 1 else None
+        self._tail_offset = 0
 
-        # Atualizar filtros com os valores disponíveis
         self._update_filter_options()
         self._apply_filters()
 
+        start, end = self._loaded_range = self._range()
+        thread = LogLoadThread(self.log_entries, self.loaded_files, start, end, self)
+        # O próprio thread vai junto para descartar blocos de carregamentos cancelados
+        thread.chunk_loaded.connect(functools.partial(self._on_chunk_loaded, thread))
+        thread.progress.connect(functools.partial(self._on_load_progress, thread))
+        thread.level_counts.connect(functools.partial(self._on_level_counts, thread))
+        thread.failed.connect(self._on_load_failed)
+        thread.finished.connect(functools.partial(self._on_load_finished, thread))
+        self._load_thread = thread
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.load_label.setText("Carregando...")
+        self.level_counts_label.clear()
+        thread.start()
+        self._update_follow()  # As novas linhas são lidas ao fim do carregamento
+
+    def _range(self):
+        """Limites (início, fim) do período, ou None; limites inválidos são destacados e ignorados."""
+        bounds = []
+        for edit in (self.range_start_edit, self.range_end_edit):
+            text = edit.text().strip()
+            valid = not text or self.RANGE_PATTERN.fullmatch(text) is not None
+            edit.setStyleSheet("" if valid else "border: 1px solid #EF4444;")
+            bounds.append(text if text and valid else None)
+        return tuple(bounds)
+
+    def _on_range_changed(self):
+        """Recarrega os arquivos exibidos quando o período muda."""
+        if self.loaded_files and self._range() != self._loaded_range:
+            self._load_files(self.loaded_files)
+
+    def _choose_timeline_files(self):
+        """Escolhe os arquivos combinados na linha do tempo."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Linha do tempo")
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("Arquivos combinados por data/hora:"))
+
+        files_list = QListWidget()
+        loaded = {str(log_file) for log_file in self.loaded_files}
+        for i in range(self.file_combo.count()):
+            item = QListWidgetItem(self.file_combo.itemText(i))
+            item.setData(Qt.UserRole, self.file_combo.itemData(i))
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if self.file_combo.itemData(i) in loaded else Qt.Unchecked)
+            files_list.addItem(item)
+        layout.addWidget(files_list)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec() != QDialog.Accepted:
+            return
+
+        # Do mais antigo ao mais recente: em timestamps iguais, vale a ordem dos arquivos
+        log_files = [Path(files_list.item(i).data(Qt.UserRole)) for i in reversed(range(files_list.count()))
+                     if files_list.item(i).checkState() == Qt.Checked]
+        if log_files:
+            self._load_files(log_files)
+
+    def _cancel_loading(self, wait: bool = False):
+        """
+        Interrompe o carregamento em andamento (troca de arquivo ou fechamento).
+
+        A thread cancelada é desconectada e termina sozinha (até o próximo
+        bloco), sem travar a interface; só com wait (fechamento da janela)
+        se espera por ela e pelas canceladas antes.
+        """
+        thread = self._load_thread
+        if thread is not None:
+            self._load_thread = None
+            for signal in (thread.chunk_loaded, thread.progress, thread.level_counts,
+                           thread.failed, thread.finished):
+                signal.disconnect()
+            thread.requestInterruption()
+            self._cancelled_threads.add(thread)
+            thread.finished.connect(functools.partial(self._on_cancelled_finished, thread))
+            if thread.isFinished():
+                self._on_cancelled_finished(thread)
+            self.load_progress.hide()
+            self.load_label.clear()
+
+        if wait:
+            for cancelled in list(self._cancelled_threads):
+                cancelled.wait()
+                self._on_cancelled_finished(cancelled)
+
+    def _on_cancelled_finished(self, thread: LogLoadThread):
+        """Libera uma thread de carregamento cancelada quando ela termina."""
+        if thread in self._cancelled_threads:
+            self._cancelled_threads.discard(thread)
+            thread.deleteLater()
+
+    def _on_load_progress(self, thread: LogLoadThread, value: int):
+        """Progresso do carregamento atual."""
+        if thread is self._load_thread:
+            self.load_progress.setValue(value)
+
+    def _on_chunk_loaded(self, thread: LogLoadThread, chunk: LogEntryStore,
+                         search_blocks: List[LogSearchBlock]):
+        """Acrescenta um bloco carregado e exibe as entradas que passam nos filtros."""
+        if thread is not self._load_thread:
+            return  # Bloco de um carregamento já cancelado
+        for block in search_blocks:
+            self.search_index.add_block(block)
+        self._append_entries(chunk)
+        self.load_label.setText(f"Carregando... {len(self.log_entries)} entradas")
+
+    def _on_level_counts(self, thread: LogLoadThread, counts: Dict[str, int]):
+        """Contagem por nível vinda do índice, antes das entradas (aproximada com intervalo)."""
+        if thread is self._load_thread:
+            self._show_level_counts(counts, approximate=any(self._loaded_range))
+
+    def _show_level_counts(self, counts: Dict[str, int], approximate: bool = False):
+        """Mostra as entradas por nível do período."""
+        order = {level.value: i for i, level in enumerate(LogLevel)}
+        levels = sorted(counts, key=lambda level: order.get(level, len(order)))
+        parts = [f"{level} {counts[level]}" for level in levels]
+        prefix = "≈ " if approximate and parts else ""
+        self.level_counts_label.setText(prefix + " · ".join(parts))
+
+    def _append_entries(self, chunk: LogEntryStore):
+        """Acrescenta um bloco de entradas (já no índice de pesquisa) e exibe as que passam nos filtros."""
+        start = len(self.log_entries)
+        self.log_entries.extend(chunk)
+
+        # As tabelas de valores são do armazenamento inteiro: só os valores novos mudam os filtros
+        toolkeys = set(self.log_entries.values('tool_key')) - self.available_toolkeys
+        classes = set(self.log_entries.values('class_name')) - self.available_classes
+        if toolkeys or classes:
+            self.available_toolkeys |= toolkeys
+            self.available_classes |= classes
+            self._update_filter_options()
+
+        # Rolagem automática só se o usuário estiver na ponta das entradas novas
+        bar = self.table.verticalScrollBar()
+        newest_first = self.model.newest_first()
+        at_edge = bar.value() <= bar.minimum() if newest_first else bar.value() >= bar.maximum()
+        rows = self._filter_rows(start)
+        self.model.append_rows(rows)
+        if at_edge and self.follow_check.isChecked():
+            if newest_first:
+                self.table.scrollToTop()
+            else:
+                self.table.scrollToBottom()
+        elif newest_first and rows:
+            # Linhas novas entraram acima: manter visíveis as mesmas entradas (rolagem por item)
+            bar.setValue(bar.value() + len(rows))
+
+    def _update_follow(self):
+        """Liga ou desliga o acompanhamento do arquivo atual."""
+        if self.tail_watcher.files():
+            self.tail_watcher.removePaths(self.tail_watcher.files())
+        log_file = self.current_log_file
+        # Arquivos compactados e períodos com fim não recebem novas entradas
+        follow = (self.follow_check.isChecked() and log_file is not None and log_file.suffix == '.log'
+                  and self._loaded_range[1] is None)
+        if follow:
+            self.tail_watcher.addPath(str(log_file))
+            self.tail_timer.start()
+            self._read_appended()
+        else:
+            self.tail_timer.stop()
+
+    def _read_appended(self):
+        """Lê as linhas acrescentadas ao arquivo desde a última leitura."""
+        log_file = self.current_log_file
+        if (self._load_thread is not None or log_file is None or not self.follow_check.isChecked()
+                or self._loaded_range[1] is not None):
+            return
+        try:
+            size = os.path.getsize(log_file)
+            if size < self._tail_offset:
+                self._load_log_file(log_file)  # Arquivo truncado: recarregar
+                return
+            if size == self._tail_offset:
+                return
+            with open(log_file, 'rb') as f:
+                f.seek(self._tail_offset)
+                data = f.read(size - self._tail_offset)
+        except OSError:
+            # O arquivo acompanhado foi compactado pela rotação: seguir o mais recente
+            self._load_logs()
+            return
+
+        end = data.rfind(b'\n') + 1  # A última linha pode estar incompleta
+        if not end:
+            return
+        self._tail_offset += end
+        chunk = self.log_entries.chunk()
+        texts = [text for text in map(chunk.add_line, data[:end].splitlines()) if text is not None]
+        if texts:
+            self.search_index.add(texts)
+            self._append_entries(chunk)
+            self._show_entry_count()
+
+    def _on_load_failed(self, error: str):
+        """Erro ao ler o arquivo no carregamento em segundo plano."""
+        logger.error('main_window', 'LogViewer', 'Erro ao carregar arquivo de log: %s', error)
+
+    def _on_load_finished(self, thread: LogLoadThread):
+        """Fim do carregamento em segundo plano."""
+        if thread is not self._load_thread:
+            return
+        thread.deleteLater()
+        self._load_thread = None
+        self._tail_offset = thread.offset
+        self._read_appended()
+        if any(self._loaded_range) or not self.level_counts_label.text():
+            # Intervalo de tempo (o índice conta os blocos inteiros das bordas)
+            # ou arquivos sem índice lateral: contagem exata das entradas carregadas
+            levels = self.log_entries.tables['level'].values
+            counts = Counter(map(levels.__getitem__, self.log_entries.columns['level']))
+            self._show_level_counts(counts)
+        self.load_progress.hide()
+        self._show_entry_count()
+
+    def _show_entry_count(self):
+        """Mostra o total de entradas (e de arquivos, na linha do tempo)."""
+        text = f"{len(self.log_entries)} entradas"
+        if len(self.loaded_files) > 1:
+            text += f" de {len(self.loaded_files)} arquivos"
+        self.load_label.setText(text)
+
+    def done(self, result: int):
+        """Interrompe o carregamento e o acompanhamento antes de fechar a janela."""
+        self.tail_timer.stop()
+        self._cancel_loading(wait=True)
+        super().done(result)
+
     def _update_filter_options(self):
         """Atualiza as opções dos filtros com os valores disponíveis nos logs."""
+        # Sem refiltrar a cada item inserido; quem chama aplica os filtros no final
+        self.toolkey_filter.blockSignals(True)
+        self.class_filter.blockSignals(True)
+
+        # Manter a seleção atual (as opções crescem durante o carregamento)
+        current_toolkey = self.toolkey_filter.currentData() or ""
+        current_class = self.class_filter.currentData() or ""
+
         # ToolKey filter
         self.toolkey_filter.clear()
         self.toolkey_filter.addItem("Todos", "")
@@ -266,67 +768,61 @@ class LogViewer(QDialog):
         for class_name in sorted(self.available_classes):
             self.class_filter.addItem(class_name, class_name)
 
+        self.toolkey_filter.setCurrentIndex(max(0, self.toolkey_filter.findData(current_toolkey)))
+        self.class_filter.setCurrentIndex(max(0, self.class_filter.findData(current_class)))
+
+        self.toolkey_filter.blockSignals(False)
+        self.class_filter.blockSignals(False)
+
+    def _search_timer_start(self):
+        """Reinicia a espera da pesquisa a cada tecla."""
+        self.search_timer.start()
+
     def _apply_filters(self):
         """Aplica os filtros atuais e atualiza a tabela."""
+        self.search_timer.stop()
+        self.model.set_rows(self.log_entries, self._filter_rows(0))
+        self.details_text.clear()
+
+    def _filter_rows(self, start: int) -> List[int]:
+        """Índices das entradas a partir de start que passam nos filtros atuais."""
         toolkey_filter = self.toolkey_filter.currentData() or ""
         class_filter = self.class_filter.currentData() or ""
         level_filter = self.level_combo.currentData() or ""
-        search_text = self.search_edit.text().lower()
+        search_text = self.search_edit.text()
+
+        # Pesquisa geral pelo índice; os demais filtros só sobre o resultado
+        candidates = range(start, len(self.log_entries))
+        if search_text:
+            try:
+                candidates = self.search_index.search(search_text, self.regex_check.isChecked(), start)
+                self._set_search_error(None)
+            except re.error as e:
+                self._set_search_error(str(e))
+                return []
+        else:
+            self._set_search_error(None)
 
-        self.filtered_entries = []
-        for entry in self.log_entries:
-            # Aplicar filtros
-            if toolkey_filter and entry.tool_key != toolkey_filter:
-                continue
-            if class_filter and entry.class_name != class_filter:
+        # Filtros por campo comparam os códigos das colunas
+        entries = self.log_entries
+        rows = candidates
+        for field, value in (('tool_key', toolkey_filter), ('class_name', class_filter), ('level', level_filter)):
+            if not value:
                 continue
-            if level_filter and entry.level != level_filter:
-                continue
-
-            # Filtro de pesquisa geral
-            if search_text:
-                searchable = f"{entry.timestamp} {entry.tool_key} {entry.class_name} {entry.level} {entry.message}".lower()
-                if search_text not in searchable:
-                    continue
-
-            self.filtered_entries.append(entry)
-
-        self._update_table()
-
-    def _update_table(self):
-        """Atualiza a tabela com as entradas filtradas."""
-        self.table.setRowCount(0)
-        self.table.setSortingEnabled(False)  # Desabilitar durante atualização
-
-        for row, entry in enumerate(self.filtered_entries):
-            self.table.insertRow(row)
-
-            # Data/Hora
-            time_item = QTableWidgetItem(entry.timestamp)
-            self.table.setItem(row, 0, time_item)
-
-            # ToolKey (texto colorido)
-            toolkey_item = QTableWidgetItem(entry.tool_key)
-            color = QColor(self.TOOL_KEY_COLORS.get(entry.tool_key, '#FFFFFF'))
-            toolkey_item.setForeground(color)
-            self.table.setItem(row, 1, toolkey_item)
-
-            # Classe
-            class_item = QTableWidgetItem(entry.class_name)
-            self.table.setItem(row, 2, class_item)
-
-            # Nível (texto colorido)
-            level_item = QTableWidgetItem(entry.level)
-            level_color = QColor(self.LEVEL_COLORS.get(entry.level, '#FFFFFF'))
-            level_item.setForeground(level_color)
-            self.table.setItem(row, 3, level_item)
-
-            # Mensagem
-            message_item = QTableWidgetItem(entry.message)
-            self.table.setItem(row, 4, message_item)
-
-        self.table.setSortingEnabled(True)  # Reabilitar ordenação
-        self.table.resizeColumnsToContents()
+            code = entries.code(field, value)
+            if code is None:
+                return []
+            column = entries.columns[field]
+            rows = [i for i in rows if column[i] == code]
+        return list(rows)
+
+    def _set_search_error(self, error: str = None):
+        """Destaca a caixa de pesquisa quando a expressão regular é inválida."""
+        if error == self._search_error:
+            return
+        self._search_error = error
+        self.search_edit.setStyleSheet("border: 1px solid #EF4444;" if error else "")
+        self.search_edit.setToolTip(f"Expressão regular inválida: {error}" if error else "")
 
     def _clear_filters(self):
         """Limpa todos os filtros."""
@@ -337,15 +833,14 @@ class LogViewer(QDialog):
 
     def _on_selection_changed(self):
         """Chamado quando a seleção da tabela muda."""
-        selected_rows = set()
-        for item in self.table.selectedItems():
-            selected_rows.add(item.row())
+        selected_rows = self.table.selectionModel().selectedRows()
 
         if len(selected_rows) == 1:
-            row = list(selected_rows)[0]
-            if row < len(self.filtered_entries):
-                entry = self.filtered_entries[row]
-                details = f"""Timestamp: {entry.timestamp}
+            row = selected_rows[0].row()
+            if row < self.model.rowCount():
+                entry = self.model.entry(row)
+                details = f"Arquivo: {entry.source}\n" if entry.source else ""
+                details += f"""Timestamp: {entry.timestamp}
 Tool Key: {entry.tool_key}
 Classe: {entry.class_name}
 Nível: {entry.level}
@@ -41,6 +41,8 @@ class MainWindow(QMainWindow):
 
         self.plugin_manager = PluginManager()
         self.preferences = Preferences()
+        logger.configure_levels(self.preferences.get_log_levels())
+        logger.configure_limits(self.preferences.get_log_limits())
         self.signal_manager = SignalManager()
         
         # Dicionário para rastrear widgets de plugins abertos
@@ -80,6 +82,13 @@ class MainWindow(QMainWindow):
         logs_action.triggered.connect(self._show_logs)
         help_menu.addAction(logs_action)
 
+        # Gravação de trace (spans e logs) para análise no Perfetto
+        self.trace_action = QAction("Gravar Trace (Perfetto)", self)
+        self.trace_action.setCheckable(True)
+        self.trace_action.setChecked(logger.is_tracing())
+        self.trace_action.toggled.connect(self._toggle_trace)
+        help_menu.addAction(self.trace_action)
+
     def _create_plugins_toolbar(self):
         """Cria a barra de ferramentas com ícones dos plugins na parte superior."""
         self.plugins_toolbar = DraggableToolBar("Plugins")
@@ -311,6 +320,21 @@ class MainWindow(QMainWindow):
     def _show_about(self):
         QMessageBox.information(self, "About", "Mini-IDE exemplo inspirado no Visual Studio\nFeito com PySide6")
 
+    def _toggle_trace(self, checked: bool):
+        """Inicia ou encerra a gravação de trace, exportando o arquivo ao encerrar."""
+        if checked:
+            logger.start_trace()
+            return
+
+        path = logger.stop_trace()
+        if path is not None:
+            QMessageBox.information(
+                self, "Trace",
+                f"Trace salvo em:\n{path}\n\nAbra em ui.perfetto.dev ou chrome://tracing."
+            )
+        else:
+            QMessageBox.warning(self, "Trace", "Não foi possível salvar o trace. Consulte os logs.")
+
     def _show_logs(self):
         """Abre a janela de visualização de logs."""
         logger.debug(self.TOOL_KEY, "MainWindow", "Abrindo visualizador de logs")
@@ -190,6 +190,25 @@ class ImageMergerStyles:
             }}
         """
 
+    @staticmethod
+    def get_combo_style() -> str:
+        """Estilo do QComboBox (ordenação)."""
+        return f"""
+            QComboBox {{
+                background-color: {ImageMergerStyles.COLOR_BG_PANEL};
+                color: {ImageMergerStyles.COLOR_FG_TEXT};
+                border: 1px solid {ImageMergerStyles.COLOR_BORDER};
+                border-radius: 4px;
+                padding: 4px;
+                min-width: 110px;
+            }}
+            QComboBox QAbstractItemView {{
+                background-color: {ImageMergerStyles.COLOR_BG_PANEL};
+                color: {ImageMergerStyles.COLOR_FG_TEXT};
+                selection-background-color: {ImageMergerStyles.COLOR_FG_HIGHLIGHT};
+            }}
+        """
+
     @staticmethod
     def get_splitter_style() -> str:
         """Estilo do QSplitter."""
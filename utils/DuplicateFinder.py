@@ -0,0 +1,292 @@
+"""
+DuplicateFinder - Localização de arquivos com conteúdo idêntico.
+
+Os arquivos são comparados em três etapas, cada uma eliminando candidatos
+antes da próxima, mais cara:
+1. Tamanho (sem leitura)
+2. Hash parcial do início e do fim do arquivo
+3. Hash completo, apenas para os que ainda coincidem
+
+A leitura roda em um pool de threads e os hashes podem ser guardados no
+FileIndex, evitando reler arquivos que não mudaram.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from utils.FileIndex import FileIndex
+from utils.LogUtils import logger
+from utils.ToolKey import ToolKey
+
+
+class DuplicateFinder:
+    """Encontra grupos de arquivos duplicados por tamanho, hash parcial e hash completo."""
+
+    TOOL_KEY = ToolKey.DUPLICATE_FINDER
+
+    PARTIAL_BYTES = 4096        # Bytes lidos do início e do fim no hash parcial
+    CHUNK_SIZE = 1024 * 1024    # Bloco de leitura do hash completo
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, index: Optional[FileIndex] = None, max_workers: Optional[int] = None,
+                 min_size: int = 1):
+        """
+        Inicializa o localizador.
+
+        Args:
+            index: Índice onde os hashes são guardados e reaproveitados (opcional)
+            max_workers: Threads de leitura (padrão: DEFAULT_MAX_WORKERS)
+            min_size: Tamanho mínimo considerado; o padrão ignora arquivos vazios
+        """
+        self.index = index
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.min_size = min_size
+        self.last_stats: Dict[str, int] = {}
+
+    @staticmethod
+    def _new_hash():
+        return hashlib.blake2b(digest_size=16)
+
+    @classmethod
+    def partial_hash(cls, path: str, size: int) -> Tuple[str, int, bool]:
+        """
+        Hash do início e do fim do arquivo.
+
+        Args:
+            path: Caminho do arquivo
+            size: Tamanho do arquivo
+
+        Returns:
+            Tupla (hash, bytes lidos, se o arquivo foi lido por inteiro)
+        """
+        digest = cls._new_hash()
+        with open(path, 'rb') as f:
+            if size <= 2 * cls.PARTIAL_BYTES:
+                data = f.read()
+                digest.update(data)
+                return digest.hexdigest(), len(data), True
+
+            head = f.read(cls.PARTIAL_BYTES)
+            f.seek(-cls.PARTIAL_BYTES, os.SEEK_END)
+            tail = f.read(cls.PARTIAL_BYTES)
+        digest.update(head)
+        digest.update(tail)
+        return digest.hexdigest(), len(head) + len(tail), False
+
+    @classmethod
+    def full_hash(cls, path: str, stop_event: Optional[threading.Event] = None) -> Tuple[Optional[str], int]:
+        """
+        Hash de todo o conteúdo do arquivo.
+
+        Returns:
+            Tupla (hash ou None se interrompido, bytes lidos)
+        """
+        digest = cls._new_hash()
+        read = 0
+        with open(path, 'rb') as f:
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    return None, read
+                block = f.read(cls.CHUNK_SIZE)
+                if not block:
+                    break
+                digest.update(block)
+                read += len(block)
+        return digest.hexdigest(), read
+
+    def find_in_folder(self, folder_path: str, extensions: Optional[List[str]] = None,
+                       recursive: bool = True,
+                       stop_event: Optional[threading.Event] = None) -> List[List[str]]:
+        """
+        Procura duplicatas em uma pasta.
+
+        Com índice, a lista de arquivos vem dele; tamanho e data de cada
+        arquivo são lidos do disco, pois o índice só percebe mudanças na
+        pasta (não edições no próprio arquivo) e os hashes guardados são
+        validados por eles.
+
+        Args:
+            folder_path: Pasta a analisar
+            extensions: Extensões consideradas (None = todas)
+            recursive: Se inclui subpastas
+            stop_event: Evento que interrompe a busca quando sinalizado
+
+        Returns:
+            Grupos de caminhos com conteúdo idêntico
+        """
+        folder_path = os.path.normpath(folder_path)
+        if extensions is not None:
+            extensions = [FileIndex.get_extension(ext if ext.startswith('.') else f'.{ext}')
+                          for ext in extensions]
+
+        if self.index is not None:
+            self.index.refresh(folder_path, recursive=recursive, stop_event=stop_event)
+            rows = self.index.query_files(folder_path, recursive, extensions)
+            return self.find_duplicates([row[0] for row in rows], stop_event=stop_event)
+
+        accepted = set(extensions) if extensions is not None else None
+        files = []
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    stack.append(entry.path)
+                            elif entry.is_file() and (accepted is None
+                                                      or FileIndex.get_extension(entry.name) in accepted):
+                                st = entry.stat()
+                                files.append((entry.path, st.st_size, st.st_mtime_ns))
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug(self.TOOL_KEY, "DuplicateFinder", f"Erro ao listar {current}: {e}")
+        return self.find_duplicates(files, stop_event=stop_event)
+
+    @logger.span(TOOL_KEY, "DuplicateFinder")
+    def find_duplicates(self, files: Iterable, stop_event: Optional[threading.Event] = None,
+                        progress: Optional[Callable[[str, int, int], None]] = None) -> List[List[str]]:
+        """
+        Agrupa arquivos de conteúdo idêntico.
+
+        Args:
+            files: Caminhos, ou tuplas (caminho, tamanho, mtime_ns) já conhecidas
+            stop_event: Evento que interrompe a busca quando sinalizado
+            progress: Callback (etapa, concluídos, total) chamado durante a leitura
+
+        Returns:
+            Grupos de caminhos duplicados (cada grupo na ordem de entrada,
+            grupos ordenados pelo primeiro caminho); [] se interrompido
+        """
+        order: Dict[str, int] = {}
+        by_size: Dict[int, List[Tuple[str, int]]] = {}
+        total_bytes = 0
+
+        # 1. Agrupar por tamanho
+        for item in files:
+            if isinstance(item, str):
+                try:
+                    st = os.stat(item)
+                except OSError:
+                    continue
+                path, size, mtime_ns = item, st.st_size, st.st_mtime_ns
+            else:
+                path, size, mtime_ns = item
+            if path in order or size < self.min_size:
+                continue
+            order[path] = len(order)
+            total_bytes += size
+            by_size.setdefault(size, []).append((path, mtime_ns))
+
+        candidates = {size: group for size, group in by_size.items() if len(group) > 1}
+        stats = {'files': len(order), 'bytes_total': total_bytes,
+                 'size_candidates': sum(len(g) for g in candidates.values()),
+                 'partial_hashed': 0, 'full_hashed': 0, 'cached': 0, 'bytes_read': 0}
+        self.last_stats = stats
+
+        cached = self.index.get_hashes(
+            path for group in candidates.values() for path, _ in group
+        ) if self.index is not None and candidates else {}
+
+        # Estado por arquivo: [tamanho, mtime_ns, hash parcial, hash completo]
+        state: Dict[str, list] = {}
+        for size, group in candidates.items():
+            for path, mtime_ns in group:
+                entry = cached.get(path)
+                if entry is not None and entry[0] == size and entry[1] == mtime_ns:
+                    state[path] = [size, mtime_ns, entry[2], entry[3]]
+                    stats['cached'] += 1
+                else:
+                    state[path] = [size, mtime_ns, None, None]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="DuplicateFinder") as executor:
+            # 2. Hash parcial dos candidatos por tamanho
+            if not self._hash_phase(executor, 'partial', [p for p, s in state.items() if s[2] is None],
+                                    state, stats, stop_event, progress):
+                return []
+
+            partial_groups = self._group(state, 2)
+
+            # 3. Hash completo dos que ainda coincidem
+            pending = [p for group in partial_groups for p in group if state[p][3] is None]
+            if not self._hash_phase(executor, 'full', pending, state, stats, stop_event, progress):
+                return []
+
+        if self.index is not None and state:
+            try:
+                self.index.store_hashes((path, s[0], s[1], s[2], s[3]) for path, s in state.items()
+                                        if s[2] is not None)
+            except Exception as e:
+                logger.warning(self.TOOL_KEY, "DuplicateFinder", f"Erro ao guardar hashes no índice: {e}")
+
+        # Arquivos que falharam no hash completo já saíram do estado
+        survivors = {p: state[p] for group in partial_groups for p in group if p in state}
+        groups = [sorted(group, key=order.__getitem__) for group in self._group(survivors, 3)]
+        groups.sort(key=lambda group: order[group[0]])
+
+        logger.info(self.TOOL_KEY, "DuplicateFinder",
+                    f"{len(groups)} grupos de duplicatas em {stats['files']} arquivos; lidos "
+                    f"{stats['bytes_read']} de {stats['bytes_total']} bytes "
+                    f"({stats['partial_hashed']} parciais, {stats['full_hashed']} completos, "
+                    f"{stats['cached']} do índice)")
+        return groups
+
+    def _hash_phase(self, executor: ThreadPoolExecutor, phase: str, paths: List[str],
+                    state: Dict[str, list], stats: Dict[str, int],
+                    stop_event: Optional[threading.Event],
+                    progress: Optional[Callable[[str, int, int], None]]) -> bool:
+        """
+        Calcula hashes parciais ou completos em paralelo.
+
+        Arquivos que não podem ser lidos saem da comparação.
+
+        Returns:
+            False se a busca foi interrompida
+        """
+        def work(path: str):
+            if stop_event is not None and stop_event.is_set():
+                return path, None, 0, False
+            try:
+                if phase == 'partial':
+                    digest, read, whole = self.partial_hash(path, state[path][0])
+                    return path, digest, read, whole
+                digest, read = self.full_hash(path, stop_event)
+                return path, digest, read, True
+            except OSError as e:
+                logger.debug(self.TOOL_KEY, "DuplicateFinder", f"Erro ao ler {path}: {e}")
+                return path, None, 0, False
+
+        for done, (path, digest, read, whole) in enumerate(executor.map(work, paths), 1):
+            stats['bytes_read'] += read
+            if digest is None:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                state.pop(path, None)
+                continue
+            if phase == 'partial':
+                stats['partial_hashed'] += 1
+                state[path][2] = digest
+                if whole:
+                    state[path][3] = digest  # Arquivo pequeno: o parcial já é o completo
+            else:
+                stats['full_hashed'] += 1
+                state[path][3] = digest
+            if progress is not None:
+                progress(phase, done, len(paths))
+
+        return not (stop_event is not None and stop_event.is_set())
+
+    @staticmethod
+    def _group(state: Dict[str, list], field: int) -> List[List[str]]:
+        """Agrupa por (tamanho, hash) os arquivos com ao menos um par."""
+        groups: Dict[Tuple[int, str], List[str]] = {}
+        for path, s in state.items():
+            if s[field] is not None:
+                groups.setdefault((s[0], s[field]), []).append(path)
+        return [group for group in groups.values() if len(group) > 1]
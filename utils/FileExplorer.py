@@ -6,7 +6,15 @@ Pode ser utilizada por diferentes plugins que trabalham com diferentes tipos de
 """
 
 import os
-from typing import List, Optional
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from utils.FileIndex import FileIndex
+from utils.FileQuery import FileQuery, IgnoreRules
+from utils.FileSortKeys import FileSortKeys
+from utils.FolderStats import FolderStats
 from utils.LogUtils import logger
 from utils.ToolKey import ToolKey
 
@@ -16,67 +24,142 @@ class FileExplorer:
     
     TOOL_KEY = ToolKey.ICO_CONVERTER
 
-    def __init__(self, extensions: List[str], recursive: bool = True):
+    # Threads usadas na listagem paralela de pastas (modo parallel)
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, extensions: List[str], recursive: bool = True,
+                 index: Optional[FileIndex] = None, parallel: bool = False,
+                 max_workers: Optional[int] = None):
         """
         Inicializa o FileExplorer.
 
         Args:
             extensions: Lista de extensões para filtrar (ex: ['.png', '.jpg'])
             recursive: Se deve buscar recursivamente em subpastas (padrão: True)
+            index: Índice persistente para responder às buscas sem percorrer
+                   a pasta (padrão: None = sempre percorre o disco)
+            parallel: Se deve listar as subpastas em paralelo, útil em discos
+                      de rede com alta latência por listagem; com índice, vale
+                      para a atualização dele (padrão: False)
+            max_workers: Threads da listagem paralela (padrão: DEFAULT_MAX_WORKERS)
         """
         # Normalizar extensões (adicionar ponto se necessário)
         self.extensions = [ext if ext.startswith('.') else f'.{ext}' for ext in extensions]
         self.recursive = recursive
+        self.index = index
+        self.parallel = parallel
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self._build_suffix_index()
         
         logger.debug(self.TOOL_KEY, "FileExplorer",
                     f"FileExplorer criado com extensões: {self.extensions}, recursivo: {recursive}")
 
-    def find_files(self, folder_path: str) -> List[str]:
+    @logger.span(TOOL_KEY, "FileExplorer")
+    def find_files(self, folder_path: str, query: Optional[FileQuery] = None) -> List[str]:
         """
         Encontra todos os arquivos com extensões especificadas em uma pasta.
 
         Args:
             folder_path: Caminho da pasta para buscar
+            query: Critérios adicionais avaliados durante a busca (opcional)
             
         Returns:
             Lista de caminhos absolutos dos arquivos encontrados
         """
-        # Normalizar o caminho para usar separadores consistentes do sistema
-        folder_path = os.path.normpath(folder_path)
-        
-        if not os.path.exists(folder_path):
-            logger.warning(self.TOOL_KEY, "FileExplorer",
-                          f"Pasta não encontrada: {folder_path}")
-            return []
+        files = list(self.iter_files(folder_path, query=query))
 
-        if not os.path.isdir(folder_path):
-            logger.warning(self.TOOL_KEY, "FileExplorer",
-                          f"Caminho não é uma pasta: {folder_path}")
-            return []
+        logger.info(self.TOOL_KEY, "FileExplorer",
+                   f"Encontrados {len(files)} arquivos em {os.path.normpath(folder_path)}")
+        return files
 
-        files = []
+    def iter_files(self, folder_path: str, limit: Optional[int] = None,
+                   stop_event: Optional[threading.Event] = None,
+                   query: Optional[FileQuery] = None) -> Iterator[str]:
+        """
+        Gera os arquivos com extensões especificadas à medida que são encontrados.
+
+        A busca é interrompida ao atingir `limit`, quando `stop_event` é
+        sinalizado (ex: por outra thread) ou quando o consumidor deixa de
+        iterar. Os critérios de `query` são avaliados durante a listagem:
+        pastas excluídas ou além da profundidade máxima não são lidas.
+
+        Args:
+            folder_path: Caminho da pasta para buscar
+            limit: Número máximo de arquivos a gerar (None = sem limite)
+            stop_event: Evento que interrompe a busca quando sinalizado
+            query: Critérios adicionais de nome, tamanho, data e pastas (opcional)
 
-        if self.recursive:
-            # Busca recursiva
-            for root, dirs, filelist in os.walk(folder_path):
-                for file in filelist:
-                    if self._matches_extensions(file):
-                        files.append(os.path.join(root, file))
+        Yields:
+            Caminho absoluto de cada arquivo encontrado
+        """
+        for path, _, _ in self._iter_entries(folder_path, limit, stop_event, query, with_stat=False):
+            yield path
+
+    def iter_entries(self, folder_path: str, limit: Optional[int] = None,
+                     stop_event: Optional[threading.Event] = None,
+                     query: Optional[FileQuery] = None) -> Iterator[Tuple[str, int, int]]:
+        """
+        Como iter_files, mas gera também o tamanho e a data de modificação.
+
+        Os valores vêm da própria listagem (ou do índice), sem consultas
+        adicionais ao arquivo, e servem de chave de ordenação (FileSortKeys).
+
+        Yields:
+            Tuplas (caminho, tamanho, mtime_ns)
+        """
+        return self._iter_entries(folder_path, limit, stop_event, query, with_stat=True)
+
+    def _iter_entries(self, folder_path: str, limit: Optional[int],
+                      stop_event: Optional[threading.Event], query: Optional[FileQuery],
+                      with_stat: bool) -> Iterator[Tuple[str, int, int]]:
+        """Seleciona a fonte (índice ou disco) e aplica limite e interrupção."""
+        folder_path = self._prepare_folder(folder_path)
+        if folder_path is None or limit == 0:
+            return
+
+        if self.index is not None and not (query is not None and query.ignore_files):
+            source = self._iter_indexed(folder_path, query, stop_event)
+        elif self.parallel and self.recursive:
+            source = self._walk_parallel(folder_path, query, with_stat)
         else:
-            # Busca apenas no nível atual
-            try:
-                for file in os.listdir(folder_path):
-                    file_path = os.path.join(folder_path, file)
-                    if os.path.isfile(file_path) and self._matches_extensions(file):
-                        files.append(file_path)
-            except PermissionError:
-                logger.warning(self.TOOL_KEY, "FileExplorer",
-                              f"Permissão negada ao acessar: {folder_path}")
-                return []
+            source = self._walk(folder_path, query, with_stat)
 
-        logger.info(self.TOOL_KEY, "FileExplorer",
-                   f"Encontrados {len(files)} arquivos em {folder_path}")
-        return files
+        count = 0
+        for entry in source:
+            if stop_event is not None and stop_event.is_set():
+                logger.debug(self.TOOL_KEY, "FileExplorer",
+                            f"Busca interrompida em {folder_path} após {count} arquivos")
+                return
+            yield entry
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def iter_batches(self, folder_path: str, batch_size: int = 64, limit: Optional[int] = None,
+                     stop_event: Optional[threading.Event] = None,
+                     query: Optional[FileQuery] = None, with_stat: bool = False) -> Iterator[list]:
+        """
+        Gera os arquivos encontrados em lotes, para preenchimento progressivo.
+
+        Args:
+            folder_path: Caminho da pasta para buscar
+            batch_size: Quantidade máxima de arquivos por lote
+            limit: Número máximo de arquivos no total (None = sem limite)
+            stop_event: Evento que interrompe a busca quando sinalizado
+            query: Critérios adicionais avaliados durante a busca (opcional)
+            with_stat: Se True, os lotes contêm tuplas (caminho, tamanho, mtime_ns)
+
+        Yields:
+            Listas com até `batch_size` caminhos (ou tuplas, com with_stat)
+        """
+        batch = []
+        for entry in self._iter_entries(folder_path, limit, stop_event, query, with_stat):
+            batch.append(entry if with_stat else entry[0])
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
     def find_files_by_name(self, folder_path: str, pattern: str) -> List[str]:
         """
@@ -89,10 +172,8 @@ class FileExplorer:
         Returns:
             Lista de caminhos absolutos dos arquivos encontrados
         """
-        all_files = self.find_files(folder_path)
-        pattern_lower = pattern.lower()
-        
-        filtered = [f for f in all_files if pattern_lower in os.path.basename(f).lower()]
+        # O filtro de nome é aplicado durante a listagem
+        filtered = self.find_files(folder_path, FileQuery(name_regex=re.escape(pattern)))
         
         logger.info(self.TOOL_KEY, "FileExplorer",
                    f"Encontrados {len(filtered)} arquivos com padrão '{pattern}'")
@@ -119,6 +200,320 @@ class FileExplorer:
                     f"Encontrados {len(filtered)} arquivos com extensão '{ext}'")
         return filtered
 
+    def find_sorted(self, folder_path: str, mode: str = FileSortKeys.SORT_NAME,
+                    reverse: bool = False, query: Optional[FileQuery] = None,
+                    sort_keys: Optional[FileSortKeys] = None) -> List[str]:
+        """
+        Encontra os arquivos e os ordena.
+
+        Tamanho e data de modificação são obtidos na própria listagem e
+        registrados em `sort_keys`; reordenações posteriores com o mesmo
+        objeto não acessam o disco.
+
+        Args:
+            folder_path: Caminho da pasta para buscar
+            mode: Modo de ordenação (FileSortKeys.SORT_NAME, SORT_MTIME,
+                  SORT_SIZE ou SORT_EXIF_DATE)
+            reverse: Ordem decrescente
+            query: Critérios adicionais avaliados durante a busca (opcional)
+            sort_keys: Cache de chaves a reaproveitar (padrão: um novo)
+
+        Returns:
+            Lista de caminhos ordenada
+        """
+        entries = list(self.iter_entries(folder_path, query=query))
+        if sort_keys is None:
+            sort_keys = FileSortKeys(index=self.index)
+        sort_keys.register(entries)
+        return sort_keys.sort([path for path, _, _ in entries], mode, reverse)
+
+    def _prepare_folder(self, folder_path: str) -> Optional[str]:
+        """
+        Normaliza e valida a pasta de busca.
+
+        Args:
+            folder_path: Caminho da pasta
+
+        Returns:
+            Caminho normalizado ou None se não for uma pasta válida
+        """
+        # Normalizar o caminho para usar separadores consistentes do sistema
+        folder_path = os.path.normpath(folder_path)
+        
+        if not os.path.exists(folder_path):
+            logger.warning(self.TOOL_KEY, "FileExplorer",
+                          f"Pasta não encontrada: {folder_path}")
+            return None
+
+        if not os.path.isdir(folder_path):
+            logger.warning(self.TOOL_KEY, "FileExplorer",
+                          f"Caminho não é uma pasta: {folder_path}")
+            return None
+
+        return folder_path
+
+    def _iter_indexed(self, folder_path: str, query: Optional[FileQuery] = None,
+                      stop_event: Optional[threading.Event] = None):
+        """
+        Gera os arquivos aceitos a partir do índice persistente.
+
+        O índice é atualizado de forma incremental pasta a pasta, e os
+        arquivos de cada pasta saem assim que ela é verificada, na mesma
+        pré-ordem da busca em disco (com `parallel`, a verificação roda à
+        frente em várias threads). Pastas além de max_depth ou excluídas pela
+        consulta não são visitadas, como na busca em disco. Em caso de erro
+        no banco, a busca volta a percorrer o disco a partir das pastas ainda
+        não geradas. Os critérios da consulta são avaliados sobre os dados do
+        índice, sem acesso ao disco.
+
+        Args:
+            folder_path: Caminho normalizado da pasta raiz
+            query: Critérios adicionais (sem arquivos de regras)
+            stop_event: Evento que interrompe também a atualização do índice
+
+        Yields:
+            Tupla (caminho, tamanho, mtime_ns) de cada arquivo aceito
+        """
+        # Extensões compostas são consultadas pelo último sufixo e filtradas aqui
+        query_exts = set(self._suffixes)
+        query_exts.update('.' + ext.rsplit('.', 1)[1] for ext in self._compound_suffixes)
+
+        descend = None
+        if query is not None:
+            rules = query.root_rules(folder_path)
+
+            def descend(dir_path: str, depth: int) -> bool:
+                # Pastas fundas demais ou excluídas não são verificadas nem atualizadas
+                return query.can_descend(depth - 1) and not (rules and rules.is_ignored(dir_path, True))
+
+        done = set()
+        dirs = self.index.iter_refresh(folder_path, self.recursive, query_exts, stop_event,
+                                       self.max_workers if self.parallel else None, descend)
+        try:
+            for dir_path, rows in dirs:
+                done.add(dir_path)
+                for path, name, size, mtime_ns in rows:
+                    if self._compound_suffixes and not self._matches_extensions(name):
+                        continue
+                    if query is not None and (not query.matches_name(name)
+                                              or not query.matches_stat(size, mtime_ns)):
+                        continue
+                    yield path, size, mtime_ns
+        except sqlite3.Error as e:
+            logger.warning(self.TOOL_KEY, "FileExplorer",
+                          f"Índice indisponível, percorrendo a pasta: {e}")
+            for entry in self._walk(folder_path, query, with_stat=True):
+                if os.path.dirname(entry[0]) not in done:
+                    yield entry
+
+    def _walk(self, folder_path: str, query: Optional[FileQuery] = None, with_stat: bool = False):
+        """
+        Percorre a pasta com os.scandir, gerando os arquivos aceitos.
+
+        Reaproveita o tipo informado por cada DirEntry, evitando um stat
+        extra por arquivo. A ordem é a mesma de os.walk (pré-ordem, arquivos
+        de cada pasta antes das subpastas). Links simbólicos para pastas
+        não são seguidos.
+
+        Args:
+            folder_path: Caminho normalizado da pasta raiz
+            query: Critérios adicionais avaliados durante a listagem
+            with_stat: Se deve obter tamanho e data de modificação dos arquivos
+
+        Yields:
+            Tupla (caminho, tamanho, mtime_ns) de cada arquivo aceito; tamanho
+            e mtime_ns são 0 quando with_stat é False
+        """
+        rules = query.root_rules(folder_path) if query is not None else None
+        stack = [(folder_path, 0, rules)]
+
+        while stack:
+            current, depth, rules = stack.pop()
+
+            try:
+                files, children = self._list_dir(current, depth, rules, query, with_stat)
+            except PermissionError:
+                logger.warning(self.TOOL_KEY, "FileExplorer",
+                              f"Permissão negada ao acessar: {current}")
+                continue
+            except OSError as e:
+                logger.debug(self.TOOL_KEY, "FileExplorer",
+                            f"Erro ao listar {current}: {e}")
+                continue
+
+            yield from files
+
+            # Empilhar em ordem reversa para visitar na ordem da listagem
+            stack.extend(reversed(children))
+
+    def _walk_parallel(self, folder_path: str, query: Optional[FileQuery] = None,
+                       with_stat: bool = False):
+        """
+        Percorre a pasta listando as subpastas em paralelo.
+
+        Cada listagem concluída agenda imediatamente as suas subpastas em um
+        pool limitado de threads, de modo que a árvore é lida à frente do
+        consumidor. Os resultados são consumidos na mesma pré-ordem de _walk:
+        a sequência gerada é idêntica à da busca serial. Ao interromper a
+        iteração, as listagens ainda não iniciadas são canceladas.
+
+        Args:
+            folder_path: Caminho normalizado da pasta raiz
+            query: Critérios adicionais avaliados durante a listagem
+            with_stat: Se deve obter tamanho e data de modificação dos arquivos
+
+        Yields:
+            Tupla (caminho, tamanho, mtime_ns) de cada arquivo aceito; tamanho
+            e mtime_ns são 0 quando with_stat é False
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="FileExplorer")
+        stopped = threading.Event()
+
+        def scan(dir_path: str, depth: int, rules: Optional[IgnoreRules]):
+            files, children = self._list_dir(dir_path, depth, rules, query, with_stat)
+            scheduled = []
+            for child in children:
+                if stopped.is_set():
+                    break
+                try:
+                    scheduled.append((child[0], executor.submit(scan, *child)))
+                except RuntimeError:
+                    break  # Pool encerrado pelo consumidor
+            return files, scheduled
+
+        rules = query.root_rules(folder_path) if query is not None else None
+        stack = [(folder_path, executor.submit(scan, folder_path, 0, rules))]
+
+        try:
+            while stack:
+                current, future = stack.pop()
+
+                try:
+                    files, children = future.result()
+                except PermissionError:
+                    logger.warning(self.TOOL_KEY, "FileExplorer",
+                                  f"Permissão negada ao acessar: {current}")
+                    continue
+                except OSError as e:
+                    logger.debug(self.TOOL_KEY, "FileExplorer",
+                                f"Erro ao listar {current}: {e}")
+                    continue
+
+                # Empilhar em ordem reversa para visitar na ordem da listagem
+                stack.extend(reversed(children))
+
+                yield from files
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _list_dir(self, dir_path: str, depth: int, rules: Optional[IgnoreRules],
+                  query: Optional[FileQuery], with_stat: bool = False
+                  ) -> Tuple[List[Tuple[str, int, int]], List[Tuple[str, int, Optional[IgnoreRules]]]]:
+        """
+        Lista uma pasta aplicando as extensões e os critérios da consulta.
+
+        Args:
+            dir_path: Pasta a listar
+            depth: Profundidade da pasta em relação à raiz da busca (raiz = 0)
+            rules: Regras de exclusão herdadas das pastas acima
+            query: Critérios adicionais (None = apenas extensões)
+            with_stat: Se deve obter tamanho e data de modificação dos arquivos
+
+        Returns:
+            Tupla (arquivos aceitos, subpastas a visitar). Cada arquivo é
+            (caminho, tamanho, mtime_ns), como em scan_dir; cada subpasta é
+            (caminho, profundidade, regras que valem dentro dela)
+
+        Raises:
+            OSError: Se a pasta não puder ser listada
+        """
+        if query is None:
+            files, subdirs = self.scan_dir(dir_path, with_stat)
+            children = [(sub, depth + 1, None) for sub in subdirs] if self.recursive else []
+            return files, children
+
+        descend = self.recursive and query.can_descend(depth)
+        need_stat = with_stat or query.needs_stat()
+        files = []
+        subdirs = []
+        ignore_paths = []
+
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if descend:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        if name in query.ignore_files:
+                            ignore_paths.append(entry.path)
+                        if not self._matches_extensions(name) or not query.matches_name(name):
+                            continue
+                        if need_stat:
+                            st = entry.stat()
+                            if not query.matches_stat(st.st_size, st.st_mtime_ns):
+                                continue
+                            files.append((entry.path, st.st_size, st.st_mtime_ns))
+                        else:
+                            files.append((entry.path, 0, 0))
+                except OSError:
+                    continue
+
+        # Arquivos de regras na ordem declarada na consulta
+        for ignore_path in sorted(ignore_paths, key=lambda p: query.ignore_files.index(os.path.basename(p))):
+            rules = IgnoreRules.from_file(ignore_path, rules)
+
+        if rules:
+            files = [entry for entry in files if not rules.is_ignored(entry[0], False)]
+            subdirs = [sub for sub in subdirs if not rules.is_ignored(sub, True)]
+
+        return files, [(sub, depth + 1, rules) for sub in subdirs]
+
+    def scan_dir(self, dir_path: str, with_stat: bool = False) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+        """
+        Lista uma única pasta, sem descer nas subpastas.
+
+        Args:
+            dir_path: Pasta a listar
+            with_stat: Se deve obter tamanho e data de modificação dos arquivos
+
+        Returns:
+            Tupla (arquivos, subpastas). Cada arquivo é (caminho, tamanho, mtime_ns),
+            com tamanho e mtime_ns iguais a 0 quando with_stat é False
+
+        Raises:
+            OSError: Se a pasta não puder ser listada
+        """
+        files = []
+        subdirs = []
+
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif self._matches_extensions(entry.name) and entry.is_file():
+                        if with_stat:
+                            st = entry.stat()
+                            files.append((entry.path, st.st_size, st.st_mtime_ns))
+                        else:
+                            files.append((entry.path, 0, 0))
+                except OSError:
+                    continue
+
+        return files, subdirs
+
+    def _build_suffix_index(self) -> None:
+        """Pré-calcula as extensões em minúsculas para comparação em O(1)."""
+        lowered = [ext.lower() for ext in self.extensions]
+        # Extensões simples ('.png') são comparadas por conjunto; compostas
+        # ('.tar.gz') continuam usando endswith
+        self._suffixes = frozenset(ext for ext in lowered if ext.count('.') == 1)
+        self._compound_suffixes = tuple(ext for ext in lowered if ext.count('.') > 1)
+
     def _matches_extensions(self, filename: str) -> bool:
         """
         Verifica se o arquivo tem uma das extensões permitidas.
@@ -129,8 +524,10 @@ class FileExplorer:
         Returns:
             True se o arquivo corresponde às extensões, False caso contrário
         """
-        filename_lower = filename.lower()
-        return any(filename_lower.endswith(ext.lower()) for ext in self.extensions)
+        dot = filename.rfind('.')
+        if dot != -1 and filename[dot:].lower() in self._suffixes:
+            return True
+        return bool(self._compound_suffixes) and filename.lower().endswith(self._compound_suffixes)
 
     def set_extensions(self, extensions: List[str]) -> None:
         """
@@ -140,6 +537,7 @@ class FileExplorer:
             extensions: Nova lista de extensões
         """
         self.extensions = [ext if ext.startswith('.') else f'.{ext}' for ext in extensions]
+        self._build_suffix_index()
         logger.debug(self.TOOL_KEY, "FileExplorer",
                     f"Extensões atualizadas para: {self.extensions}")
 
@@ -154,6 +552,33 @@ class FileExplorer:
         logger.debug(self.TOOL_KEY, "FileExplorer",
                     f"Modo recursivo alterado para: {recursive}")
 
+    def set_index(self, index: Optional[FileIndex]) -> None:
+        """
+        Define o índice persistente usado nas buscas.
+
+        Args:
+            index: Índice a usar, ou None para sempre percorrer o disco
+        """
+        self.index = index
+        logger.debug(self.TOOL_KEY, "FileExplorer",
+                    f"Índice {'ativado' if index is not None else 'desativado'}")
+
+    def set_parallel(self, parallel: bool, max_workers: Optional[int] = None) -> None:
+        """
+        Define se as subpastas devem ser listadas em paralelo.
+
+        Com índice, a listagem paralela é usada na atualização dele.
+
+        Args:
+            parallel: True para listagem paralela, False para serial
+            max_workers: Threads da listagem paralela (None = manter o atual)
+        """
+        self.parallel = parallel
+        if max_workers:
+            self.max_workers = max_workers
+        logger.debug(self.TOOL_KEY, "FileExplorer",
+                    f"Listagem paralela: {parallel} ({self.max_workers} threads)")
+
     def get_extensions(self) -> List[str]:
         """Retorna as extensões atualmente configuradas."""
         return self.extensions.copy()
@@ -162,6 +587,10 @@ class FileExplorer:
         """Retorna se a busca é recursiva."""
         return self.recursive
 
+    def is_parallel(self) -> bool:
+        """Retorna se as subpastas são listadas em paralelo."""
+        return self.parallel
+
     @staticmethod
     def get_available_extensions(folder_path: str, max_depth: Optional[int] = None) -> List[str]:
         """
@@ -169,27 +598,21 @@ class FileExplorer:
 
         Args:
             folder_path: Caminho da pasta
-            max_depth: Profundidade máxima de busca (None = ilimitada)
+            max_depth: Profundidade máxima de busca, contando a própria pasta
+                       (1 = apenas a pasta, 2 = pasta e subpastas diretas;
+                       None = ilimitada)
 
         Returns:
             Lista de extensões únicas encontradas
         """
-        extensions = set()
+        if max_depth is not None and max_depth <= 0:
+            return []
 
-        try:
-            if max_depth is None or max_depth > 0:
-                next_depth = None if max_depth is None else max_depth - 1
-                
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        _, ext = os.path.splitext(file)
-                        if ext:
-                            extensions.add(ext.lower())
-                    
-                    if max_depth is not None and next_depth == 0:
-                        dirs.clear()  # Não descender mais
-        except PermissionError:
+        if not os.path.isdir(folder_path):
             logger.warning(ToolKey.ICO_CONVERTER, "FileExplorer",
-                          f"Permissão negada ao analisar: {folder_path}")
+                          f"Pasta não encontrada: {folder_path}")
+            return []
 
-        return sorted(list(extensions))
+        # FolderStats conta os níveis de subpastas (0 = apenas a pasta)
+        levels = None if max_depth is None else max_depth - 1
+        return FolderStats.collect(folder_path, max_depth=levels).extensions()
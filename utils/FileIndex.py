@@ -0,0 +1,508 @@
+"""
+FileIndex - Índice persistente (SQLite) de arquivos por pasta.
+
+Mantém em disco, no AppData do usuário, o caminho, tamanho, data de
+modificação e extensão dos arquivos das pastas indexadas. A atualização
+é incremental: apenas pastas cuja data de modificação mudou são listadas
+novamente, as demais custam um único stat. Também guarda os hashes de
+conteúdo calculados pelo DuplicateFinder e as datas EXIF lidas pelo
+FileSortKeys, válidos enquanto o tamanho e a data de modificação do
+arquivo não mudarem.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.LogUtils import logger
+from utils.ToolKey import ToolKey
+
+
+class FileIndex:
+    """Índice SQLite de arquivos com atualização incremental por pasta."""
+
+    TOOL_KEY = ToolKey.FILE_INDEX
+
+    # Diretório fixo do índice no AppData do usuário
+    APPDATA_INDEX_DIR = Path(os.getenv('LOCALAPPDATA', str(Path.home() / 'AppData' / 'Local'))) / 'MTL_UTIL' / 'index'
+    DB_FILENAME = 'file_index.sqlite3'
+
+    # Pastas modificadas há menos que isso são marcadas para nova leitura,
+    # pois uma alteração no mesmo "tick" de mtime passaria despercebida
+    MTIME_GUARD_NS = 2_000_000_000
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY,
+            parent TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent);
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            dir TEXT NOT NULL,
+            name TEXT NOT NULL,
+            ext TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+        CREATE TABLE IF NOT EXISTS hashes (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            partial_hash TEXT,
+            full_hash TEXT
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS exif_dates (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            taken REAL
+        ) WITHOUT ROWID;
+    """
+
+    # Limite de parâmetros por consulta do SQLite
+    QUERY_CHUNK = 500
+
+    # Pastas relidas gravadas por commit durante a atualização
+    COMMIT_EVERY = 200
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Abre (ou cria) o índice.
+
+        Args:
+            db_path: Caminho do banco SQLite (padrão: AppData/MTL_UTIL/index)
+        """
+        if db_path is None:
+            self.APPDATA_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+            db_path = str(self.APPDATA_INDEX_DIR / self.DB_FILENAME)
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+        logger.debug(self.TOOL_KEY, "FileIndex", f"Índice aberto: {db_path}")
+
+    @classmethod
+    def default(cls) -> 'FileIndex':
+        """Retorna o índice compartilhado da aplicação (criado sob demanda)."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def get_extension(filename: str) -> str:
+        """Retorna a extensão (último sufixo) em minúsculas, ou '' se não houver."""
+        dot = filename.rfind('.')
+        return filename[dot:].lower() if dot != -1 else ''
+
+    @staticmethod
+    def _subtree_bounds(folder_path: str) -> Tuple[str, str]:
+        """
+        Limites [início, fim) que cobrem todos os caminhos abaixo da pasta.
+
+        Permite consultar uma subárvore com uma faixa na chave primária
+        em vez de LIKE.
+        """
+        prefix = folder_path if folder_path.endswith(os.sep) else folder_path + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    @logger.span(TOOL_KEY, "FileIndex")
+    def refresh(self, folder_path: str, recursive: bool = True,
+                stop_event: Optional[threading.Event] = None,
+                max_workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Atualiza o índice de uma pasta de forma incremental.
+
+        Cada pasta já indexada custa um stat; somente as pastas cuja data de
+        modificação mudou (arquivos criados, removidos ou renomeados) são
+        listadas novamente. Alterações de conteúdo que não mudam a pasta
+        não são detectadas até a próxima listagem dela.
+
+        Args:
+            folder_path: Pasta raiz a atualizar
+            recursive: Se deve atualizar também as subpastas
+            stop_event: Evento que interrompe a atualização (o que já foi
+                        verificado fica gravado)
+            max_workers: Threads para verificar e listar as pastas em
+                         paralelo (None ou 1 = serial)
+
+        Returns:
+            Estatísticas: {'dirs': pastas verificadas, 'scanned': pastas relidas}
+        """
+        folder_path = os.path.normpath(folder_path)
+        stats = {'dirs': 0, 'scanned': 0}
+        for _ in self._refresh_dirs(folder_path, recursive, stop_event, max_workers, stats):
+            pass
+
+        logger.debug(self.TOOL_KEY, "FileIndex",
+                     f"Índice atualizado: {folder_path} ({stats['dirs']} pastas verificadas, "
+                     f"{stats['scanned']} relidas)")
+        return stats
+
+    def iter_refresh(self, folder_path: str, recursive: bool = True,
+                     extensions: Optional[Iterable[str]] = None,
+                     stop_event: Optional[threading.Event] = None,
+                     max_workers: Optional[int] = None,
+                     descend: Optional[Callable[[str, int], bool]] = None
+                     ) -> Iterator[Tuple[str, List[Tuple[str, str, int, int]]]]:
+        """
+        Atualiza o índice gerando os arquivos de cada pasta assim que ela é verificada.
+
+        Equivale a refresh() seguido de query_files(), mas os primeiros
+        resultados saem antes de a árvore inteira ser verificada. As pastas
+        seguem a pré-ordem da busca em disco; as relidas mantêm a ordem da
+        listagem, as que não mudaram vêm do índice em ordem de nome.
+
+        Args:
+            folder_path: Pasta raiz
+            recursive: Se inclui as subpastas
+            extensions: Extensões (último sufixo, minúsculas) a incluir; None = todas
+            stop_event: Evento que interrompe a atualização
+            max_workers: Threads para verificar e listar as pastas em
+                         paralelo, à frente do consumidor (None ou 1 = serial)
+            descend: Função (subpasta, profundidade) que decide se a subpasta é
+                     visitada (raiz = 0); as recusadas não são verificadas nem
+                     atualizadas. None = todas
+
+        Yields:
+            Tuplas (pasta, [(path, name, size, mtime_ns)])
+        """
+        extensions = set(extensions) if extensions is not None else None
+        yield from self._refresh_dirs(os.path.normpath(folder_path), recursive, stop_event, max_workers,
+                                      {'dirs': 0, 'scanned': 0}, with_rows=True, extensions=extensions,
+                                      descend=descend)
+
+    def query_files(self, folder_path: str, recursive: bool = True,
+                    extensions: Optional[Iterable[str]] = None) -> List[Tuple[str, str, int, int]]:
+        """
+        Consulta os arquivos indexados de uma pasta.
+
+        Args:
+            folder_path: Pasta raiz
+            recursive: Se inclui arquivos das subpastas
+            extensions: Extensões (último sufixo, minúsculas) a incluir; None = todas
+
+        Returns:
+            Lista de tuplas (path, name, size, mtime_ns) ordenada por caminho
+        """
+        folder_path = os.path.normpath(folder_path)
+        sql = "SELECT path, name, size, mtime_ns FROM files WHERE "
+        params: list = []
+
+        if recursive:
+            start, end = self._subtree_bounds(folder_path)
+            sql += "path >= ? AND path < ?"
+            params += [start, end]
+        else:
+            sql += "dir = ?"
+            params.append(folder_path)
+
+        if extensions is not None:
+            extensions = list(extensions)
+            if not extensions:
+                return []
+            # '+ext' mantém a busca pela faixa da chave primária (já ordenada)
+            sql += f" AND +ext IN ({', '.join('?' * len(extensions))})"
+            params += extensions
+
+        sql += " ORDER BY path"
+
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def get_hashes(self, paths: Iterable[str]) -> Dict[str, Tuple[int, int, Optional[str], Optional[str]]]:
+        """
+        Consulta os hashes guardados de arquivos.
+
+        Args:
+            paths: Caminhos dos arquivos
+
+        Returns:
+            {caminho: (tamanho, mtime_ns, hash parcial, hash completo)}; o
+            chamador deve descartar entradas cujo tamanho ou data não coincidam
+        """
+        paths = list(paths)
+        result = {}
+        with self._lock:
+            for i in range(0, len(paths), self.QUERY_CHUNK):
+                chunk = paths[i:i + self.QUERY_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT path, size, mtime_ns, partial_hash, full_hash FROM hashes "
+                    f"WHERE path IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                for path, size, mtime_ns, partial_hash, full_hash in rows:
+                    result[path] = (size, mtime_ns, partial_hash, full_hash)
+        return result
+
+    def store_hashes(self, rows: Iterable[Tuple[str, int, int, Optional[str], Optional[str]]]) -> None:
+        """
+        Guarda hashes de arquivos (substitui os anteriores).
+
+        Args:
+            rows: Tuplas (caminho, tamanho, mtime_ns, hash parcial, hash completo)
+        """
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, partial_hash, full_hash) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def get_exif_dates(self, paths: Iterable[str]) -> Dict[str, Tuple[int, int, Optional[float]]]:
+        """
+        Consulta as datas de captura (EXIF) guardadas.
+
+        Args:
+            paths: Caminhos dos arquivos
+
+        Returns:
+            {caminho: (tamanho, mtime_ns, timestamp ou None)}; o chamador deve
+            descartar entradas cujo tamanho ou data não coincidam
+        """
+        paths = list(paths)
+        result = {}
+        with self._lock:
+            for i in range(0, len(paths), self.QUERY_CHUNK):
+                chunk = paths[i:i + self.QUERY_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT path, size, mtime_ns, taken FROM exif_dates "
+                    f"WHERE path IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                for path, size, mtime_ns, taken in rows:
+                    result[path] = (size, mtime_ns, taken)
+        return result
+
+    def store_exif_dates(self, rows: Iterable[Tuple[str, int, int, Optional[float]]]) -> None:
+        """
+        Guarda datas de captura (substitui as anteriores).
+
+        Args:
+            rows: Tuplas (caminho, tamanho, mtime_ns, timestamp ou None)
+        """
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO exif_dates (path, size, mtime_ns, taken) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _load_known_dirs(self, folder_path: str, recursive: bool) -> Dict[str, Tuple[str, int]]:
+        """Carrega {pasta: (pai, mtime_ns)} das pastas indexadas da subárvore."""
+        if recursive:
+            start, end = self._subtree_bounds(folder_path)
+            rows = self._conn.execute(
+                "SELECT path, parent, mtime_ns FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (folder_path, start, end)
+            )
+        else:
+            rows = self._conn.execute(
+                "SELECT path, parent, mtime_ns FROM dirs WHERE path = ? OR parent = ?",
+                (folder_path, folder_path)
+            )
+        return {path: (parent, mtime_ns) for path, parent, mtime_ns in rows}
+
+    def _refresh_dirs(self, folder_path: str, recursive: bool,
+                      stop_event: Optional[threading.Event], max_workers: Optional[int],
+                      stats: Dict[str, int], with_rows: bool = False,
+                      extensions: Optional[set] = None,
+                      descend: Optional[Callable[[str, int], bool]] = None) -> Iterator[Tuple[str, list]]:
+        """
+        Verifica as pastas em pré-ordem, relendo as que mudaram.
+
+        A verificação (stat e listagem) não usa o banco e, com max_workers,
+        roda em um pool de threads que agenda as subpastas assim que cada
+        pasta é verificada. As gravações ficam na thread consumidora, uma
+        pasta por vez, com o lock liberado entre elas. Subpastas recusadas por
+        descend não são verificadas (o que já estava indexado delas fica como está).
+
+        Yields:
+            Tuplas (pasta, arquivos); os arquivos só são preenchidos com with_rows
+        """
+        with self._lock:
+            known = self._load_known_dirs(folder_path, recursive)
+        children: Dict[str, List[str]] = {}
+        for path, (parent, _) in known.items():
+            children.setdefault(parent, []).append(path)
+        for subdirs in children.values():
+            subdirs.sort()
+
+        executor = None
+        if max_workers is not None and max_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FileIndex")
+        stopped = threading.Event()
+
+        def scan(dir_path: str, depth: int):
+            result = self._check_dir(dir_path, known.get(dir_path), children.get(dir_path, []))
+            subdirs = result[3] if recursive else []
+            if descend is not None:
+                subdirs = [sub for sub in subdirs if descend(sub, depth + 1)]
+            if executor is None:
+                return result, [(sub, depth + 1, None) for sub in subdirs]
+            scheduled = []
+            for sub in subdirs:
+                if stopped.is_set():
+                    break
+                try:
+                    scheduled.append((sub, depth + 1, executor.submit(scan, sub, depth + 1)))
+                except RuntimeError:
+                    break  # Pool encerrado pelo consumidor
+            return result, scheduled
+
+        stack = [(folder_path, 0, executor.submit(scan, folder_path, 0) if executor is not None else None)]
+        pending = 0
+        try:
+            while stack:
+                if stop_event is not None and stop_event.is_set():
+                    logger.debug(self.TOOL_KEY, "FileIndex",
+                                 f"Atualização interrompida em {folder_path} após {stats['dirs']} pastas")
+                    return
+                current, depth, future = stack.pop()
+                (mtime_ns, files, error, subdirs), scheduled = (future.result() if future is not None
+                                                                 else scan(current, depth))
+                stats['dirs'] += 1
+
+                with self._lock:
+                    if mtime_ns is None:
+                        if error is not None:
+                            logger.warning(self.TOOL_KEY, "FileIndex", f"Erro ao listar {current}: {error}")
+                        self._remove_subtree(current)
+                        pending += 1
+                        continue
+                    if files is not None:
+                        stats['scanned'] += 1
+                        self._store_dir(current, mtime_ns, files, subdirs, children.get(current, []))
+                        pending += 1
+                        if pending >= self.COMMIT_EVERY:
+                            self._conn.commit()
+                            pending = 0
+                    elif with_rows:
+                        files = self._conn.execute(
+                            "SELECT path, name, size, mtime_ns FROM files WHERE dir = ? ORDER BY name",
+                            (current,)
+                        ).fetchall()
+
+                # Empilhar em ordem reversa para visitar na ordem da listagem
+                stack.extend(reversed(scheduled))
+
+                if with_rows:
+                    if extensions is not None:
+                        files = [row for row in files if self.get_extension(row[1]) in extensions]
+                    yield current, files
+        except Exception:
+            with self._lock:
+                self._conn.rollback()
+            raise
+        finally:
+            stopped.set()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            with self._lock:
+                self._conn.commit()
+
+    def _check_dir(self, dir_path: str, entry: Optional[Tuple[str, int]], known_subdirs: List[str]):
+        """
+        Verifica uma pasta no disco, listando-a se mudou desde a última leitura (sem acesso ao banco).
+
+        Returns:
+            Tupla (mtime_ns, arquivos, erro, subpastas): mtime_ns None se a
+            pasta não existe ou não pôde ser listada (erro); arquivos None se
+            a pasta não mudou (subpastas = as já indexadas); senão
+            [(path, name, size, mtime_ns)] e as subpastas listadas
+        """
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return None, None, None, []
+        if entry is not None and entry[1] == mtime_ns:
+            return mtime_ns, None, None, known_subdirs
+
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as entries:
+                for dir_entry in entries:
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            subdirs.append(dir_entry.path)
+                        elif dir_entry.is_file():
+                            st = dir_entry.stat()
+                            files.append((dir_entry.path, dir_entry.name, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError as e:
+            return None, None, e, []
+        return mtime_ns, files, None, subdirs
+
+    def _store_dir(self, dir_path: str, mtime_ns: int, files: List[Tuple[str, str, int, int]],
+                   subdirs: List[str], known_subdirs: List[str]) -> None:
+        """
+        Substitui as entradas de uma pasta relida no índice.
+
+        Args:
+            dir_path: Pasta relida
+            mtime_ns: Data de modificação da pasta na leitura
+            files: Arquivos listados (path, name, size, mtime_ns)
+            subdirs: Subpastas listadas
+            known_subdirs: Subpastas que estavam indexadas
+        """
+        # Subpastas removidas desde a última leitura
+        for removed in set(known_subdirs) - set(subdirs):
+            self._remove_subtree(removed)
+
+        if time.time_ns() - mtime_ns < self.MTIME_GUARD_NS:
+            mtime_ns = 0  # Forçar nova leitura na próxima atualização
+
+        self._conn.execute("DELETE FROM files WHERE dir = ?", (dir_path,))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (path, dir, name, ext, size, mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+            [(path, dir_path, name, self.get_extension(name), size, mtime)
+             for path, name, size, mtime in files]
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (dir_path, os.path.dirname(dir_path), mtime_ns)
+        )
+        # Subpastas novas entram como "nunca lidas" (mtime -1), para que uma
+        # atualização recursiva posterior as encontre mesmo sem reler esta pasta
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, -1)",
+            [(sub, dir_path) for sub in subdirs]
+        )
+
+    def _remove_subtree(self, dir_path: str) -> None:
+        """Remove uma pasta e tudo abaixo dela do índice."""
+        start, end = self._subtree_bounds(dir_path)
+        self._conn.execute("DELETE FROM files WHERE path >= ? AND path < ?", (start, end))
+        self._conn.execute("DELETE FROM hashes WHERE path >= ? AND path < ?", (start, end))
+        self._conn.execute("DELETE FROM exif_dates WHERE path >= ? AND path < ?", (start, end))
+        self._conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                           (dir_path, start, end))
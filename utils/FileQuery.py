@@ -0,0 +1,275 @@
+"""
+FileQuery - Critérios de busca aplicados durante a exploração de pastas.
+
+Reúne filtros de nome (glob ou regex), tamanho, data de modificação,
+profundidade máxima e regras de exclusão de pastas no estilo .gitignore.
+O FileExplorer avalia esses critérios enquanto percorre a árvore, de modo
+que pastas excluídas nunca são listadas.
+"""
+
+import fnmatch
+import os
+import re
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, Union
+
+Timestamp = Union[datetime, float, int]
+
+
+class IgnoreRules:
+    """
+    Regras de exclusão no formato .gitignore.
+
+    Suporta comentários (#), negação (!), padrões apenas para pastas (barra
+    final), padrões ancorados (com barra) e curingas *, ?, [...] e **.
+    Cada regra é relativa à pasta onde foi declarada; a última regra que
+    corresponde a um caminho define se ele é ignorado.
+    """
+
+    # Diferenciação de maiúsculas segue o sistema de arquivos
+    FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+    def __init__(self, rules: Optional[List[Tuple[str, 're.Pattern', bool, bool, bool]]] = None):
+        """
+        Args:
+            rules: Lista de (pasta base, regex, negação, apenas pastas, ancorada)
+        """
+        self.rules = rules or []
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    @classmethod
+    def from_file(cls, file_path: str, parent: Optional['IgnoreRules'] = None) -> 'IgnoreRules':
+        """
+        Carrega um arquivo de regras, acrescentando-as às regras herdadas.
+
+        Args:
+            file_path: Caminho do arquivo (ex: pasta/.gitignore)
+            parent: Regras herdadas das pastas acima
+
+        Returns:
+            Novas regras (as herdadas não são alteradas)
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return parent or cls()
+        return cls.from_patterns(os.path.dirname(file_path), lines, parent)
+
+    @classmethod
+    def from_patterns(cls, base_path: str, patterns: Iterable[str],
+                      parent: Optional['IgnoreRules'] = None) -> 'IgnoreRules':
+        """
+        Cria regras a partir de padrões relativos a uma pasta base.
+
+        Args:
+            base_path: Pasta à qual os padrões ancorados se referem
+            patterns: Linhas no formato .gitignore
+            parent: Regras herdadas das pastas acima
+
+        Returns:
+            Novas regras (as herdadas não são alteradas)
+        """
+        base_path = os.path.normpath(base_path)
+        rules = list(parent.rules) if parent else []
+
+        for line in patterns:
+            rule = cls._parse_line(line)
+            if rule is not None:
+                rules.append((base_path,) + rule)
+
+        return cls(rules)
+
+    @classmethod
+    def _parse_line(cls, line: str):
+        """Converte uma linha em (regex, negação, apenas pastas, ancorada) ou None."""
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]  # '\#' e '\!' literais
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line  # Barra no início ou no meio ancora o padrão
+        line = line.lstrip('/')
+        if not line:
+            return None
+
+        return re.compile(cls._translate(line), cls.FLAGS), negate, dir_only, anchored
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Traduz um padrão .gitignore para regex (separador '/')."""
+        parts = []
+        i = 0
+        n = len(pattern)
+        while i < n:
+            c = pattern[i]
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('/**', i) and i + 3 == n:
+                parts.append('/.*')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif c == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif c == '?':
+                parts.append('[^/]')
+                i += 1
+            elif c == '[':
+                end = pattern.find(']', i + 2)
+                if end == -1:
+                    parts.append(re.escape(c))
+                    i += 1
+                else:
+                    body = pattern[i + 1:end].replace('\\', '\\\\')
+                    if body.startswith('!'):
+                        body = '^' + body[1:]
+                    parts.append(f'[{body}]')
+                    i = end + 1
+            else:
+                parts.append(re.escape(c))
+                i += 1
+        return '^' + ''.join(parts) + '$'
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """
+        Verifica se um caminho é ignorado pelas regras.
+
+        Args:
+            path: Caminho absoluto normalizado
+            is_dir: Se o caminho é uma pasta
+
+        Returns:
+            True se a última regra correspondente exclui o caminho
+        """
+        ignored = False
+        name = os.path.basename(path)
+        last_base = None
+        relative = ''
+
+        for base, regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                if base != last_base:
+                    last_base = base
+                    relative = path[len(base):].lstrip(os.sep).replace(os.sep, '/')
+                matched = regex.match(relative) is not None
+            else:
+                matched = regex.match(name) is not None
+            if matched:
+                ignored = not negate
+
+        return ignored
+
+
+class FileQuery:
+    """Critérios de busca avaliados pelo FileExplorer durante a exploração."""
+
+    # Nomes usuais de arquivos de regras (ignore_files=FileQuery.DEFAULT_IGNORE_FILES)
+    DEFAULT_IGNORE_FILES = ('.gitignore', '.mtlignore')
+
+    def __init__(self,
+                 name_globs: Optional[Iterable[str]] = None,
+                 name_regex: Optional[str] = None,
+                 case_sensitive: bool = False,
+                 min_size: Optional[int] = None,
+                 max_size: Optional[int] = None,
+                 modified_after: Optional[Timestamp] = None,
+                 modified_before: Optional[Timestamp] = None,
+                 exclude_dirs: Optional[Iterable[str]] = None,
+                 ignore_files: Optional[Iterable[str]] = None,
+                 max_depth: Optional[int] = None):
+        """
+        Define os critérios da busca. Todos são opcionais e combinados com E.
+
+        Args:
+            name_globs: Padrões glob do nome do arquivo (ex: ['IMG_*', '*_final*']);
+                        basta corresponder a um deles
+            name_regex: Expressão regular procurada no nome do arquivo
+            case_sensitive: Se os filtros de nome diferenciam maiúsculas
+            min_size: Tamanho mínimo em bytes (inclusive)
+            max_size: Tamanho máximo em bytes (inclusive)
+            modified_after: Data de modificação mínima (datetime ou timestamp)
+            modified_before: Data de modificação máxima (datetime ou timestamp)
+            exclude_dirs: Padrões .gitignore de pastas a não percorrer, relativos
+                          à pasta da busca (ex: ['.git', 'node_modules', 'backup/old'])
+            ignore_files: Nomes de arquivos de regras lidos em cada pasta
+                          (ex: FileQuery.DEFAULT_IGNORE_FILES)
+            max_depth: Níveis de subpastas a percorrer (0 = apenas a pasta da busca)
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self.name_globs = list(name_globs or [])
+        self._glob_regex = (re.compile('|'.join(fnmatch.translate(g) for g in self.name_globs), flags)
+                            if self.name_globs else None)
+        self.name_regex = name_regex
+        self._name_regex = re.compile(name_regex, flags) if name_regex else None
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self._min_mtime_ns = self._to_ns(modified_after)
+        self._max_mtime_ns = self._to_ns(modified_before)
+
+        self.exclude_dirs = list(exclude_dirs or [])
+        self.ignore_files = tuple(ignore_files or ())
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _to_ns(value: Optional[Timestamp]) -> Optional[int]:
+        """Converte datetime/timestamp em nanossegundos desde a época."""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        return int(value * 1_000_000_000)
+
+    def root_rules(self, folder_path: str) -> IgnoreRules:
+        """Regras de exclusão de pastas relativas à raiz da busca."""
+        rules = IgnoreRules()
+        if self.exclude_dirs:
+            patterns = [p if p.endswith('/') else p + '/' for p in self.exclude_dirs]
+            rules = IgnoreRules.from_patterns(folder_path, patterns)
+        return rules
+
+    def needs_stat(self) -> bool:
+        """Retorna se a busca precisa do tamanho ou data dos arquivos."""
+        return (self.min_size is not None or self.max_size is not None
+                or self._min_mtime_ns is not None or self._max_mtime_ns is not None)
+
+    def matches_name(self, filename: str) -> bool:
+        """Verifica os filtros de nome."""
+        if self._glob_regex is not None and self._glob_regex.match(filename) is None:
+            return False
+        if self._name_regex is not None and self._name_regex.search(filename) is None:
+            return False
+        return True
+
+    def matches_stat(self, size: int, mtime_ns: int) -> bool:
+        """Verifica os filtros de tamanho e data de modificação."""
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self._min_mtime_ns is not None and mtime_ns < self._min_mtime_ns:
+            return False
+        if self._max_mtime_ns is not None and mtime_ns > self._max_mtime_ns:
+            return False
+        return True
+
+    def can_descend(self, depth: int) -> bool:
+        """Verifica se as subpastas de uma pasta na profundidade `depth` devem ser visitadas."""
+        return self.max_depth is None or depth < self.max_depth
@@ -0,0 +1,249 @@
+"""
+FileSortKeys - Chaves de ordenação de arquivos calculadas uma única vez.
+
+Guarda, por arquivo, as chaves usadas pelos modos de ordenação (nome em
+ordem natural, data de modificação, tamanho e data de captura EXIF).
+Tamanho e data vêm da própria exploração da pasta; a data EXIF é lida
+apenas do cabeçalho da imagem e guardada no FileIndex. Depois de
+calculadas, reordenar uma lista não acessa o disco.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from PIL import Image
+from utils.FileIndex import FileIndex
+from utils.LogUtils import logger
+from utils.ToolKey import ToolKey
+
+
+class FileSortKeys:
+    """Cache de chaves de ordenação por arquivo."""
+
+    TOOL_KEY = ToolKey.FILE_SORT
+
+    # Modos de ordenação
+    SORT_NAME = 'name'            # Nome em ordem natural (page2 antes de page10)
+    SORT_MTIME = 'mtime'          # Data de modificação
+    SORT_SIZE = 'size'            # Tamanho em bytes
+    SORT_EXIF_DATE = 'exif_date'  # Data de captura (EXIF DateTimeOriginal)
+    SORT_MODES = (SORT_NAME, SORT_MTIME, SORT_SIZE, SORT_EXIF_DATE)
+
+    # Tags EXIF: DateTimeOriginal (Exif IFD) e DateTime (IFD0) como alternativa
+    EXIF_IFD = 0x8769
+    TAG_DATETIME_ORIGINAL = 36867
+    TAG_DATETIME = 306
+    # Formatos com o EXIF no cabeçalho; nos demais (ex: PNG) o bloco pode vir
+    # depois dos dados da imagem, e o Pillow decodificaria a imagem para achá-lo
+    HEADER_EXIF_FORMATS = {'JPEG', 'MPO', 'TIFF', 'WEBP'}
+
+    DEFAULT_MAX_WORKERS = 4
+
+    _DIGITS = re.compile(r'(\d+)')
+
+    def __init__(self, index: Optional[FileIndex] = None, max_workers: Optional[int] = None):
+        """
+        Args:
+            index: Índice onde as datas EXIF são guardadas entre execuções (opcional)
+            max_workers: Threads de leitura dos cabeçalhos EXIF
+        """
+        self.index = index
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self._stats: Dict[str, Tuple[int, int]] = {}       # caminho -> (tamanho, mtime_ns)
+        self._names: Dict[str, tuple] = {}                  # caminho -> chave natural
+        self._exif: Dict[str, Optional[float]] = {}         # caminho -> timestamp de captura
+        self._lock = threading.Lock()
+
+    @classmethod
+    def natural_key(cls, text: str) -> tuple:
+        """
+        Chave de ordem natural: números comparados pelo valor.
+
+        Ex: 'page2.png' < 'page10.png'. Comparação sem diferenciar maiúsculas.
+        """
+        parts = cls._DIGITS.split(text.casefold())
+        # Partes alternam texto/número, então as comparações são sempre do mesmo tipo
+        parts[1::2] = [int(p) for p in parts[1::2]]
+        return tuple(parts)
+
+    def register(self, entries: Iterable[Tuple[str, int, int]]) -> None:
+        """
+        Registra tamanho e data de arquivos obtidos na exploração da pasta.
+
+        Args:
+            entries: Tuplas (caminho, tamanho, mtime_ns)
+        """
+        with self._lock:
+            for path, size, mtime_ns in entries:
+                old = self._stats.get(path)
+                if old is not None and old != (size, mtime_ns):
+                    self._exif.pop(path, None)  # Arquivo alterado
+                self._stats[path] = (size, mtime_ns)
+
+    def forget(self, paths: Iterable[str]) -> None:
+        """Descarta as chaves de arquivos (ex: removidos ou alterados)."""
+        with self._lock:
+            for path in paths:
+                self._stats.pop(path, None)
+                self._exif.pop(path, None)
+
+    def ensure(self, paths: Iterable[str], mode: str) -> None:
+        """
+        Calcula as chaves ainda desconhecidas de um modo de ordenação.
+
+        Arquivos sem tamanho/data registrados custam um stat; datas EXIF
+        são buscadas no índice e, se ausentes, lidas do cabeçalho em
+        paralelo. Pode rodar em uma thread de fundo.
+
+        Args:
+            paths: Arquivos a preparar
+            mode: Modo de ordenação (SORT_*)
+        """
+        paths = list(paths)
+        if mode == self.SORT_NAME:
+            return
+
+        self._ensure_stats(paths)
+        if mode == self.SORT_EXIF_DATE:
+            self._ensure_exif(paths)
+
+    @logger.span(TOOL_KEY, "FileSortKeys")
+    def sort(self, paths: Iterable[str], mode: str, reverse: bool = False) -> List[str]:
+        """
+        Ordena arquivos, calculando apenas as chaves que faltam.
+
+        Args:
+            paths: Arquivos a ordenar
+            mode: Modo de ordenação (SORT_*)
+            reverse: Ordem decrescente
+
+        Returns:
+            Nova lista ordenada (empates mantêm a ordem natural do nome)
+        """
+        if mode not in self.SORT_MODES:
+            raise ValueError(f"Modo de ordenação inválido: {mode}")
+
+        paths = list(paths)
+        self.ensure(paths, mode)
+
+        name_key = self._name_key
+        if mode == self.SORT_NAME:
+            return sorted(paths, key=name_key, reverse=reverse)
+
+        # Ordenação estável: primeiro pelo nome, depois pela chave do modo
+        ordered = sorted(paths, key=name_key)
+        if mode == self.SORT_SIZE:
+            key = self._size_key
+        elif mode == self.SORT_MTIME:
+            key = self._mtime_key
+        else:
+            key = self._exif_key
+        ordered.sort(key=key, reverse=reverse)
+        return ordered
+
+    def _name_key(self, path: str) -> tuple:
+        # Pelo nome do arquivo; o caminho só desempata nomes iguais em pastas diferentes
+        key = self._names.get(path)
+        if key is None:
+            key = self._names[path] = (self.natural_key(os.path.basename(path)), self.natural_key(path))
+        return key
+
+    def _size_key(self, path: str) -> int:
+        return self._stats.get(path, (0, 0))[0]
+
+    def _mtime_key(self, path: str) -> int:
+        return self._stats.get(path, (0, 0))[1]
+
+    def _exif_key(self, path: str) -> float:
+        # Sem data EXIF, vale a data de modificação
+        taken = self._exif.get(path)
+        return taken if taken is not None else self._mtime_key(path) / 1e9
+
+    def _ensure_stats(self, paths: List[str]) -> None:
+        """Obtém tamanho e data dos arquivos ainda não registrados."""
+        missing = [p for p in paths if p not in self._stats]
+        found = []
+        for path in missing:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found.append((path, st.st_size, st.st_mtime_ns))
+        if found:
+            self.register(found)
+
+    def _ensure_exif(self, paths: List[str]) -> None:
+        """Obtém as datas EXIF ausentes, do índice ou dos cabeçalhos."""
+        missing = [p for p in paths if p not in self._exif and p in self._stats]
+        if not missing:
+            return
+
+        if self.index is not None:
+            try:
+                cached = self.index.get_exif_dates(missing)
+            except Exception as e:
+                logger.debug(self.TOOL_KEY, "FileSortKeys", f"Índice indisponível: {e}")
+                cached = {}
+            with self._lock:
+                for path, (size, mtime_ns, taken) in cached.items():
+                    if self._stats.get(path) == (size, mtime_ns):
+                        self._exif[path] = taken
+            missing = [p for p in missing if p not in self._exif]
+            if not missing:
+                return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="FileSortKeys") as executor:
+            results = list(zip(missing, executor.map(self.read_exif_date, missing)))
+
+        rows = []
+        with self._lock:
+            for path, taken in results:
+                self._exif[path] = taken
+                stat = self._stats.get(path)
+                if stat is not None:
+                    rows.append((path, stat[0], stat[1], taken))
+
+        if self.index is not None and rows:
+            try:
+                self.index.store_exif_dates(rows)
+            except Exception as e:
+                logger.debug(self.TOOL_KEY, "FileSortKeys", f"Erro ao guardar datas EXIF: {e}")
+
+        logger.debug(self.TOOL_KEY, "FileSortKeys",
+                     f"Datas EXIF lidas de {len(missing)} arquivos "
+                     f"({sum(1 for _, t in results if t is not None)} com data)")
+
+    @classmethod
+    def read_exif_date(cls, path: str) -> Optional[float]:
+        """
+        Lê a data de captura do cabeçalho EXIF (sem decodificar a imagem).
+
+        Em formatos fora de HEADER_EXIF_FORMATS, só vale o EXIF já lido na
+        abertura (ex: bloco eXIf antes de IDAT no PNG).
+
+        Args:
+            path: Caminho da imagem
+
+        Returns:
+            Timestamp (hora local) ou None se não houver data
+        """
+        try:
+            with Image.open(path) as img:
+                if img.format not in cls.HEADER_EXIF_FORMATS and 'exif' not in img.info:
+                    return None
+                exif = img.getexif()
+                value = exif.get_ifd(cls.EXIF_IFD).get(cls.TAG_DATETIME_ORIGINAL) or exif.get(cls.TAG_DATETIME)
+        except Exception:
+            return None
+
+        if not value:
+            return None
+        try:
+            value = value.strip('\x00 ') if isinstance(value, str) else value.decode('ascii', 'ignore').strip('\x00 ')
+            return datetime.strptime(value[:19], '%Y:%m:%d %H:%M:%S').timestamp()
+        except (ValueError, OverflowError, OSError):
+            return None
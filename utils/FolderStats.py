@@ -0,0 +1,265 @@
+"""
+FolderStats - Estatísticas de uma pasta obtidas em uma única passada.
+
+Para cada extensão: quantidade de arquivos, total de bytes, maiores
+arquivos (top-K mantido em heap) e distribuição por profundidade. Os
+resultados parciais podem ser consumidos durante a leitura e o resultado
+final fica em cache por pasta raiz.
+"""
+
+import heapq
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.LogUtils import logger
+from utils.ToolKey import ToolKey
+
+
+class ExtensionStats:
+    """Estatísticas acumuladas de uma extensão."""
+
+    def __init__(self, extension: str, top_k: int):
+        """
+        Args:
+            extension: Extensão em minúsculas ('' para arquivos sem extensão)
+            top_k: Quantidade de maiores arquivos mantidos
+        """
+        self.extension = extension
+        self.top_k = top_k
+        self.count = 0
+        self.total_bytes = 0
+        self.depth_counts: Dict[int, int] = {}
+        self._largest: List[Tuple[int, str]] = []  # Heap mínimo (tamanho, caminho)
+
+    def add(self, path: str, size: int, depth: int) -> None:
+        """Acumula um arquivo."""
+        self.count += 1
+        self.total_bytes += size
+        self.depth_counts[depth] = self.depth_counts.get(depth, 0) + 1
+
+        if len(self._largest) < self.top_k:
+            heapq.heappush(self._largest, (size, path))
+        elif size > self._largest[0][0]:
+            heapq.heapreplace(self._largest, (size, path))
+
+    def largest_files(self) -> List[Tuple[str, int]]:
+        """Retorna [(caminho, tamanho)] dos maiores arquivos, do maior para o menor."""
+        return [(path, size) for size, path in sorted(self._largest, reverse=True)]
+
+    def to_dict(self) -> dict:
+        """Representação serializável."""
+        return {
+            'extension': self.extension,
+            'count': self.count,
+            'total_bytes': self.total_bytes,
+            'depth_counts': dict(sorted(self.depth_counts.items())),
+            'largest_files': self.largest_files()
+        }
+
+
+class FolderStats:
+    """Estatísticas de uma pasta (por extensão, tamanhos e profundidade)."""
+
+    TOOL_KEY = ToolKey.FOLDER_STATS
+
+    DEFAULT_TOP_K = 10
+    PARTIAL_EVERY_DIRS = 64  # Pastas lidas entre resultados parciais
+    CACHE_TTL_S = 60.0       # Validade do resultado em cache
+
+    _cache: Dict[Tuple[str, Optional[int], int], Tuple[float, 'FolderStats']] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, root: str, max_depth: Optional[int] = None, top_k: int = DEFAULT_TOP_K):
+        """
+        Args:
+            root: Pasta raiz normalizada
+            max_depth: Níveis de subpastas percorridos (0 = apenas a raiz, None = todos)
+            top_k: Quantidade de maiores arquivos mantidos por extensão
+        """
+        self.root = root
+        self.max_depth = max_depth
+        self.top_k = top_k
+        self.by_extension: Dict[str, ExtensionStats] = {}
+        self.depth_counts: Dict[int, int] = {}
+        self.total_files = 0
+        self.total_bytes = 0
+        self.dir_count = 0
+        self.error_count = 0
+        self.elapsed = 0.0
+        self.complete = False
+
+    @staticmethod
+    def get_extension(filename: str) -> str:
+        """Extensão em minúsculas, com a mesma regra de os.path.splitext."""
+        dot = filename.rfind('.')
+        if dot <= 0 or filename[:dot].strip('.') == '':
+            return ''
+        return filename[dot:].lower()
+
+    def add_file(self, path: str, extension: str, size: int, depth: int) -> None:
+        """Acumula um arquivo nas estatísticas gerais e da extensão."""
+        stats = self.by_extension.get(extension)
+        if stats is None:
+            stats = self.by_extension[extension] = ExtensionStats(extension, self.top_k)
+        stats.add(path, size, depth)
+        self.total_files += 1
+        self.total_bytes += size
+        self.depth_counts[depth] = self.depth_counts.get(depth, 0) + 1
+
+    def extensions(self) -> List[str]:
+        """Extensões encontradas (sem a entrada de arquivos sem extensão), ordenadas."""
+        return sorted(ext for ext in self.by_extension if ext)
+
+    def largest_files(self, extension: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Maiores arquivos da pasta ou de uma extensão.
+
+        Args:
+            extension: Extensão a consultar (None = todas)
+
+        Returns:
+            [(caminho, tamanho)] do maior para o menor
+        """
+        if extension is not None:
+            stats = self.by_extension.get(extension.lower())
+            return stats.largest_files() if stats else []
+
+        # O top-K geral está contido na união dos top-K de cada extensão
+        candidates = [item for stats in self.by_extension.values() for item in stats._largest]
+        return [(path, size) for size, path in heapq.nlargest(self.top_k, candidates)]
+
+    def to_dict(self) -> dict:
+        """Representação serializável."""
+        return {
+            'root': self.root,
+            'max_depth': self.max_depth,
+            'complete': self.complete,
+            'total_files': self.total_files,
+            'total_bytes': self.total_bytes,
+            'dir_count': self.dir_count,
+            'error_count': self.error_count,
+            'elapsed': self.elapsed,
+            'depth_counts': dict(sorted(self.depth_counts.items())),
+            'largest_files': self.largest_files(),
+            'extensions': {ext: stats.to_dict() for ext, stats in sorted(self.by_extension.items())}
+        }
+
+    @classmethod
+    def iter_collect(cls, folder_path: str, max_depth: Optional[int] = None,
+                     top_k: int = DEFAULT_TOP_K,
+                     stop_event: Optional[threading.Event] = None) -> Iterator['FolderStats']:
+        """
+        Percorre a pasta uma única vez, gerando resultados parciais.
+
+        O mesmo objeto é gerado a cada PARTIAL_EVERY_DIRS pastas lidas e uma
+        última vez ao final, com `complete=True`. Apenas o resultado completo
+        é guardado em cache. Links simbólicos para pastas não são seguidos.
+
+        Args:
+            folder_path: Pasta raiz
+            max_depth: Níveis de subpastas percorridos (0 = apenas a raiz, None = todos)
+            top_k: Quantidade de maiores arquivos mantidos por extensão
+            stop_event: Evento que interrompe a leitura quando sinalizado
+
+        Yields:
+            FolderStats atualizado
+        """
+        root = os.path.normpath(folder_path)
+        stats = cls(root, max_depth, top_k)
+        start = time.perf_counter()
+        get_extension = cls.get_extension
+        stack = [(root, 0)]
+
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                logger.debug(cls.TOOL_KEY, "FolderStats", f"Leitura interrompida: {root}")
+                return
+
+            current, depth = stack.pop()
+            descend = max_depth is None or depth < max_depth
+            subdirs = []
+
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if descend:
+                                    subdirs.append(entry.path)
+                            elif entry.is_file():
+                                stats.add_file(entry.path, get_extension(entry.name),
+                                               entry.stat().st_size, depth)
+                        except OSError:
+                            stats.error_count += 1
+            except OSError as e:
+                stats.error_count += 1
+                logger.debug(cls.TOOL_KEY, "FolderStats", f"Erro ao listar {current}: {e}")
+                continue
+
+            stats.dir_count += 1
+            stack.extend((sub, depth + 1) for sub in reversed(subdirs))
+
+            if stats.dir_count % cls.PARTIAL_EVERY_DIRS == 0:
+                stats.elapsed = time.perf_counter() - start
+                yield stats
+
+        stats.elapsed = time.perf_counter() - start
+        stats.complete = True
+        with cls._cache_lock:
+            cls._cache[(root, max_depth, top_k)] = (time.monotonic(), stats)
+
+        logger.debug(cls.TOOL_KEY, "FolderStats",
+                     f"Estatísticas de {root}: {stats.total_files} arquivos, {stats.dir_count} pastas, "
+                     f"{len(stats.by_extension)} extensões em {stats.elapsed * 1000:.0f} ms")
+        yield stats
+
+    @classmethod
+    @logger.span(TOOL_KEY, "FolderStats")
+    def collect(cls, folder_path: str, max_depth: Optional[int] = None,
+                top_k: int = DEFAULT_TOP_K, use_cache: bool = True) -> 'FolderStats':
+        """
+        Retorna as estatísticas da pasta, reaproveitando o cache quando válido.
+
+        Args:
+            folder_path: Pasta raiz
+            max_depth: Níveis de subpastas percorridos (0 = apenas a raiz, None = todos)
+            top_k: Quantidade de maiores arquivos mantidos por extensão
+            use_cache: Se pode usar um resultado com menos de CACHE_TTL_S segundos
+
+        Returns:
+            FolderStats completo
+        """
+        root = os.path.normpath(folder_path)
+        if use_cache:
+            with cls._cache_lock:
+                cached = cls._cache.get((root, max_depth, top_k))
+            if cached is not None and time.monotonic() - cached[0] < cls.CACHE_TTL_S:
+                return cached[1]
+
+        stats = None
+        for stats in cls.iter_collect(root, max_depth, top_k):
+            pass
+        return stats
+
+    @classmethod
+    def invalidate(cls, folder_path: Optional[str] = None) -> None:
+        """
+        Descarta resultados em cache.
+
+        Args:
+            folder_path: Pasta alterada; descarta as raízes que a contêm ou estão
+                         abaixo dela (None = todo o cache)
+        """
+        with cls._cache_lock:
+            if folder_path is None:
+                cls._cache.clear()
+                return
+
+            changed = os.path.normpath(folder_path)
+            for key in list(cls._cache):
+                root = key[0]
+                if (changed == root
+                        or changed.startswith(root.rstrip(os.sep) + os.sep)
+                        or root.startswith(changed.rstrip(os.sep) + os.sep)):
+                    del cls._cache[key]
@@ -0,0 +1,452 @@
+"""
+FolderWatcher - Observação de pastas com emissão de alterações incrementais.
+
+Observa uma pasta (e subpastas, conforme o FileExplorer) com
+QFileSystemWatcher e emite apenas os arquivos adicionados, removidos e
+modificados, agrupando rajadas de eventos. Toda leitura do disco (a
+árvore inicial, as pastas alteradas e o polling) roda em threads
+separadas, sem travar a interface. O número de pastas com notificação do
+sistema é limitado (as mais próximas da raiz); as demais, e as que o
+sistema não consegue observar, passam a ser verificadas por polling da
+data de modificação, algumas por ciclo.
+
+Gravações em arquivos existentes são detectadas quando a plataforma as
+notifica na pasta (Windows); arquivos recém-criados são verificados de
+novo até pararem de mudar, cobrindo pastas de saída de scanners.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+from utils.FileExplorer import FileExplorer
+from utils.LogUtils import logger
+from utils.ToolKey import ToolKey
+
+
+class FolderWatcher(QObject):
+    """Observa uma pasta e emite deltas de arquivos (adicionados/removidos/modificados)."""
+
+    TOOL_KEY = ToolKey.FOLDER_WATCHER
+
+    # Sinal: (adicionados, removidos, modificados)
+    files_changed = Signal(list, list, list)
+
+    # Sinais internos da thread de leitura: (geração, resultado)
+    _tree_scanned = Signal(int, object)
+    _dirs_changed = Signal(int, object)
+    _dirs_scanned = Signal(int, object)
+    _dirs_polled = Signal(int, object)
+
+    DEBOUNCE_MS = 300        # Agrupamento de eventos em rajada
+    POLL_INTERVAL_MS = 2000  # Verificação das pastas sem suporte a notificação
+    POLL_BATCH = 500         # Pastas verificadas por ciclo de polling
+    SETTLE_MS = 1000         # Nova verificação de arquivos ainda sendo gravados
+    MAX_WATCHED_DIRS = 1000  # Pastas com notificação do sistema (o resto por polling)
+
+    def __init__(self, file_explorer: FileExplorer, parent: Optional[QObject] = None):
+        """
+        Inicializa o observador.
+
+        Args:
+            file_explorer: FileExplorer que define extensões e recursividade
+            parent: QObject pai (opcional)
+        """
+        super().__init__(parent)
+        self.file_explorer = file_explorer
+        self.root: Optional[str] = None
+
+        # Estado conhecido por pasta: {pasta: {arquivo: (tamanho, mtime_ns)}}
+        self._snapshot: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._subdirs: Dict[str, Set[str]] = {}
+        self._pending: Set[str] = set()
+        self._settling: Set[str] = set()
+        self._polled: Dict[str, int] = {}
+        self._poll_cursor = 0
+
+        # Cada start() invalida as leituras em andamento de observações anteriores
+        self._generation = 0
+        self._cancel = threading.Event()
+        self._known: Optional[Set[str]] = None
+        self._flushing = False   # Releitura de pastas em andamento
+        self._polling = False    # Verificação por polling em andamento
+        self._tree_scanned.connect(self._on_tree_scanned)
+        self._dirs_changed.connect(self._on_dirs_changed)
+        self._dirs_scanned.connect(self._on_dirs_scanned)
+        self._dirs_polled.connect(self._on_dirs_polled)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._flush)
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(self.SETTLE_MS)
+        self._settle_timer.timeout.connect(self._on_settle)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def start(self, folder_path: str, known_paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Começa a observar uma pasta (substitui a observação anterior).
+
+        A árvore é lida em uma thread separada; as notificações começam
+        quando a leitura termina.
+
+        Args:
+            folder_path: Pasta a observar
+            known_paths: Arquivos que o consumidor já exibe. Se informado, a
+                         diferença em relação ao estado atual da pasta é emitida
+                         ao fim da leitura, cobrindo alterações ocorridas antes
+                         do início da observação.
+        """
+        self.stop()
+        self.root = os.path.normpath(folder_path)
+        if not os.path.isdir(self.root):
+            logger.warning(self.TOOL_KEY, "FolderWatcher", f"Pasta não encontrada: {self.root}")
+            self.root = None
+            return
+
+        self._known = set(known_paths) if known_paths is not None else None
+        root, generation, cancel = self.root, self._generation, self._cancel
+
+        def scan():
+            tree = self._scan_tree(root, cancel)
+            if tree is not None:
+                self._tree_scanned.emit(generation, tree)
+
+        threading.Thread(target=scan, name="FolderWatcher", daemon=True).start()
+
+    def _on_tree_scanned(self, generation: int, tree: list) -> None:
+        """Instala a observação com a árvore lida em segundo plano."""
+        if generation != self._generation or self.root is None:
+            return  # Observação substituída durante a leitura
+
+        self._install_tree(tree, None)
+
+        logger.debug(self.TOOL_KEY, "FolderWatcher",
+                     f"Observando {self.root}: {len(self._snapshot)} pastas "
+                     f"({len(self._polled)} por polling)")
+
+        # Pastas alteradas durante a leitura, antes de serem observadas
+        mtimes = {dir_path: mtime_ns for dir_path, mtime_ns, _, _ in tree}
+        cancel = self._cancel
+
+        def verify():
+            changed = []
+            for dir_path, mtime_ns in mtimes.items():
+                if cancel.is_set():
+                    return
+                try:
+                    if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                        changed.append(dir_path)
+                except OSError:
+                    changed.append(dir_path)
+            if changed:
+                self._dirs_changed.emit(generation, changed)
+
+        threading.Thread(target=verify, name="FolderWatcher", daemon=True).start()
+
+        if self._known is not None:
+            known, self._known = self._known, None
+            current = self.get_files()
+            added = [p for p in current if p not in known]
+            current_set = set(current)
+            removed = [p for p in known if self._is_under_root(p) and p not in current_set]
+            if added or removed:
+                self.files_changed.emit(added, removed, [])
+
+    def _on_dirs_changed(self, generation: int, dirs: list) -> None:
+        """Relê as pastas que mudaram entre a leitura e o início da observação."""
+        if generation != self._generation or self.root is None:
+            return
+        self._pending.update(dirs)
+        self._debounce_timer.start()
+
+    def stop(self) -> None:
+        """Para a observação e descarta o estado conhecido."""
+        # Leituras em andamento são canceladas e seus resultados ignorados
+        self._cancel.set()
+        self._cancel = threading.Event()
+        self._generation += 1
+        self._known = None
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._debounce_timer.stop()
+        self._settle_timer.stop()
+        self._poll_timer.stop()
+        self._snapshot.clear()
+        self._subdirs.clear()
+        self._pending.clear()
+        self._settling.clear()
+        self._polled.clear()
+        self._poll_cursor = 0
+        self._flushing = False
+        self._polling = False
+        self.root = None
+
+    def is_active(self) -> bool:
+        """Retorna se há uma pasta sendo observada."""
+        return self.root is not None
+
+    def get_files(self) -> List[str]:
+        """Retorna os arquivos conhecidos na pasta observada."""
+        files = []
+        for entries in self._snapshot.values():
+            files.extend(entries)
+        return files
+
+    def _is_under_root(self, path: str) -> bool:
+        """Verifica se o arquivo pertence à área observada."""
+        parent = os.path.dirname(path)
+        if not self.file_explorer.is_recursive():
+            return parent == self.root
+        return parent == self.root or parent.startswith(self.root.rstrip(os.sep) + os.sep)
+
+    def _on_directory_changed(self, dir_path: str) -> None:
+        """Registra a pasta alterada e reinicia o agrupamento de eventos."""
+        self._pending.add(os.path.normpath(dir_path))
+        self._debounce_timer.start()
+
+    def _on_settle(self) -> None:
+        """Verifica novamente as pastas com arquivos gravados recentemente."""
+        self._pending.update(self._settling)
+        self._settling.clear()
+        self._flush()
+
+    def _poll(self) -> None:
+        """
+        Verifica, em uma thread separada, a data de modificação de até
+        POLL_BATCH pastas observadas por polling, em rodízio.
+        """
+        if self._polling:
+            return  # Verificação anterior ainda em andamento (ex: disco de rede lento)
+        polled = list(self._polled.items())
+        if self._poll_cursor >= len(polled):
+            self._poll_cursor = 0
+        batch = polled[self._poll_cursor:self._poll_cursor + self.POLL_BATCH]
+        self._poll_cursor += len(batch)
+        if not batch:
+            return
+
+        self._polling = True
+        generation, cancel = self._generation, self._cancel
+
+        def check():
+            changed = []
+            for dir_path, old_mtime in batch:
+                if cancel.is_set():
+                    return
+                try:
+                    mtime_ns = os.stat(dir_path).st_mtime_ns
+                except OSError:
+                    mtime_ns = -1
+                if mtime_ns != old_mtime:
+                    changed.append((dir_path, mtime_ns))
+            self._dirs_polled.emit(generation, changed)
+
+        threading.Thread(target=check, name="FolderWatcher", daemon=True).start()
+
+    def _on_dirs_polled(self, generation: int, changed: list) -> None:
+        """Agenda a releitura das pastas por polling que mudaram."""
+        if generation != self._generation or self.root is None:
+            return
+        self._polling = False
+        for dir_path, mtime_ns in changed:
+            if dir_path in self._polled:  # Pode ter sido removida nesse meio-tempo
+                self._polled[dir_path] = mtime_ns
+                self._pending.add(dir_path)
+        if self._pending:
+            self._debounce_timer.start()
+
+    def _flush(self) -> None:
+        """
+        Relê as pastas pendentes em uma thread separada.
+
+        As diferenças são aplicadas e emitidas em _on_dirs_scanned; uma
+        releitura por vez, e as pastas alteradas nesse meio-tempo ficam
+        para a próxima.
+        """
+        if self._flushing:
+            return
+        # Subpastas conhecidas de cada pasta: as novas são lidas inteiras na thread
+        pending = {dir_path: set(self._subdirs.get(dir_path, ()))
+                   for dir_path in self._pending if dir_path in self._snapshot}
+        self._pending = set()
+        if not pending:
+            return
+
+        self._flushing = True
+        generation, cancel = self._generation, self._cancel
+        recursive = self.file_explorer.is_recursive()
+
+        def scan():
+            result = {}
+            for dir_path, old_subdirs in pending.items():
+                if cancel.is_set():
+                    return
+                try:
+                    files, subdirs = self.file_explorer.scan_dir(dir_path, with_stat=True)
+                except OSError:
+                    result[dir_path] = None
+                    continue
+                trees = {}
+                if recursive:
+                    for sub in set(subdirs) - old_subdirs:
+                        tree = self._scan_tree(sub, cancel)
+                        if tree is None:
+                            return
+                        trees[sub] = tree
+                result[dir_path] = (files, subdirs, trees)
+            self._dirs_scanned.emit(generation, result)
+
+        threading.Thread(target=scan, name="FolderWatcher", daemon=True).start()
+
+    def _on_dirs_scanned(self, generation: int, result: dict) -> None:
+        """Aplica as pastas relidas em segundo plano e emite as diferenças encontradas."""
+        if generation != self._generation or self.root is None:
+            return
+        self._flushing = False
+
+        added: List[str] = []
+        removed: List[str] = []
+        modified: List[str] = []
+        recursive = self.file_explorer.is_recursive()
+        settle_limit = time.time_ns() - self.SETTLE_MS * 1_000_000
+
+        for dir_path, scanned in result.items():
+            old_files = self._snapshot.get(dir_path)
+            if old_files is None:
+                continue  # Pasta já removida da observação
+            if scanned is None:
+                self._remove_tree(dir_path, removed)
+                continue
+            files, subdirs, trees = scanned
+
+            new_files = {path: (size, mtime_ns) for path, size, mtime_ns in files}
+            for path, state in new_files.items():
+                old_state = old_files.get(path)
+                if old_state is None:
+                    added.append(path)
+                elif old_state != state:
+                    modified.append(path)
+                if state[1] > settle_limit:
+                    self._settling.add(dir_path)
+            removed.extend(path for path in old_files if path not in new_files)
+            self._snapshot[dir_path] = new_files
+
+            if recursive:
+                old_subdirs = self._subdirs.get(dir_path, set())
+                new_subdirs = set(subdirs)
+                for sub in old_subdirs - new_subdirs:
+                    self._remove_tree(sub, removed)
+                for sub in new_subdirs - old_subdirs:
+                    self._install_tree(trees.get(sub, []), added)
+                self._subdirs[dir_path] = new_subdirs
+
+        if self._settling:
+            self._settle_timer.start()
+        if self._pending:
+            self._debounce_timer.start()  # Alterações recebidas durante a releitura
+
+        if added or removed or modified:
+            logger.debug(self.TOOL_KEY, "FolderWatcher",
+                         f"Alterações em {self.root}: +{len(added)} -{len(removed)} ~{len(modified)}")
+            self.files_changed.emit(added, removed, modified)
+
+    def _scan_tree(self, dir_path: str,
+                   cancel: Optional[threading.Event] = None) -> Optional[List[tuple]]:
+        """
+        Lê uma pasta (e subpastas, se recursivo) sem alterar o estado do observador.
+
+        Pode rodar fora da thread da interface.
+
+        Args:
+            dir_path: Pasta a ler
+            cancel: Evento que interrompe a leitura
+
+        Returns:
+            Lista de (pasta, mtime_ns, arquivos, subpastas) em pré-ordem, ou
+            None se interrompida
+        """
+        recursive = self.file_explorer.is_recursive()
+        tree = []
+        stack = [dir_path]
+
+        while stack:
+            if cancel is not None and cancel.is_set():
+                return None
+            current = stack.pop()
+            try:
+                mtime_ns = os.stat(current).st_mtime_ns
+                files, subdirs = self.file_explorer.scan_dir(current, with_stat=True)
+            except OSError as e:
+                logger.debug(self.TOOL_KEY, "FolderWatcher", f"Erro ao listar {current}: {e}")
+                continue
+
+            if not recursive:
+                subdirs = []
+            tree.append((current, mtime_ns, files, subdirs))
+            stack.extend(subdirs)
+        return tree
+
+    def _install_tree(self, tree: List[tuple], added: Optional[List[str]]) -> None:
+        """
+        Registra pastas lidas por _scan_tree no estado e na observação.
+
+        As pastas mais próximas da raiz recebem notificação do sistema até
+        MAX_WATCHED_DIRS; as demais são verificadas por polling.
+
+        Args:
+            tree: Pastas lidas (pasta, mtime_ns, arquivos, subpastas)
+            added: Lista que recebe os arquivos encontrados (None = não coletar)
+        """
+        if not tree:
+            return
+
+        settle_limit = time.time_ns() - self.SETTLE_MS * 1_000_000
+        for current, _, files, subdirs in tree:
+            self._snapshot[current] = {path: (size, mtime_ns) for path, size, mtime_ns in files}
+            self._subdirs[current] = set(subdirs)
+            if added is not None:
+                added.extend(path for path, _, _ in files)
+                if any(mtime_ns > settle_limit for _, _, mtime_ns in files):
+                    self._settling.add(current)
+
+        # Menor profundidade primeiro: a pré-ordem vira ordem por nível
+        dirs = sorted(tree, key=lambda item: item[0].count(os.sep))
+        capacity = max(0, self.MAX_WATCHED_DIRS - len(self._watcher.directories()))
+        candidates = [current for current, _, _, _ in dirs[:capacity]]
+        failed = set(self._watcher.addPaths(candidates)) if candidates else set()
+        watched = set(candidates) - failed
+
+        for current, mtime_ns, _, _ in dirs:
+            if current not in watched:
+                self._polled[current] = mtime_ns
+        if self._polled and not self._poll_timer.isActive() and self.root is not None:
+            self._poll_timer.start()
+
+    def _remove_tree(self, dir_path: str, removed: List[str]) -> None:
+        """
+        Remove uma pasta (e subpastas) da observação.
+
+        Args:
+            dir_path: Pasta a remover
+            removed: Lista que recebe os arquivos que deixaram de existir
+        """
+        stack = [dir_path]
+        while stack:
+            current = stack.pop()
+            removed.extend(self._snapshot.pop(current, {}))
+            stack.extend(self._subdirs.pop(current, ()))
+            self._settling.discard(current)
+            if self._polled.pop(current, None) is None:
+                self._watcher.removePath(current)  # Pastas por polling não têm notificação
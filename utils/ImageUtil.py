@@ -63,6 +63,7 @@ class ImageUtil:
     TOOL_KEY = ToolKey.ICO_CONVERTER
 
     @staticmethod
+    @logger.span(TOOL_KEY, "ImageUtil")
     def convert_image_to_ico(input_path: str, output_path: str, sizes: List[int]) -> bool:
         """
         Converte uma imagem para formato ICO com múltiplos tamanhos.
@@ -77,7 +78,7 @@ class ImageUtil:
         """
         try:
             logger.debug(ImageUtil.TOOL_KEY, "ImageUtil",
-                        f"Iniciando conversão: {input_path} -> {output_path}, sizes: {sizes}")
+                        "Iniciando conversão: %s -> %s, sizes: %s", input_path, output_path, sizes)
 
             # Carregar imagem e converter para RGBA
             img = Image.open(input_path).convert("RGBA")
@@ -125,6 +126,7 @@ class ImageUtil:
             return False
 
     @staticmethod
+    @logger.span(TOOL_KEY, "ImageUtil")
     def convert_image_format(input_path: str, output_path: str, output_format: str = None) -> bool:
         """
         Converte uma imagem para outro formato.
@@ -139,7 +141,7 @@ class ImageUtil:
         """
         try:
             logger.debug(ImageUtil.TOOL_KEY, "ImageUtil",
-                        f"Convertendo: {input_path} -> {output_path}, formato: {output_format}")
+                        "Convertendo: %s -> %s, formato: %s", input_path, output_path, output_format)
 
             img = Image.open(input_path)
             
@@ -166,6 +168,7 @@ class ImageUtil:
             return False
 
     @staticmethod
+    @logger.span(TOOL_KEY, "ImageUtil")
     def resize_image(input_path: str, output_path: str, width: int, height: int) -> bool:
         """
         Redimensiona uma imagem para as dimensões especificadas.
@@ -181,7 +184,7 @@ class ImageUtil:
         """
         try:
             logger.debug(ImageUtil.TOOL_KEY, "ImageUtil",
-                        f"Redimensionando: {input_path} para {width}x{height}")
+                        "Redimensionando: %s para %sx%s", input_path, width, height)
 
             img = Image.open(input_path)
             img_resized = img.resize((width, height), Image.LANCZOS)
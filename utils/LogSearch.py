@@ -0,0 +1,250 @@
+"""
+LogSearch - Índice de pesquisa de texto para entradas de log.
+
+O texto pesquisável de cada entrada (campos em minúsculas) é montado uma
+única vez, e as entradas são agrupadas em blocos. Um índice de trigramas
+aponta, para cada trigrama, os blocos em que ele aparece (bits de um
+inteiro), montado a partir das palavras distintas de cada bloco.
+
+Uma pesquisa só examina os blocos que contêm todos os trigramas das
+palavras buscadas; consultas com resultados em quase todos os blocos (ou
+sem trigramas, com 1-2 letras) comparam todas as entradas, o que custa
+~100 ms por milhão de entradas. Pesquisas que estendem a anterior (o texto anterior está
+contido no novo) examinam apenas o resultado anterior e as entradas
+acrescentadas depois. Expressões regulares percorrem todas as entradas.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _matching(texts: List[str], start: int, query: str, pattern: Optional['re.Pattern']) -> List[int]:
+    """Índices (a partir de start) dos textos que contêm query ou a expressão."""
+    if pattern is None:
+        return [i for i, text in enumerate(texts, start) if query in text]
+    search = pattern.search
+    return [i for i, text in enumerate(texts, start) if search(text)]
+
+
+class LogSearchBlock:
+    """Bloco preparado para o índice (pode ser montado fora da thread da interface)."""
+
+    __slots__ = ('texts', 'grams')
+
+    def __init__(self, texts: List[str]):
+        """
+        Args:
+            texts: Textos pesquisáveis das entradas (ver LogSearchIndex.entry_text)
+        """
+        self.texts = texts
+        # Trigramas das palavras distintas do bloco (mensagens repetidas contam uma vez)
+        grams = set()
+        for word in set(" ".join(texts).split()):
+            for i in range(len(word) - 2):
+                grams.add(word[i:i + 3])
+        self.grams = grams
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def split(cls, texts: List[str], size: int) -> List['LogSearchBlock']:
+        """Divide textos em blocos de até size entradas."""
+        return [cls(texts[i:i + size]) for i in range(0, len(texts), size)]
+
+
+class LogSearchIndex:
+    """Índice de pesquisa de um arquivo de log, montado uma vez e ampliado em blocos."""
+
+    # Blocos menores descartam mais entradas por trigrama: com 256, uma
+    # consulta seletiva (ex: um nome de arquivo) examina poucos % das entradas
+    BLOCK_SIZE = 256
+    FOLD_BLOCKS = 64  # Blocos novos acumulados antes de entrarem nos bits dos trigramas
+
+    def __init__(self):
+        self._blocks: List[LogSearchBlock] = []
+        self._starts: List[int] = []          # Índice da primeira entrada de cada bloco
+        self._grams: Dict[str, int] = {}      # Trigrama -> bits dos blocos que o contêm
+        self._new_grams: Dict[str, List[int]] = {}  # Trigrama -> blocos ainda fora de _grams
+        self._new_first = 0                   # Primeiro bloco ainda fora de _grams
+        self._open: List[str] = []            # Entradas ainda sem bloco
+        self._count = 0
+        # Última pesquisa: (texto, regex, entradas examinadas, resultado)
+        self._last: Optional[Tuple[str, bool, int, List[int]]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def entry_text(*fields: str) -> str:
+        """Texto pesquisável de uma entrada: campos em minúsculas, em uma linha."""
+        return " ".join(map(str, fields)).lower().replace("\n", " ")
+
+    def clear(self) -> None:
+        """Descarta todas as entradas (ex: troca de arquivo)."""
+        self.__init__()
+
+    def clear_last_search(self) -> None:
+        """Esquece a última pesquisa (a próxima não será tratada como refinamento)."""
+        self._last = None
+
+    def add(self, texts: Iterable[str]) -> None:
+        """Acrescenta textos de entradas; os blocos são fechados a cada BLOCK_SIZE entradas."""
+        for text in texts:
+            self._open.append(text)
+            self._count += 1
+            if len(self._open) >= self.BLOCK_SIZE:
+                self._seal()
+
+    def add_block(self, block: LogSearchBlock) -> None:
+        """Acrescenta um bloco já preparado (ex: pela thread de carregamento)."""
+        self._seal()
+        self._append_block(block, self._count)
+        self._count += len(block)
+
+    def _seal(self) -> None:
+        """Fecha as entradas pendentes em um bloco."""
+        if self._open:
+            texts, self._open = self._open, []
+            self._append_block(LogSearchBlock(texts), self._count - len(texts))
+
+    def _append_block(self, block: LogSearchBlock, start: int) -> None:
+        """Registra o bloco e seus trigramas (incorporados aos bits a cada FOLD_BLOCKS blocos)."""
+        block_id = len(self._blocks)
+        self._starts.append(start)
+        self._blocks.append(block)
+        new_grams = self._new_grams
+        for gram in block.grams:
+            ids = new_grams.get(gram)
+            if ids is None:
+                new_grams[gram] = [block_id]
+            else:
+                ids.append(block_id)
+        block.grams = None  # Já registrados: o bloco só guarda os textos
+        if len(self._blocks) - self._new_first >= self.FOLD_BLOCKS:
+            self._fold_grams()
+
+    def _fold_grams(self) -> None:
+        """
+        Incorpora aos bits de cada trigrama os blocos acrescentados desde o último grupo.
+
+        Um OR por trigrama a cada FOLD_BLOCKS blocos, em vez de um por bloco:
+        o custo de cada OR cresce com o número de blocos.
+        """
+        if not self._new_grams:
+            return
+        first = self._new_first
+        size = (len(self._blocks) - first + 7) // 8
+        grams = self._grams
+        for gram, ids in self._new_grams.items():
+            bits = bytearray(size)
+            for block_id in ids:
+                block_id -= first
+                bits[block_id >> 3] |= 1 << (block_id & 7)
+            grams[gram] = grams.get(gram, 0) | int.from_bytes(bits, 'little') << first
+        self._new_grams = {}
+        self._new_first = len(self._blocks)
+
+    def search(self, query: str, regex: bool = False, start: int = 0) -> List[int]:
+        """
+        Pesquisa as entradas que contêm o texto (sem diferenciar maiúsculas).
+
+        Args:
+            query: Texto buscado, ou expressão regular se regex=True
+                (^ e $ valem para cada entrada)
+            regex: Interpretar query como expressão regular
+            start: Pesquisar só a partir desta entrada (ex: entradas recém-acrescentadas)
+
+        Returns:
+            Índices das entradas encontradas, em ordem crescente
+
+        Raises:
+            re.error: Se a expressão regular for inválida
+        """
+        if regex:
+            pattern = re.compile(query, re.IGNORECASE | re.MULTILINE)
+        else:
+            query = query.lower()
+            if "\n" in query:
+                return []  # Cada entrada ocupa uma única linha
+            pattern = None
+
+        last = self._last
+        if start:
+            result = self._scan(query, pattern, start)
+            if last is not None and last[:3] == (query, regex, start):
+                self._last = (query, regex, self._count, last[3] + result)
+            return result
+
+        if (pattern is None and last is not None and not last[1] and last[0] and last[0] in query
+                and len(last[3]) <= last[2] // 4):
+            # Extensão de uma pesquisa seletiva: só o resultado anterior e as entradas novas
+            result = self._narrow(query, last[3]) + self._scan(query, pattern, last[2])
+        else:
+            result = self._scan(query, pattern, 0)
+
+        self._last = (query, regex, self._count, result)
+        return result
+
+    def _candidate_blocks(self, query: str) -> int:
+        """Bits dos blocos que podem conter o texto (pelos trigramas de cada palavra)."""
+        self._fold_grams()
+        mask = (1 << len(self._blocks)) - 1
+        grams = self._grams
+        for word in query.split():
+            for i in range(len(word) - 2):
+                mask &= grams.get(word[i:i + 3], 0)
+                if not mask:
+                    return 0
+        return mask
+
+    @staticmethod
+    def _block_ids(mask: int, first: int) -> Iterable[int]:
+        """Blocos (bits ligados) do mask a partir de first, sem deslocar o inteiro a cada bloco."""
+        bits = bin(mask >> first)[:1:-1]  # Bit menos significativo primeiro
+        pos = bits.find('1')
+        while pos >= 0:
+            yield first + pos
+            pos = bits.find('1', pos + 1)
+
+    def _scan(self, query: str, pattern: Optional['re.Pattern'], first: int) -> List[int]:
+        """Pesquisa as entradas a partir do índice first."""
+        result: List[int] = []
+        first_block = max(0, bisect_right(self._starts, first) - 1)
+        if pattern:
+            block_ids = range(first_block, len(self._blocks))
+        else:
+            block_ids = self._block_ids(self._candidate_blocks(query), first_block)
+        for block_id in block_ids:
+            texts = self._blocks[block_id].texts
+            start = self._starts[block_id]
+            if first > start:
+                texts = texts[first - start:]
+                start = first
+            result.extend(_matching(texts, start, query, pattern))
+
+        # Entradas ainda sem bloco
+        open_start = self._count - len(self._open)
+        offset = max(0, first - open_start)
+        result.extend(_matching(self._open[offset:], open_start + offset, query, pattern))
+        return result
+
+    def _narrow(self, query: str, previous: List[int]) -> List[int]:
+        """Filtra um resultado anterior (texto simples), bloco a bloco."""
+        result: List[int] = []
+        open_start = self._count - len(self._open)
+        pos = 0
+        total = len(previous)
+        while pos < total:
+            index = previous[pos]
+            if index >= open_start:
+                texts, start, end = self._open, open_start, total
+            else:
+                block_id = bisect_right(self._starts, index) - 1
+                texts = self._blocks[block_id].texts
+                start = self._starts[block_id]
+                end = bisect_left(previous, start + len(texts), pos)
+            result.extend([i for i in previous[pos:end] if query in texts[i - start]])
+            pos = end
+        return result
@@ -0,0 +1,244 @@
+"""
+LogStore - Armazenamento compacto das entradas de log carregadas no LogViewer.
+
+As entradas ficam em colunas em vez de um objeto por entrada:
+- campos categóricos (tool_key, classe, nível, arquivo de origem) como
+  códigos pequenos em arrays, com os valores em tabelas compartilhadas
+- timestamps em uma lista, reaproveitando o mesmo texto dentro do segundo
+- o trecho da linha original com a mensagem e os dados extras (os campos
+  anteriores já estão nas colunas) em um único bytearray, decodificado sob
+  demanda (só as linhas exibidas)
+
+LogEntry é uma visão de uma posição do armazenamento, com a mesma interface
+de antes (entry.timestamp, entry.message, entry.extra_data, ...).
+"""
+
+import json
+import threading
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+from utils.LogSearch import LogSearchIndex
+
+
+# Mensagem e dados extras são os últimos campos gravados pelo RecordFormatter
+_LINE_KEYS = ['timestamp', 'level', 'tool_key', 'class_name', 'message', 'extra_data']
+_MESSAGE_KEY = b'"message": '
+_MESSAGE_MARK = b'"message": "'
+_EXTRA_MARK = b'", "extra_data": '
+
+
+def _line_message(data: bytearray, start: int, end: int) -> Any:
+    """
+    Mensagem da linha (ou do trecho a partir da mensagem) em data[start:end].
+
+    No trecho a partir da mensagem, uma mensagem sem escapes (sem barra
+    invertida) é o próprio texto entre as marcas; o resto é decodificado.
+    """
+    if data.startswith(_MESSAGE_MARK, start, end):
+        first = start + len(_MESSAGE_MARK)
+        last = data.find(_EXTRA_MARK, first, end)
+        if last >= 0 and data.find(b'\\', first, last) < 0:
+            return data[first:last].decode('utf-8')
+    return _decode(data[start:end]).get('message', '')
+
+
+def _decode(raw: bytearray) -> Dict[str, Any]:
+    """Campos de uma linha guardada (inteira ou a partir da mensagem)."""
+    return json.loads(raw if raw[:1] == b'{' else b'{' + raw)
+
+
+class LogFieldTable:
+    """Valores distintos de um campo categórico e seus códigos (seguro entre threads)."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> Optional[int]:
+        """Código de um valor já visto, ou None."""
+        return self._codes.get(value)
+
+    def add(self, value: str) -> int:
+        """Código do valor, registrando-o se for novo."""
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)  # Antes do código: quem lê o código acha o valor
+                    self._codes[value] = code
+        return code
+
+
+class LogEntryStore:
+    """Entradas de log em colunas, acrescentadas em blocos."""
+
+    # Campos categóricos e o tipo do array de códigos (até 65536 valores distintos)
+    CATEGORIES = {'tool_key': 'H', 'class_name': 'H', 'level': 'H', 'source': 'H'}
+    DEFAULTS = {'tool_key': 'unknown', 'class_name': 'Unknown', 'level': 'INFO'}
+
+    def __init__(self, tables: Optional[Dict[str, LogFieldTable]] = None):
+        """
+        Args:
+            tables: Tabelas de valores compartilhadas (ver chunk()); novas se None
+        """
+        self.tables = tables if tables is not None else {field: LogFieldTable() for field in self.CATEGORIES}
+        self.columns = {field: array(typecode) for field, typecode in self.CATEGORIES.items()}
+        self.timestamps: List[str] = []
+        self._data = bytearray()      # Linhas originais, concatenadas
+        self._ends = array('Q')       # Fim de cada linha em _data
+        self._source_none = self.tables['source'].add(None)
+        # (campo, padrão, coluna, tabela) dos campos lidos de cada linha
+        self._fields = [(field, default, self.columns[field], self.tables[field])
+                        for field, default in self.DEFAULTS.items()]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def chunk(self) -> 'LogEntryStore':
+        """Armazenamento vazio com os mesmos códigos (montado em outra thread e juntado com extend)."""
+        return LogEntryStore(self.tables)
+
+    def add_line(self, line: bytes, source: Optional[str] = None) -> Optional[str]:
+        """
+        Acrescenta uma linha do arquivo de log.
+
+        Args:
+            line: Linha JSON gravada pelo LogUtils
+            source: Arquivo de origem (linha do tempo com vários arquivos)
+
+        Returns:
+            Texto pesquisável da entrada (LogSearchIndex.entry_text), ou None
+            se a linha for vazia ou inválida (e não for acrescentada)
+        """
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            data = json.loads(line)
+            timestamp = data.get('timestamp', '')
+        except (ValueError, AttributeError):
+            return None
+
+        # Campos de texto antes da mensagem: o trecho a partir dela pode ser guardado sozinho
+        standard = type(timestamp) is str
+        if not standard:
+            timestamp = str(timestamp)
+        values = []
+        for field, default, column, table in self._fields:
+            value = data.get(field, default)
+            if type(value) is not str:
+                standard = False
+                value = str(value)
+            column.append(table.add(value))
+            values.append(value)
+        self.columns['source'].append(self._source_none if source is None else self.tables['source'].add(source))
+
+        timestamps = self.timestamps
+        if timestamps and timestamps[-1] == timestamp:
+            timestamp = timestamps[-1]  # Mesmo texto para as entradas do mesmo segundo
+        timestamps.append(timestamp)
+
+        if standard and list(data) == _LINE_KEYS:
+            # Linha do RecordFormatter: guardar só a partir da mensagem
+            line = line[line.find(_MESSAGE_KEY):]
+        self._data += line
+        self._ends.append(len(self._data))
+
+        tool_key, class_name, level = values
+        return LogSearchIndex.entry_text(timestamp, tool_key, class_name, level, data.get('message', ''))
+
+    def extend(self, chunk: 'LogEntryStore') -> None:
+        """Acrescenta as entradas de um bloco criado com chunk()."""
+        for field, column in self.columns.items():
+            column.extend(chunk.columns[field])
+        self.timestamps.extend(chunk.timestamps)
+        base = len(self._data)
+        self._data += chunk._data
+        self._ends.extend(map(base.__add__, chunk._ends))
+
+    def values(self, field: str) -> List[str]:
+        """Valores distintos já vistos de um campo categórico."""
+        return [value for value in self.tables[field].values if value is not None]
+
+    def code(self, field: str, value: str) -> Optional[int]:
+        """Código de um valor de campo categórico (None se nunca visto)."""
+        return self.tables[field].code(value)
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Todos os campos de uma entrada (mensagem e dados extras decodificados da linha)."""
+        start = self._ends[index - 1] if index else 0
+        record = {field: self.value(index, field) for field in ('timestamp', 'level', 'tool_key', 'class_name')}
+        record.update(_decode(self._data[start:self._ends[index]]))
+        return record
+
+    def message(self, index: int) -> Any:
+        """Mensagem de uma entrada (decodificada sob demanda)."""
+        return _line_message(self._data, self._ends[index - 1] if index else 0, self._ends[index])
+
+    def value(self, index: int, field: str) -> Any:
+        """Valor de um campo de uma entrada."""
+        if field == 'timestamp':
+            return self.timestamps[index]
+        if field == 'message':
+            return self.message(index)
+        if field == 'extra_data':
+            start = self._ends[index - 1] if index else 0
+            return _decode(self._data[start:self._ends[index]]).get('extra_data', {})
+        return self.tables[field].values[self.columns[field][index]]
+
+    def sort_key(self, field: str) -> Callable[[int], Any]:
+        """Chave de ordenação de índices de entradas por um campo."""
+        if field == 'timestamp':
+            return self.timestamps.__getitem__
+        if field in self.CATEGORIES:
+            values = self.tables[field].values
+            column = self.columns[field]
+            return lambda index: values[column[index]]
+        if field == 'message':
+            return lambda index: str(self.message(index))
+        return lambda index: self.value(index, field)
+
+
+class LogEntry:
+    """Entrada de log: visão de uma posição de um LogEntryStore."""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: LogEntryStore, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def timestamp(self) -> str:
+        return self._store.timestamps[self._index]
+
+    @property
+    def level(self) -> str:
+        return self._store.value(self._index, 'level')
+
+    @property
+    def tool_key(self) -> str:
+        return self._store.value(self._index, 'tool_key')
+
+    @property
+    def class_name(self) -> str:
+        return self._store.value(self._index, 'class_name')
+
+    @property
+    def source(self) -> Optional[str]:
+        """Arquivo de origem (linha do tempo com vários arquivos), ou None."""
+        return self._store.value(self._index, 'source')
+
+    @property
+    def message(self) -> Any:
+        return self._store.message(self._index)
+
+    @property
+    def extra_data(self) -> Dict[str, Any]:
+        return self._store.value(self._index, 'extra_data')
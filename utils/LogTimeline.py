@@ -0,0 +1,309 @@
+"""
+LogTimeline - Leitura de logs por intervalo de tempo e linha do tempo combinada.
+
+Cada arquivo de log ganha um índice de posições (LogOffsetIndex): a cada N
+entradas, o timestamp e a posição em bytes da linha, e a contagem por
+nível. Com ele, a leitura de um intervalo de tempo começa direto no ponto
+certo do arquivo e para logo depois do fim do intervalo, sem interpretar o
+restante. O índice vem do arquivo lateral (.log.idx) gravado pelo LogUtils;
+só as linhas que ele não cobre (ou o arquivo todo, em logs antigos) são
+percorridas.
+
+Vários arquivos (ex: antes e depois de reinícios ou rotações) são
+combinados por timestamp com um merge de k vias preguiçoso: as linhas são
+lidas de cada arquivo conforme a linha do tempo avança.
+
+Os timestamps têm o formato "AAAA-MM-DD HH:MM:SS" e são comparados como
+texto; limites podem ser prefixos (ex: "2026-10-19 14" = toda a hora 14).
+"""
+
+import gzip
+import heapq
+import json
+import os
+import struct
+import threading
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from utils.LogUtils import LogIndexWriter
+
+# O LogUtils grava o timestamp e o nível como primeiros campos de cada linha
+TIMESTAMP_PREFIX = b'{"timestamp": "'
+TIMESTAMP_LENGTH = 19
+LEVEL_MARK = b'", "level": "'
+LEVEL_START = len(TIMESTAMP_PREFIX) + TIMESTAMP_LENGTH + len(LEVEL_MARK)
+
+
+def line_timestamp(line: bytes) -> str:
+    """Timestamp de uma linha do log, sem interpretar o JSON quando possível ('' se inválida)."""
+    if line.startswith(TIMESTAMP_PREFIX):
+        return line[len(TIMESTAMP_PREFIX):len(TIMESTAMP_PREFIX) + TIMESTAMP_LENGTH].decode('ascii', 'replace')
+    try:
+        return str(json.loads(line).get('timestamp', ''))
+    except (ValueError, AttributeError):
+        return ''
+
+
+def line_level(line: bytes) -> str:
+    """Nível de uma linha do log, sem interpretar o JSON quando possível ('' se inválida)."""
+    if line.startswith(LEVEL_MARK, LEVEL_START - len(LEVEL_MARK)):
+        end = line.find(b'"', LEVEL_START)
+        if end > 0:
+            return line[LEVEL_START:end].decode('ascii', 'replace')
+    try:
+        return str(json.loads(line).get('level', ''))
+    except (ValueError, AttributeError):
+        return ''
+
+
+def content_size(path: Path) -> int:
+    """Tamanho do conteúdo do log (descompactado, pelo rodapé do gzip, em .log.gz)."""
+    if path.suffix != '.gz':
+        return os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.seek(-4, os.SEEK_END)
+        return struct.unpack('<I', f.read(4))[0]  # ISIZE: módulo 2**32
+
+
+def range_end(end: Optional[str]) -> Optional[str]:
+    """Limite final inclusivo para prefixos ("2026-10-19 14" inclui 14:59:59)."""
+    return end + '~' if end else end
+
+
+def open_log(path: Path):
+    """Abre um log (.log ou .log.gz) em modo binário; posições de .gz são do conteúdo descompactado."""
+    return gzip.open(path, 'rb') if path.suffix == '.gz' else open(path, 'rb')
+
+
+class LogOffsetIndex:
+    """
+    Posições (timestamp, byte) e contagem por nível a cada bloco de entradas.
+
+    Os blocos vêm do índice lateral gravado pelo LogUtils; sem ele, ou além
+    do que ele cobre, o arquivo é percorrido com um ponto a cada EVERY
+    entradas.
+    """
+
+    EVERY = 1000
+
+    _cache: Dict[str, 'LogOffsetIndex'] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.timestamps: List[str] = []  # Timestamp da linha em cada ponto
+        self.lasts: List[str] = []       # Timestamp da última linha de cada bloco ('' = desconhecido)
+        self.offsets: List[int] = []     # Posição da linha em cada ponto
+        self.levels: List[Dict[str, int]] = []  # Entradas por nível a partir de cada ponto
+        self.entries = 0                 # Linhas completas indexadas
+        self.scanned = 0                 # Bytes (descompactados) indexados
+        self._signature = None
+
+    @classmethod
+    def for_file(cls, path: Path, interrupted: Callable[[], bool] = None) -> Optional['LogOffsetIndex']:
+        """
+        Índice de um arquivo, reaproveitado entre leituras e ampliado se o arquivo cresceu.
+
+        Args:
+            path: Arquivo de log
+            interrupted: Função consultada durante a indexação para cancelá-la
+
+        Returns:
+            O índice, ou None se a indexação foi cancelada
+        """
+        path = Path(path)
+        with cls._cache_lock:
+            index = cls._cache.get(str(path))
+            if index is None:
+                index = cls._cache[str(path)] = cls(path)
+        if not index.update(interrupted):
+            return None
+        return index
+
+    @staticmethod
+    def has_sidecar(path: Path) -> bool:
+        """Se o arquivo tem índice lateral gravado pelo LogUtils."""
+        return LogIndexWriter.path_for(Path(path)).exists()
+
+    def update(self, interrupted: Callable[[], bool] = None) -> bool:
+        """
+        Indexa as linhas ainda não vistas (o arquivo inteiro, se foi substituído).
+
+        Returns:
+            False se a indexação foi cancelada
+        """
+        stat = os.stat(self.path)
+        compressed = self.path.suffix == '.gz'
+        if self._signature is not None:
+            if compressed and self._signature == (stat.st_size, stat.st_mtime_ns):
+                return True  # Arquivos compactados não mudam
+            if not compressed and stat.st_size == self.scanned:
+                return True
+            if compressed or stat.st_size < self.scanned:
+                self.__init__(self.path)  # Arquivo substituído ou truncado
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+
+        if not self.offsets:
+            self._load_sidecar(content_size(self.path))
+        if compressed and self.scanned == content_size(self.path):
+            return True  # Índice lateral completo: nada a descompactar
+
+        with open_log(self.path) as f:
+            f.seek(self.scanned)
+            pos = self.scanned
+            levels = self.levels[-1] if self.levels else None
+            last = None  # Última linha do bloco atual
+            for line in f:
+                if not line.endswith(b'\n') and not compressed:
+                    break  # Linha ainda sendo gravada
+                if self.entries % self.EVERY == 0:
+                    if interrupted is not None and interrupted():
+                        self.__init__(self.path)
+                        return False
+                    if last is not None:
+                        self.lasts[-1] = line_timestamp(last)
+                    self.timestamps.append(line_timestamp(line))
+                    self.lasts.append('')
+                    self.offsets.append(pos)
+                    levels = {}
+                    self.levels.append(levels)
+                level = line_level(line)
+                levels[level] = levels.get(level, 0) + 1
+                last = line
+                pos += len(line)
+                self.entries += 1
+            if last is not None:
+                self.lasts[-1] = line_timestamp(last)
+            self.scanned = pos
+        return True
+
+    def _load_sidecar(self, size: int) -> None:
+        """Lê os blocos do índice lateral que cabem no conteúdo atual do arquivo."""
+        try:
+            with open(LogIndexWriter.path_for(self.path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        for raw in data.splitlines(keepends=True):
+            if not raw.endswith(b'\n'):
+                break  # Bloco ainda sendo gravado
+            try:
+                block = json.loads(raw)
+                offset, timestamp = block['offset'], block['timestamp']
+                entries, length, levels = block['entries'], block['bytes'], block['levels']
+            except (ValueError, KeyError, TypeError):
+                break
+            if offset != self.scanned or offset + length > size:
+                break  # Índice de outro conteúdo, ou à frente do que já foi gravado no log
+            self.timestamps.append(timestamp)
+            self.lasts.append(block.get('last', ''))  # Índices antigos não têm
+            self.offsets.append(offset)
+            self.levels.append(levels)
+            self.entries += entries
+            self.scanned = offset + length
+
+    def range_offsets(self, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, Optional[int]]:
+        """
+        Trecho do arquivo que contém o intervalo de tempo.
+
+        Começa no último ponto anterior a start e termina um ponto depois do
+        primeiro ponto posterior a end (margem para linhas fora de ordem,
+        como registros de processos filhos).
+
+        Returns:
+            (posição inicial, posição final ou None para ir até o fim)
+        """
+        begin = 0
+        if start:
+            i = bisect_left(self.timestamps, start) - 1
+            begin = self.offsets[i] if i > 0 else 0
+        stop = None
+        if end:
+            j = bisect_right(self.timestamps, end) + 1
+            stop = self.offsets[j] if j < len(self.offsets) else None
+        return begin, stop
+
+    def level_counts(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, int]:
+        """
+        Entradas por nível no arquivo, ou nos blocos que cobrem o intervalo.
+
+        Com intervalo, a contagem é aproximada: inclui os blocos inteiros
+        das bordas. O bloco anterior ao início só entra se a sua última
+        entrada chega ao intervalo (ou se ela não é conhecida).
+        """
+        first = max(0, bisect_left(self.timestamps, start) - 1) if start else 0
+        last = bisect_right(self.timestamps, end) if end else len(self.levels)
+        if start and first < last and '' < self.lasts[first] < start:
+            first += 1
+        counts: Dict[str, int] = {}
+        for levels in self.levels[first:last]:
+            for level, count in levels.items():
+                counts[level] = counts.get(level, 0) + count
+        return counts
+
+
+class LogRangeReader:
+    """Lê as linhas de um arquivo dentro de um intervalo de tempo, sob demanda."""
+
+    def __init__(self, path: Path, start: Optional[str] = None, end: Optional[str] = None,
+                 index: Optional[LogOffsetIndex] = None):
+        """
+        Args:
+            path: Arquivo de log (.log ou .log.gz)
+            start: Timestamp inicial (inclusivo), ou None
+            end: Timestamp final (inclusivo, aceita prefixo), ou None
+            index: Índice de posições para ir direto ao trecho do intervalo
+        """
+        self.path = Path(path)
+        self.start = start
+        self.end = range_end(end)
+        self.begin, self.stop = index.range_offsets(start, self.end) if index else (0, None)
+        # Total a ler, para o progresso (o índice conhece o tamanho descompactado)
+        total = self.stop if self.stop is not None else (index.scanned if index else None)
+        if total is None:
+            total = content_size(self.path)
+        self.total = max(0, total - self.begin)
+        self.position = self.begin  # Posição da próxima linha (linhas completas apenas)
+
+    @property
+    def progress(self) -> float:
+        """Fração do trecho já lida (0..1)."""
+        if not self.total:
+            return 0.0
+        return min(1.0, (self.position - self.begin) / self.total)
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        """Gera (timestamp, linha) das linhas do intervalo, na ordem do arquivo."""
+        compressed = self.path.suffix == '.gz'
+        start, end, stop = self.start, self.end, self.stop
+        with open_log(self.path) as f:
+            f.seek(self.begin)
+            for line in f:
+                if stop is not None and self.position >= stop:
+                    break
+                if not line.endswith(b'\n') and not compressed:
+                    break  # Linha ainda sendo gravada
+                self.position += len(line)
+                timestamp = line_timestamp(line)
+                if (start and timestamp < start) or (end and timestamp > end):
+                    continue
+                yield timestamp, line
+
+
+def merge_readers(readers: List[LogRangeReader]) -> Iterator[Tuple[str, bytes, LogRangeReader]]:
+    """
+    Combina as linhas de vários arquivos por timestamp (merge de k vias, preguiçoso).
+
+    Em timestamps iguais, mantém a ordem dos leitores e, em cada arquivo, a
+    ordem das linhas.
+
+    Returns:
+        Iterador de (timestamp, linha, leitor de origem)
+    """
+    def tagged(reader: LogRangeReader):
+        for timestamp, line in reader:
+            yield timestamp, line, reader
+
+    return heapq.merge(*(tagged(reader) for reader in readers), key=itemgetter(0))
@@ -1,14 +1,78 @@
 """
 LogUtils - Sistema de logging para a aplicação MTL_UTIL.
 
-Gerencia logs estruturados com rotação automática de arquivos.
+Gerencia logs estruturados com rotação automática de arquivos. As
+chamadas apenas enfileiram o registro; uma thread de fundo formata e grava
+em lote em um arquivo mantido aberto, descarregando por tamanho, por tempo,
+imediatamente em ERROR/CRITICAL e ao encerrar o processo.
+
+Nada é gravado na importação: a pasta, o arquivo e os tratadores de saída
+são criados no primeiro registro, e a compactação/limpeza dos logs antigos
+roda depois, em segundo plano.
+
+O arquivo ativo é trocado ao atingir MAX_FILE_BYTES ou MAX_FILE_AGE_S; os
+segmentos anteriores são compactados (.log.gz) em segundo plano e os mais
+antigos são removidos quando o total passa de MAX_TOTAL_BYTES. Cada arquivo
+tem um índice lateral (.log.idx) com a posição, o timestamp e a contagem
+por nível a cada 1000 entradas, usado pelo LogViewer para ir direto a um
+intervalo de tempo.
+
+Cada chamada é comparada primeiro com o nível mínimo (global ou por
+ToolKey). Mensagens podem ser passadas de forma preguiçosa, como string de
+formato e argumentos ou como função, e só são montadas se o nível estiver
+habilitado:
+
+    logger.debug(TOOL_KEY, "Classe", "Imagem %d/%d: %s", idx, total, nome)
+    logger.debug(TOOL_KEY, "Classe", lambda: f"Resumo: {calcular()}")
+
+Durações são medidas com spans (relógio monotônico em ns), como bloco
+`with` ou decorador; spans aninhados na mesma thread registram o pai:
+
+    with logger.span(TOOL_KEY, "Classe", "exportar", imagens=len(paths)) as span:
+        ...
+        span.set(paginas=n)
+
+    @logger.span(TOOL_KEY, "Classe", "converter")
+    def converter(...): ...
+
+Spans e registros podem ser gravados em um trace (Chrome Trace Event,
+aberto no Perfetto) com logger.start_trace()/stop_trace(), pelo menu Help
+ou pela variável de ambiente MTL_UTIL_TRACE (1 ou caminho do arquivo).
+
+Pontos de log muito frequentes podem ser limitados por ToolKey (no máximo
+N por segundo ou 1 a cada K, por ponto de chamada); a quantidade suprimida
+é registrada periodicamente em uma linha de resumo:
+
+    logger.set_rate_limit(ToolKey.IMAGE_MERGER, per_second=20)
+    MTL_UTIL_LOG_LIMITS=image_merger=20/s,ico_converter=1/100
+
+Processos filhos (ex: ProcessPoolExecutor) enviam seus registros por uma
+fila ao processo principal, que é o único a gravar no arquivo:
+
+    with ProcessPoolExecutor(**logger.process_pool_kwargs()) as pool: ...
+
+    # no processo filho, para marcar os registros de uma tarefa
+    with logger.job(job_id): ...
 """
 
+import atexit
+import faulthandler
+import functools
+import itertools
 import json
 import os
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from utils.TraceRecorder import TraceRecorder
 from enum import Enum
 
 
@@ -21,6 +85,16 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+# Ordem dos níveis para o filtro de nível mínimo
+LEVEL_NUMBERS = {
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+    LogLevel.CRITICAL: 50,
+}
+
+
 class TimeUtils:
     """Utilitários para manipulação de tempo e datas."""
 
@@ -35,86 +109,1512 @@ class TimeUtils:
         return datetime.now().strftime("%Y-%m-%d")
 
 
-import os
+class RecordFormatter:
+    """Converte registros (timestamp, nível, tool_key, classe, mensagem, extra_data) em linhas JSON."""
+
+    def __init__(self):
+        self._last_second = None
+        self._last_stamp = ''
+
+    def format(self, record: tuple) -> str:
+        """Retorna a linha JSON (com quebra de linha) de um registro."""
+        created, level, tool_key, class_name, message, extra_data = record
+
+        second = int(created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_stamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+
+        entry = {
+            "timestamp": self._last_stamp,
+            "level": level,
+            "tool_key": tool_key,
+            "class_name": class_name,
+            "message": message,
+            "extra_data": extra_data or {}
+        }
+        return json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+
+
+class LogIndexWriter:
+    """
+    Grava o índice lateral (.log.idx) de um arquivo de log.
+
+    Uma linha JSON por bloco de EVERY entradas: posição em bytes do bloco,
+    timestamps da primeira e da última entrada, entradas, tamanho em bytes e
+    contagem por nível. O último bloco, incompleto, é gravado ao fechar. As posições
+    continuam válidas depois da compactação (conteúdo do .log.gz), e o mesmo
+    índice atende os dois arquivos.
+    """
+
+    EVERY = 1000
+    SUFFIX = '.idx'
+
+    # Posições fixas nas linhas do RecordFormatter; o nível é reconhecido
+    # pelas 3 primeiras letras
+    _PREFIX = '{"timestamp": "'
+    _LEVEL_START = len('{"timestamp": "0000-00-00 00:00:00", "level": "')
+    _LEVEL_MARK = '", "level": "'
+    _LEVEL_CODE = itemgetter(slice(_LEVEL_START, _LEVEL_START + 3))
+    _LEVEL_CODES = {level.value[:3]: level.value for level in LogLevel}
+
+    def __init__(self, log_file: Path):
+        """
+        Args:
+            log_file: Arquivo de log novo (vazio) que será indexado
+        """
+        self.path = self.path_for(log_file)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._newline_extra = len(os.linesep) - 1  # Arquivo em modo texto: \r\n no Windows
+        self._offset = 0
+        self._block_offset = 0
+        self._block_timestamp = ''
+        self._block_last = ''
+        self._block_entries = 0
+        self._block_levels: Dict[str, int] = {}
+
+    @classmethod
+    def path_for(cls, log_file: Path) -> Path:
+        """Índice de um log (.log ou .log.gz): <nome>.log.idx."""
+        if log_file.suffix == '.gz':
+            log_file = log_file.with_suffix('')
+        return log_file.with_name(log_file.name + cls.SUFFIX)
+
+    @classmethod
+    def line_timestamp(cls, line: str) -> str:
+        """Timestamp de uma linha formatada, sem interpretar o JSON."""
+        if line.startswith(cls._PREFIX):
+            return line[len(cls._PREFIX):len(cls._PREFIX) + 19]
+        try:
+            return str(json.loads(line).get('timestamp', ''))
+        except (ValueError, AttributeError):
+            return ''
+
+    @classmethod
+    def line_level(cls, line: str) -> str:
+        """Nível de uma linha formatada, sem interpretar o JSON."""
+        if line.startswith(cls._PREFIX) and line.startswith(cls._LEVEL_MARK, cls._LEVEL_START - len(cls._LEVEL_MARK)):
+            end = line.find('"', cls._LEVEL_START)
+            if end > 0:
+                return line[cls._LEVEL_START:end]
+        try:
+            return str(json.loads(line).get('level', ''))
+        except (ValueError, AttributeError):
+            return ''
+
+    def add(self, lines: List[str]) -> None:
+        """Registra linhas acrescentadas ao log (na ordem gravada)."""
+        pos = 0
+        while pos < len(lines):
+            # Trecho do lote que cabe no bloco atual: tamanho e níveis de uma vez
+            segment = lines[pos:pos + self.EVERY - self._block_entries]
+            pos += len(segment)
+            if not self._block_entries:
+                self._block_timestamp = self.line_timestamp(segment[0])
+            self._block_last = self.line_timestamp(segment[-1])
+            data = ''.join(segment)
+            size = len(data) if data.isascii() else len(data.encode('utf-8'))
+            self._offset += size + self._newline_extra * len(segment)
+
+            levels = self._block_levels
+            for code, count in Counter(map(self._LEVEL_CODE, segment)).items():
+                level = self._LEVEL_CODES.get(code)
+                if level is None:
+                    # Linha fora do formato padrão
+                    for line in segment:
+                        if self._LEVEL_CODE(line) == code:
+                            level = self.line_level(line)
+                            levels[level] = levels.get(level, 0) + 1
+                else:
+                    levels[level] = levels.get(level, 0) + count
+
+            self._block_entries += len(segment)
+            if self._block_entries >= self.EVERY:
+                self._write_block()
+
+    def flush(self) -> None:
+        """Descarrega os blocos gravados (depois do próprio log)."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Grava o bloco incompleto e fecha o índice."""
+        self._write_block()
+        self._file.close()
+
+    def discard(self) -> None:
+        """Fecha e remove o índice (ex: após um erro de gravação)."""
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        self.path.unlink(missing_ok=True)
+
+    def _write_block(self) -> None:
+        """Grava a linha do bloco atual e inicia o próximo."""
+        if not self._block_entries:
+            return
+        self._file.write(json.dumps({
+            "offset": self._block_offset,
+            "timestamp": self._block_timestamp,
+            "last": self._block_last,
+            "entries": self._block_entries,
+            "bytes": self._offset - self._block_offset,
+            "levels": self._block_levels,
+        }) + '\n')
+        self._block_offset = self._offset
+        self._block_entries = 0
+        self._block_levels = {}
+
+
+class LogWriter:
+    """
+    Grava registros de log em segundo plano.
+
+    Os registros chegam por uma fila e são gravados em lote por uma única
+    thread, em um arquivo mantido aberto. Com max_bytes/max_age_s, o arquivo
+    é trocado entre lotes: rotate_callback recebe o arquivo encerrado e
+    retorna o próximo. Com index=True, cada arquivo novo ganha um índice
+    lateral (LogIndexWriter).
+    """
+
+    FLUSH_BYTES = 64 * 1024   # Descarregar ao acumular esse volume
+    FLUSH_INTERVAL_S = 1.0    # ... ou após esse tempo desde o primeiro registro pendente
+    BATCH_MAX = 1024          # Registros formatados por ciclo
+    URGENT_LEVELS = frozenset((LogLevel.ERROR.value, LogLevel.CRITICAL.value))
+
+    _STOP = object()
+
+    def __init__(self, log_file: Path, max_bytes: int = 0, max_age_s: float = 0,
+                 rotate_callback: Optional[Callable[[Path], Path]] = None, index: bool = False):
+        """
+        Args:
+            log_file: Arquivo onde os registros são acrescentados
+            max_bytes: Tamanho que dispara a troca de arquivo (0 = sem limite)
+            max_age_s: Tempo de uso que dispara a troca de arquivo (0 = sem limite)
+            rotate_callback: Recebe o arquivo encerrado e retorna o novo
+            index: Gravar o índice lateral dos arquivos criados
+        """
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self._rotate_callback = rotate_callback
+        self._write_index = index
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._index: Optional[LogIndexWriter] = None
+        self._file_bytes = 0
+        self._opened_at = 0.0
+        self._pending_bytes = 0
+        self._pending_since = None
+        self._closed = False
+        self._direct_lock = threading.Lock()
+        self._formatter = RecordFormatter()
+
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: tuple) -> None:
+        """
+        Enfileira um registro (timestamp, nível, tool_key, classe, mensagem, extra_data).
+
+        Depois de close(), o registro é gravado diretamente no arquivo.
+        """
+        if self._closed:
+            self._write_direct(record)
+        else:
+            self._queue.put(record)
+
+    def submit_line(self, line: str, urgent: bool = False) -> None:
+        """Enfileira uma linha já formatada (ex: vinda de um processo filho)."""
+        if self._closed:
+            with self._direct_lock:
+                try:
+                    with open(self.log_file, 'a', encoding='utf-8') as f:
+                        f.write(line)
+                except Exception as e:
+                    print(f"Erro ao escrever log: {e}")
+        else:
+            self._queue.put((line, urgent))
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        Aguarda a gravação de tudo o que foi enfileirado até agora.
+
+        Returns:
+            True se a gravação terminou dentro do prazo
+        """
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Grava os registros pendentes e encerra a thread de gravação."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def format_record(self, record: tuple) -> str:
+        """Converte um registro na linha JSON gravada no arquivo."""
+        return self._formatter.format(record)
+
+    def _run(self) -> None:
+        """Laço da thread de gravação."""
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+
+        while True:
+            timeout = None
+            if self._pending_since is not None:
+                timeout = max(0.0, self._pending_since + self.FLUSH_INTERVAL_S - time.monotonic())
+            try:
+                item = get(timeout=timeout)
+            except queue.Empty:
+                self._flush_file()
+                continue
+
+            lines = []
+            urgent = False
+            waiters = []
+            stop = False
+            while True:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif len(item) == 2:
+                    # Linha já formatada: (texto, urgente)
+                    lines.append(item[0])
+                    urgent = urgent or item[1]
+                else:
+                    try:
+                        lines.append(self.format_record(item))
+                    except Exception as e:
+                        print(f"Erro ao formatar log: {e}")
+                    urgent = urgent or item[1] in self.URGENT_LEVELS
+                if stop or len(lines) >= self.BATCH_MAX:
+                    break
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+
+            if lines:
+                self._write_lines(lines)
+            if urgent or waiters or stop or self._pending_bytes >= self.FLUSH_BYTES:
+                self._flush_file()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                self._close_file()
+                return
+
+    def _write_lines(self, lines: list) -> None:
+        """Acrescenta linhas ao arquivo aberto (sem descarregar)."""
+        data = ''.join(lines)
+        if self._file is not None and self._should_rotate():
+            self._rotate()
+        try:
+            if self._file is None:
+                self._file = open(self.log_file, 'a', encoding='utf-8', buffering=self.FLUSH_BYTES)
+                self._file_bytes = self._file.tell()
+                self._opened_at = time.monotonic()
+                if self._write_index and not self._file_bytes:
+                    self._open_index()
+            self._file.write(data)
+        except Exception as e:
+            print(f"Erro ao escrever log: {e}")
+            return
+        if self._index is not None:
+            try:
+                self._index.add(lines)
+            except Exception as e:
+                self._drop_index(e)
+        self._file_bytes += len(data)  # Em caracteres: aproximado para textos não ASCII
+        self._pending_bytes += len(data)
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+
+    def _should_rotate(self) -> bool:
+        """Indica se o arquivo atual atingiu o tamanho ou o tempo de uso máximo."""
+        if self._rotate_callback is None:
+            return False
+        if self.max_bytes and self._file_bytes >= self.max_bytes:
+            return True
+        return bool(self.max_age_s) and time.monotonic() - self._opened_at >= self.max_age_s
+
+    def _rotate(self) -> None:
+        """Fecha o arquivo atual e passa a gravar no próximo."""
+        self._flush_file()
+        self._close_file()
+        try:
+            self.log_file = self._rotate_callback(self.log_file)
+        except Exception as e:
+            print(f"Erro ao rotacionar log: {e}")
+
+    def _flush_file(self) -> None:
+        """Descarrega o buffer do arquivo no disco."""
+        self._pending_bytes = 0
+        self._pending_since = None
+        if self._file is not None:
+            try:
+                self._file.flush()
+            except Exception as e:
+                print(f"Erro ao escrever log: {e}")
+        if self._index is not None:
+            try:
+                self._index.flush()
+            except Exception as e:
+                self._drop_index(e)
+
+    def _close_file(self) -> None:
+        """Fecha o arquivo de log (e o índice)."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+        if self._index is not None:
+            try:
+                self._index.close()
+            except Exception as e:
+                print(f"Erro ao gravar índice do log: {e}")
+            self._index = None
+
+    def _open_index(self) -> None:
+        """Cria o índice lateral do arquivo recém-aberto."""
+        try:
+            self._index = LogIndexWriter(self.log_file)
+        except Exception as e:
+            print(f"Erro ao criar índice do log: {e}")
+
+    def _drop_index(self, error: Exception) -> None:
+        """Abandona o índice após um erro; o log continua sendo gravado sem ele."""
+        print(f"Erro ao gravar índice do log: {error}")
+        index, self._index = self._index, None
+        try:
+            index.discard()
+        except OSError:
+            pass
+
+    def _write_direct(self, record: tuple) -> None:
+        """Grava um registro de forma síncrona (após o encerramento da thread)."""
+        with self._direct_lock:
+            try:
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    f.write(self.format_record(record))
+            except Exception as e:
+                print(f"Erro ao escrever log: {e}")
+
+
+class RateLimiter:
+    """
+    Limite de frequência por ponto de chamada para uma ferramenta.
+
+    Cada ponto de chamada (arquivo e linha) tem sua própria contagem:
+    - per_second: no máximo N registros por janela de 1 s
+    - sample_every: apenas 1 a cada K registros (o primeiro sempre passa)
+
+    Só afeta níveis até max_level (por padrão INFO): avisos e erros nunca
+    são suprimidos.
+    """
+
+    SUMMARY_INTERVAL_S = 10.0  # Intervalo mínimo entre resumos de um mesmo ponto
+
+    def __init__(self, per_second: Optional[int] = None, sample_every: Optional[int] = None,
+                 max_level: LogLevel = LogLevel.INFO):
+        if not per_second and not sample_every:
+            raise ValueError("Informe per_second e/ou sample_every")
+        self.per_second = per_second or 0
+        self.sample_every = sample_every or 0
+        self.max_level = max_level
+        self.levels = tuple(lvl for lvl in LogLevel if LEVEL_NUMBERS[lvl] <= LEVEL_NUMBERS[max_level])
+        # ponto -> [início da janela, registros na janela, vistos, suprimidos, último resumo]
+        self._sites: Dict[Any, list] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: Union[str, Dict[str, Any]]) -> 'RateLimiter':
+        """
+        Cria um limitador a partir da configuração.
+
+        Aceita '50/s' (por segundo), '1/100' (amostragem), os dois separados
+        por '+' ('50/s+1/10') ou um dicionário {'per_second', 'sample_every', 'max_level'}.
+
+        Raises:
+            ValueError: Se a configuração for inválida
+        """
+        if isinstance(spec, dict):
+            max_level = spec.get('max_level', LogLevel.INFO.value)
+            return cls(spec.get('per_second'), spec.get('sample_every'),
+                       LogLevel(str(max_level).upper()))
+        per_second = sample_every = None
+        try:
+            for part in str(spec).replace(' ', '').split('+'):
+                count, _, unit = part.partition('/')
+                if unit.lower() == 's':
+                    per_second = int(count)
+                elif count == '1' and unit:
+                    sample_every = int(unit)
+                else:
+                    raise ValueError
+        except ValueError:
+            raise ValueError(f"Limite de log inválido: {spec}") from None
+        return cls(per_second, sample_every)
+
+    def describe(self) -> str:
+        """Configuração no formato aceito por parse()."""
+        parts = []
+        if self.per_second:
+            parts.append(f"{self.per_second}/s")
+        if self.sample_every:
+            parts.append(f"1/{self.sample_every}")
+        return '+'.join(parts)
+
+    def allow(self, site: Any, now: float) -> Tuple[bool, int]:
+        """
+        Decide se um registro do ponto de chamada passa.
+
+        Args:
+            site: Chave do ponto de chamada
+            now: Tempo monotônico atual
+
+        Returns:
+            Tupla (permitido, suprimidos a resumir agora)
+        """
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None:
+                state = self._sites[site] = [now, 0, 0, 0, now]
+            state[2] += 1
+
+            allowed = not self.sample_every or (state[2] - 1) % self.sample_every == 0
+            if allowed and self.per_second:
+                if now - state[0] >= 1.0:
+                    state[0] = now
+                    state[1] = 0
+                if state[1] >= self.per_second:
+                    allowed = False
+                else:
+                    state[1] += 1
+
+            if not allowed:
+                state[3] += 1
+            report = 0
+            if state[3] and now - state[4] >= self.SUMMARY_INTERVAL_S:
+                report = state[3]
+                state[3] = 0
+                state[4] = now
+            return allowed, report
+
+    def drain(self) -> List[Tuple[str, int]]:
+        """Retorna e zera as contagens suprimidas ainda não resumidas: [(rótulo, quantidade)]."""
+        pending = []
+        with self._lock:
+            for site, state in self._sites.items():
+                if state[3]:
+                    pending.append((self.site_label(site), state[3]))
+                    state[3] = 0
+        return pending
+
+    @staticmethod
+    def site_label(site: Any) -> str:
+        """Rótulo legível de um ponto de chamada (arquivo:linha ou nome do span)."""
+        if isinstance(site, tuple) and len(site) == 2 and hasattr(site[0], 'co_filename'):
+            return f"{os.path.basename(site[0].co_filename)}:{site[1]}"
+        return str(site)
+
+
+class ProcessLogSink:
+    """
+    Destino dos registros em um processo filho.
+
+    Os registros são formatados no próprio filho (com o PID em extra_data)
+    e enviados pela fila ao processo principal, que grava as linhas no
+    arquivo atual. Assim vários processos registram sem disputar o arquivo.
+    """
+
+    def __init__(self, log_queue):
+        """
+        Args:
+            log_queue: Fila criada por LogUtils.process_queue() no processo principal
+        """
+        self._queue = log_queue
+        self._formatter = RecordFormatter()
+        self._closed = False
+        self.pid = os.getpid()
+        self.log_file = None
+
+    def submit(self, record: tuple) -> None:
+        """Formata o registro e o envia ao processo principal."""
+        if self._closed:
+            return
+        created, level, tool_key, class_name, message, extra_data = record
+        extra_data = dict(extra_data) if extra_data else {}
+        extra_data.setdefault("pid", self.pid)
+        try:
+            line = self._formatter.format((created, level, tool_key, class_name, message, extra_data))
+            self._queue.put(('log', line, level in LogWriter.URGENT_LEVELS))
+        except Exception as e:
+            print(f"Erro ao enviar log ao processo principal: {e}")
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Os registros já estão na fila; a gravação ocorre no processo principal."""
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Aguarda o envio dos registros pendentes da fila."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.close()
+            self._queue.join_thread()
+        except Exception:
+            pass
+
+
+class ProcessTraceForwarder:
+    """Em um processo filho, repassa spans e eventos ao trace do processo principal."""
+
+    def __init__(self, log_queue):
+        self._queue = log_queue
+
+    def add_span(self, *args) -> None:
+        self._queue.put(('span', args))
+
+    def add_instant(self, *args) -> None:
+        self._queue.put(('instant', args))
+
+    def __len__(self) -> int:
+        return 0
+
+
+class Span:
+    """
+    Mede a duração de um trecho e a registra no log ao final.
+
+    O registro leva em extra_data: nome, início e duração (ns, relógio
+    monotônico), ids do span e do span pai (aninhamento na mesma thread),
+    thread, status e os atributos informados. Se o nível estiver
+    desabilitado para a ferramenta, o span não mede nem registra nada,
+    exceto com um trace ativo, que recebe todos os spans.
+    """
+
+    _ids = itertools.count(1)
+    _local = threading.local()
+
+    __slots__ = ('_logger', 'level', 'tool_key', 'class_name', 'name', 'attributes',
+                 'span_id', 'parent_id', 'start_ns', 'duration_ns', '_enabled', '_log_enabled')
+
+    def __init__(self, log: 'LogUtils', level: LogLevel, tool_key: str, class_name: str,
+                 name: str, attributes: Dict[str, Any]):
+        self._logger = log
+        self.level = level
+        self.tool_key = tool_key
+        self.class_name = class_name
+        self.name = name
+        self.attributes = attributes
+        self.span_id = 0
+        self.parent_id = 0
+        self.start_ns = 0
+        self.duration_ns = 0
+        self._enabled = False
+        self._log_enabled = False
+
+    @classmethod
+    def current(cls) -> Optional['Span']:
+        """Span ativo mais interno da thread atual (None se não houver)."""
+        stack = getattr(cls._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def set(self, **attributes) -> 'Span':
+        """Acrescenta atributos ao registro do span."""
+        if self._enabled:
+            self.attributes.update(attributes)
+        return self
+
+    def __enter__(self) -> 'Span':
+        self._log_enabled = self._logger.is_enabled_for(self.level, self.tool_key)
+        self._enabled = self._log_enabled or self._logger._trace is not None
+        if not self._enabled:
+            return self
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        self.parent_id = stack[-1].span_id if stack else 0
+        self.span_id = next(self._ids)
+        stack.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb) -> bool:
+        if not self._enabled:
+            return False
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+
+        stack = self._local.stack
+        depth = len(stack) - 1
+        if stack and stack[-1] is self:
+            stack.pop()
+        elif self in stack:
+            stack.remove(self)
+
+        thread = threading.current_thread()
+        extra = {
+            "span": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "depth": depth,
+            "start_ns": self.start_ns,
+            "duration_ns": self.duration_ns,
+            "pid": os.getpid(),
+            "thread_id": thread.ident,
+            "thread_name": thread.name,
+            "status": "ok" if exc_type is None else "error",
+        }
+        if exc_type is not None:
+            extra["error"] = f"{exc_type.__name__}: {exc_value}"
+        if self.attributes:
+            extra["attributes"] = self.attributes
+
+        trace = self._logger._trace
+        if trace is not None:
+            args = dict(self.attributes, class_name=self.class_name, status=extra["status"])
+            if exc_type is not None:
+                args["error"] = extra["error"]
+            trace.add_span(self.name or "span", self.tool_key, self.start_ns, self.duration_ns,
+                           extra["pid"], thread.ident, thread.name, args)
+        if self._log_enabled:
+            self._logger._emit(self.level, self.tool_key, self.class_name, "%s: %.3f ms",
+                               (self.name, self.duration_ns / 1e6), extra, site=f"span {self.name}")
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        """Uso como decorador: cada chamada da função mede um novo span."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(self._logger, self.level, self.tool_key, self.class_name,
+                      self.name or func.__qualname__, dict(self.attributes)):
+                return func(*args, **kwargs)
+        return wrapper
+
 
 class LogUtils:
     """Sistema de logging com rotação automática de arquivos."""
 
     # Novo diretório de logs fixo no AppData do usuário
     APPDATA_LOG_DIR = Path(os.getenv('LOCALAPPDATA', str(Path.home() / 'AppData' / 'Local'))) / 'MTL_UTIL' / 'logs'
-    MAX_LOG_FILES = 2  # Manter apenas 2 arquivos de log
+    LOG_PREFIX = 'mtl_util_'
+    ARCHIVE_SUFFIX = '.gz'
+    MAX_FILE_BYTES = 5 * 1024 * 1024      # Troca o arquivo ativo ao atingir 5 MB
+    MAX_FILE_AGE_S = 24 * 3600            # ... ou após 24 h de uso
+    MAX_TOTAL_BYTES = 50 * 1024 * 1024    # Espaço total dos logs (ativo + compactados)
+    ORPHAN_AGE_S = 3600                   # .log sem alteração há 1 h é de uma execução encerrada
+    FAULT_LOG_FILE = 'faults.txt'  # Tracebacks de falhas fatais (faulthandler)
+    STARTUP_ARCHIVE_DELAY_S = 10.0  # Espera antes de compactar logs antigos (fora da inicialização)
+
+    # Nível mínimo por variável de ambiente, ex:
+    #   MTL_UTIL_LOG_LEVEL=DEBUG
+    #   MTL_UTIL_LOG_LEVELS=file_index=WARNING,pdf_util=DEBUG
+    ENV_LEVEL = 'MTL_UTIL_LOG_LEVEL'
+    ENV_TOOL_LEVELS = 'MTL_UTIL_LOG_LEVELS'
+    ENV_LIMITS = 'MTL_UTIL_LOG_LIMITS'  # ex: image_merger=20/s,ico_converter=1/100
+    ENV_TRACE = 'MTL_UTIL_TRACE'  # 1 = gravar trace na pasta padrão; ou caminho do arquivo
+    TRACE_DIR_NAME = 'traces'
+    # DEBUG só quando pedido (variável de ambiente ou preferência 'log_levels')
+    DEFAULT_LEVEL = LogLevel.INFO
+
+    _DEBUG = LEVEL_NUMBERS[LogLevel.DEBUG]
+    _INFO = LEVEL_NUMBERS[LogLevel.INFO]
+    _WARNING = LEVEL_NUMBERS[LogLevel.WARNING]
+    _ERROR = LEVEL_NUMBERS[LogLevel.ERROR]
+    _CRITICAL = LEVEL_NUMBERS[LogLevel.CRITICAL]
+
+    # Arquivos em uso por instâncias deste processo (nunca compactados na inicialização)
+    # e todos os nomes já gerados (um nome nunca é reutilizado, mesmo se removido)
+    _active_files = set()
+    _issued_files = set()
 
     def __init__(self):
+        """
+        Cria o logger sem nenhum I/O; a gravação é iniciada no primeiro registro.
+        """
         self.LOG_DIR = self.APPDATA_LOG_DIR
-        self.LOG_DIR.mkdir(parents=True, exist_ok=True)
         self._current_log_file = None
-        self._rotate_logs()
-        self._create_new_log_file()
+        self._writer: Optional[LogWriter] = None
+        self._start_lock = threading.Lock()
+        self._fault_file = None
+        self._archiver = None
+        self._archive_lock = threading.Lock()
+        self._min_level = LEVEL_NUMBERS[self.DEFAULT_LEVEL]
+        self._tool_levels: Dict[str, int] = {}
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._trace: Optional[TraceRecorder] = None
+        self._trace_path: Optional[Path] = None
+        self._local = threading.local()
+        self._process_queues: Dict[str, tuple] = {}  # start method -> (fila, thread de recepção)
+        self._sync_events: Dict[int, threading.Event] = {}
+        self._load_env_levels()
+        self._install_exit_handlers()
+
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+        env_trace = TraceRecorder.resolve_env_path(os.getenv(self.ENV_TRACE), self.trace_dir)
+        if env_trace is not None:
+            self.start_trace(env_trace)
+
+    def _start(self):
+        """
+        Inicia a gravação no primeiro registro.
+
+        Cria a pasta e o arquivo de log, liga o faulthandler e agenda a
+        compactação dos logs antigos. Em um processo filho do
+        multiprocessing, usa um arquivo próprio (ver _start_child).
+
+        Returns:
+            O destino dos registros
+        """
+        with self._start_lock:
+            if self._writer is not None:
+                return self._writer
+            try:
+                self.LOG_DIR.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"Erro ao criar pasta de logs: {e}")
+
+            if self._in_child_process():
+                self._start_child()
+                return self._writer
+
+            self._create_new_log_file()
+            self._enable_faulthandler()
+            self._rotate_logs()
+            return self._writer
+
+    @staticmethod
+    def _in_child_process() -> bool:
+        """Indica se este é um processo filho do multiprocessing."""
+        # Sem o módulo importado não há como ser um filho do multiprocessing
+        multiprocessing = sys.modules.get('multiprocessing')
+        if multiprocessing is None:
+            return False
+        return (multiprocessing.parent_process() is not None
+                or getattr(multiprocessing.current_process(), '_inheriting', False))
+
+    def _start_child(self):
+        """
+        Inicia a gravação em um processo filho sem a fila do processo principal.
+
+        O filho grava em um arquivo próprio, criado apenas se algo for
+        registrado; nunca no arquivo do processo principal.
+        """
+        from multiprocessing import util as mp_util
+
+        self._current_log_file = self._new_log_path(suffix=f"_pid{os.getpid()}")
+        self._writer = LogWriter(self._current_log_file, index=True)
+        # Processos filhos terminam com os._exit: o Finalize roda antes disso
+        mp_util.Finalize(self, LogUtils.close, args=(self,), exitpriority=10)
+
+    def _after_fork(self):
+        """
+        No processo filho após um fork: descarta o estado herdado.
+
+        A thread de gravação do pai não existe no filho; a gravação é
+        reiniciada no primeiro registro do filho.
+        """
+        self._writer = None
+        self._current_log_file = None
+        self._start_lock = threading.Lock()
+        self._trace = None
+        self._process_queues = {}
+        self._sync_events = {}
+        self._archiver = None
+        self._archive_lock = threading.Lock()
+
+    @staticmethod
+    def init_child_process(log_queue, min_level: int = None, tool_levels: Dict[str, int] = None,
+                           tracing: bool = False, limits: Dict[str, str] = None):
+        """
+        Inicializador de processos filhos (ex: initializer do ProcessPoolExecutor).
+
+        Passa a enviar os registros do logger global à fila do processo
+        principal, com os mesmos níveis mínimos.
+
+        Args:
+            log_queue: Fila obtida com process_queue() no processo principal
+            min_level: Nível mínimo global (numérico)
+            tool_levels: Níveis por ferramenta
+            tracing: Se o processo principal está gravando um trace
+            limits: Limites de frequência (formato de configure_limits)
+        """
+        log = logger
+        if min_level is not None:
+            log._min_level = min_level
+        if tool_levels is not None:
+            log._tool_levels = dict(tool_levels)
+        if limits:
+            from multiprocessing import util as mp_util
+            log._limiters = {key: RateLimiter.parse(spec) for key, spec in limits.items()}
+            # Antes do fechamento da fila (prioridade 10), para os resumos chegarem ao pai
+            mp_util.Finalize(log, LogUtils._report_all_suppressed, args=(log,), exitpriority=20)
+
+        previous = log._writer
+        log._writer = ProcessLogSink(log_queue)
+        log._current_log_file = None
+        log._trace = ProcessTraceForwarder(log_queue) if tracing else None
+        if previous is not None and not isinstance(previous, ProcessLogSink):
+            previous.close()
+
+    def process_queue(self, mp_context=None):
+        """
+        Fila para registros de processos filhos, criada no primeiro uso.
+
+        Uma thread do processo principal recebe os registros e os entrega à
+        gravação normal (e ao trace, se ativo).
+
+        Args:
+            mp_context: Contexto do multiprocessing usado pelos filhos (padrão: o do sistema)
+        """
+        import multiprocessing  # Importado só quando há processos filhos
+
+        context = mp_context or multiprocessing.get_context()
+        method = context.get_start_method()
+        entry = self._process_queues.get(method)
+        if entry is None:
+            log_queue = context.Queue()
+            listener = threading.Thread(target=self._run_process_listener, args=(log_queue,),
+                                        name=f"LogProcessListener-{method}", daemon=True)
+            listener.start()
+            entry = self._process_queues[method] = (log_queue, listener)
+        return entry[0]
+
+    def process_pool_kwargs(self, mp_context=None) -> Dict[str, Any]:
+        """
+        Argumentos de ProcessPoolExecutor/multiprocessing.Pool que ligam os
+        filhos ao log do processo principal.
+
+        Ex: ProcessPoolExecutor(max_workers=4, **logger.process_pool_kwargs())
+
+        Args:
+            mp_context: Contexto do multiprocessing, se o pool usar um específico
+                (também é incluído nos argumentos retornados)
+        """
+        kwargs = {
+            "initializer": LogUtils.init_child_process,
+            "initargs": (self.process_queue(mp_context), self._min_level, dict(self._tool_levels),
+                         self._trace is not None, self.get_limits()),
+        }
+        if mp_context is not None:
+            kwargs["mp_context"] = mp_context
+        return kwargs
+
+    @contextmanager
+    def job(self, job_id: Any):
+        """
+        Marca os registros da thread atual com um id de tarefa (extra_data['job_id']).
+
+        Ex: with logger.job(indice): ...
+        """
+        previous = getattr(self._local, 'job_id', None)
+        self._local.job_id = job_id
+        try:
+            yield
+        finally:
+            self._local.job_id = previous
+
+    def _run_process_listener(self, log_queue):
+        """Laço que recebe registros e eventos de trace dos processos filhos."""
+        while True:
+            try:
+                item = log_queue.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            kind, payload = item[0], item[1]
+            if kind == 'sync':
+                event = self._sync_events.pop(payload, None)
+                if event is not None:
+                    event.set()
+            elif kind == 'log':
+                writer = self._writer or self._start()
+                writer.submit_line(payload, item[2])
+            else:
+                trace = self._trace
+                if trace is not None:
+                    if kind == 'span':
+                        trace.add_span(*payload)
+                    else:
+                        trace.add_instant(*payload)
+
+    def _sync_process_queues(self, timeout: float = 2.0) -> bool:
+        """Aguarda a recepção de tudo o que os filhos já enviaram às filas."""
+        ok = True
+        for log_queue, listener in list(self._process_queues.values()):
+            if not listener.is_alive():
+                continue
+            event = threading.Event()
+            self._sync_events[id(event)] = event
+            try:
+                log_queue.put(('sync', id(event)))
+            except Exception:
+                self._sync_events.pop(id(event), None)
+                continue
+            ok = event.wait(timeout) and ok
+        return ok
+
+    def _stop_process_listeners(self):
+        """Recebe o que ainda estiver nas filas e encerra as threads de recepção."""
+        queues, self._process_queues = self._process_queues, {}
+        for log_queue, listener in queues.values():
+            try:
+                log_queue.put(None)
+                listener.join(5.0)
+            except Exception:
+                pass
 
     def _rotate_logs(self):
-        """Remove logs antigos, mantendo apenas os mais recentes."""
-        log_files = sorted(self.LOG_DIR.glob("mtl_util_*.log"), key=os.path.getmtime, reverse=True)
+        """
+        Agenda a compactação dos logs de execuções anteriores e o limite de
+        espaço, em segundo plano e após STARTUP_ARCHIVE_DELAY_S.
+        """
+        timer = threading.Timer(self.STARTUP_ARCHIVE_DELAY_S, self._submit_archive, args=(None,))
+        timer.daemon = True
+        timer.start()
 
-        # Manter apenas os 2 mais recentes
-        for old_file in log_files[self.MAX_LOG_FILES:]:
-            old_file.unlink()
+    def _new_log_path(self, suffix: str = "") -> Path:
+        """Gera o nome de um novo arquivo de log com timestamp."""
+        timestamp = TimeUtils.get_current_date().replace("-", "")
+        time_part = datetime.now().strftime("%H%M%S")
+        base = f"{self.LOG_PREFIX}{timestamp}_{time_part}{suffix}"
+        path = self.LOG_DIR / f"{base}.log"
+        counter = 1
+        while (path in LogUtils._issued_files or path.exists()
+               or path.with_name(path.name + self.ARCHIVE_SUFFIX).exists()):
+            path = self.LOG_DIR / f"{base}_{counter}.log"
+            counter += 1
+        LogUtils._issued_files.add(path)
+        return path
 
     def _create_new_log_file(self):
         """Cria um novo arquivo de log com timestamp."""
-        timestamp = TimeUtils.get_current_date().replace("-", "")
-        time_part = datetime.now().strftime("%H%M%S")
-        filename = f"mtl_util_{timestamp}_{time_part}.log"
-        self._current_log_file = self.LOG_DIR / filename
+        self._current_log_file = self._new_log_path()
+        LogUtils._active_files.add(self._current_log_file)
+        self._writer = LogWriter(self._current_log_file, max_bytes=self.MAX_FILE_BYTES,
+                                 max_age_s=self.MAX_FILE_AGE_S, rotate_callback=self._on_rotated, index=True)
 
         # Log inicial
         self.log(LogLevel.INFO, "system", "LogUtils", "Sistema de logging iniciado")
 
-    def log(self, level: LogLevel, tool_key: str, class_name: str, message: str, extra_data: Dict[str, Any] = None):
+    def _on_rotated(self, old_file: Path) -> Path:
+        """Chamado pela thread de gravação ao encerrar um segmento; retorna o próximo arquivo."""
+        new_file = self._new_log_path()
+        LogUtils._active_files.add(new_file)
+        LogUtils._active_files.discard(old_file)
+        self._current_log_file = new_file
+        self._submit_archive(old_file)
+        self.info("system", "LogUtils", "Continuação do log %s", old_file.name)
+        return new_file
+
+    def _submit_archive(self, log_file: Optional[Path]):
+        """Agenda a compactação de um segmento (ou dos logs antigos, se None) e a limpeza."""
+        from concurrent.futures import ThreadPoolExecutor  # Fora do caminho de importação
+
+        try:
+            if self._archiver is None:
+                self._archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LogArchiver")
+            self._archiver.submit(self._archive_logs, log_file)
+        except RuntimeError:
+            pass  # Interpretador encerrando: fica para a próxima execução
+
+    def _archive_logs(self, log_file: Optional[Path]):
+        """Compacta segmentos encerrados e remove os logs mais antigos além do limite."""
+        with self._archive_lock:
+            if log_file is not None:
+                pending = [log_file]
+            else:
+                # Logs de execuções anteriores; arquivos recentes podem ser de
+                # outra instância ainda aberta
+                limit = time.time() - self.ORPHAN_AGE_S
+                pending = []
+                for path in self.LOG_DIR.glob(f"{self.LOG_PREFIX}*.log"):
+                    try:
+                        if path not in LogUtils._active_files and path.stat().st_mtime < limit:
+                            pending.append(path)
+                    except OSError:
+                        continue
+            for path in pending:
+                self.compress_file(path)
+            self._apply_retention()
+
+    @classmethod
+    def compress_file(cls, path: Path) -> Optional[Path]:
+        """
+        Compacta um log com gzip e remove o original.
+
+        O arquivo .gz só aparece depois de completo (gravado em .tmp e renomeado).
+
+        Returns:
+            Caminho do arquivo compactado ou None em caso de erro
+        """
+        import gzip  # Compactação roda em segundo plano: fora da importação do módulo
+        import shutil
+
+        target = path.with_name(path.name + cls.ARCHIVE_SUFFIX)
+        tmp = path.with_name(target.name + '.tmp')
+        if not path.exists():
+            return None  # Já compactado (ex: agendado na inicialização e na rotação)
+        try:
+            with open(path, 'rb') as src, gzip.open(tmp, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            shutil.copystat(path, tmp)  # Manter a data: a ordem dos logs segue o mtime
+            os.replace(tmp, target)
+        except Exception as e:
+            print(f"Erro ao compactar log {path.name}: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            path.unlink()
+        except OSError:
+            # Arquivo ainda aberto por outro processo (Windows): manter o original
+            target.unlink(missing_ok=True)
+            return None
+        return target
+
+    def list_log_files(self) -> List[Path]:
+        """Arquivos de log (ativos e compactados), do mais recente ao mais antigo."""
+        files = [f for f in self.LOG_DIR.glob(f"{self.LOG_PREFIX}*")
+                 if f.name.endswith('.log') or f.name.endswith('.log' + self.ARCHIVE_SUFFIX)]
+
+        def mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        return sorted(files, key=mtime, reverse=True)
+
+    def _apply_retention(self):
+        """
+        Remove os logs compactados mais antigos até o total caber em MAX_TOTAL_BYTES.
+
+        O arquivo ativo entra no total, mas nunca é removido; segmentos ainda
+        não compactados ficam de fora até serem compactados.
+        """
+        total = 0
+        for path in self.list_log_files():
+            if path.suffix != self.ARCHIVE_SUFFIX and path != self._current_log_file:
+                continue
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            total += size
+            if total > self.MAX_TOTAL_BYTES and path.suffix == self.ARCHIVE_SUFFIX:
+                try:
+                    path.unlink()
+                    total -= size
+                    LogIndexWriter.path_for(path).unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def _install_exit_handlers(self):
+        """
+        Garante a gravação dos logs pendentes ao encerrar o processo.
+
+        - atexit: saída normal
+        - sys.excepthook / threading.excepthook: exceções não tratadas são
+          registradas como CRITICAL e gravadas imediatamente
+        - SIGTERM: grava antes de encerrar (se não houver outro tratador)
+
+        Nenhum deles faz I/O; são instalados já na criação do logger.
+        """
+        atexit.register(self.close)
+
+        previous_hook = sys.excepthook
+
+        def excepthook(exc_type, exc_value, exc_tb):
+            if not issubclass(exc_type, KeyboardInterrupt):
+                self._log_exception("Exceção não tratada", exc_type, exc_value, exc_tb)
+            previous_hook(exc_type, exc_value, exc_tb)
+
+        sys.excepthook = excepthook
+
+        previous_thread_hook = threading.excepthook
+
+        def thread_excepthook(args):
+            if args.exc_type is not SystemExit:
+                name = args.thread.name if args.thread is not None else "?"
+                self._log_exception(f"Exceção não tratada na thread {name}",
+                                    args.exc_type, args.exc_value, args.exc_traceback)
+            previous_thread_hook(args)
+
+        threading.excepthook = thread_excepthook
+
+        if threading.current_thread() is threading.main_thread():
+            try:
+                if signal.getsignal(signal.SIGTERM) in (signal.SIG_DFL, None):
+                    signal.signal(signal.SIGTERM, self._on_terminate)
+            except (ValueError, OSError, AttributeError):
+                pass
+
+    def _enable_faulthandler(self):
+        """
+        Falhas fatais do interpretador deixam o traceback em FAULT_LOG_FILE,
+        já que o processo não chega a executar Python.
+        """
+        if not faulthandler.is_enabled():
+            try:
+                self._fault_file = open(self.LOG_DIR / self.FAULT_LOG_FILE, 'a', encoding='utf-8')
+                faulthandler.enable(file=self._fault_file)
+            except Exception:
+                self._fault_file = None
+
+    def _log_exception(self, message: str, exc_type, exc_value, exc_tb):
+        """Registra uma exceção não tratada e grava imediatamente."""
+        import traceback  # Só no caminho de erro: fora da importação do módulo
+
+        self.critical("system", "LogUtils", "%s: %s: %s", message, exc_type.__name__, exc_value,
+                      extra_data={"traceback": ''.join(traceback.format_exception(exc_type, exc_value, exc_tb))})
+        self.flush()
+
+    def _on_terminate(self, signum, frame):
+        """Grava os logs pendentes e repassa o sinal com o tratamento padrão."""
+        self.close()
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+    @staticmethod
+    def parse_level(level: Union[LogLevel, str, int]) -> int:
+        """
+        Converte um nível (LogLevel, nome ou número) no valor numérico.
+
+        Raises:
+            ValueError: Se o nível não existir
+        """
+        if isinstance(level, LogLevel):
+            return LEVEL_NUMBERS[level]
+        if isinstance(level, int):
+            return level
+        try:
+            return LEVEL_NUMBERS[LogLevel(str(level).strip().upper())]
+        except ValueError:
+            raise ValueError(f"Nível de log inválido: {level}") from None
+
+    def set_level(self, level: Union[LogLevel, str, int], tool_key: Optional[str] = None) -> None:
+        """
+        Define o nível mínimo registrado.
+
+        Args:
+            level: Nível mínimo (chamadas abaixo dele são descartadas sem formatação)
+            tool_key: Ferramenta afetada; None altera o nível global
+        """
+        value = self.parse_level(level)
+        if tool_key is None:
+            self._min_level = value
+        else:
+            self._tool_levels[tool_key] = value
+
+    def clear_level(self, tool_key: str) -> None:
+        """Remove o nível próprio de uma ferramenta (volta a valer o global)."""
+        self._tool_levels.pop(tool_key, None)
+
+    def get_level(self, tool_key: Optional[str] = None) -> int:
+        """Retorna o nível mínimo efetivo (numérico) da ferramenta ou o global."""
+        if tool_key is None:
+            return self._min_level
+        return self._tool_levels.get(tool_key, self._min_level)
+
+    def configure_levels(self, levels: Dict[str, Any]) -> None:
+        """
+        Aplica níveis a partir de um dicionário (ex: preferências).
+
+        Args:
+            levels: {'default': 'INFO', 'file_index': 'WARNING', ...};
+                níveis inválidos são ignorados
+        """
+        for key, level in (levels or {}).items():
+            try:
+                self.set_level(level, None if key == 'default' else key)
+            except ValueError as e:
+                self.warning("system", "LogUtils", str(e))
+
+    def set_rate_limit(self, tool_key: str, per_second: Optional[int] = None,
+                       sample_every: Optional[int] = None, max_level: LogLevel = LogLevel.INFO) -> None:
+        """
+        Limita a frequência dos registros de uma ferramenta, por ponto de chamada.
+
+        Args:
+            tool_key: Ferramenta afetada
+            per_second: Máximo de registros por segundo em cada ponto
+            sample_every: Registrar apenas 1 a cada K chamadas de cada ponto
+            max_level: Maior nível afetado (níveis acima nunca são suprimidos)
+        """
+        self._limiters[tool_key] = RateLimiter(per_second, sample_every, max_level)
+
+    def clear_rate_limit(self, tool_key: str) -> None:
+        """Remove o limite de frequência de uma ferramenta."""
+        limiter = self._limiters.pop(tool_key, None)
+        if limiter is not None:
+            self._report_suppressed(tool_key, limiter)
+
+    def configure_limits(self, limits: Dict[str, Any]) -> None:
+        """
+        Aplica limites de frequência a partir de um dicionário (ex: preferências).
+
+        Args:
+            limits: {'image_merger': '20/s', 'ico_converter': '1/100', ...};
+                limites inválidos são ignorados
+        """
+        for tool_key, spec in (limits or {}).items():
+            try:
+                self._limiters[tool_key] = RateLimiter.parse(spec)
+            except ValueError as e:
+                self.warning("system", "LogUtils", str(e))
+
+    def get_limits(self) -> Dict[str, str]:
+        """Limites de frequência ativos, no formato de configure_limits()."""
+        limits = {}
+        for tool_key, limiter in self._limiters.items():
+            if limiter.max_level == LogLevel.INFO:
+                limits[tool_key] = limiter.describe()
+            else:
+                limits[tool_key] = {'per_second': limiter.per_second, 'sample_every': limiter.sample_every,
+                                    'max_level': limiter.max_level.value}
+        return limits
+
+    def _report_all_suppressed(self) -> None:
+        """Registra os resumos pendentes de todos os limitadores."""
+        for tool_key, limiter in list(self._limiters.items()):
+            self._report_suppressed(tool_key, limiter)
+
+    def _report_suppressed(self, tool_key: str, limiter: RateLimiter) -> None:
+        """Registra o resumo das contagens suprimidas ainda pendentes de um limitador."""
+        for label, count in limiter.drain():
+            self._submit_summary(tool_key, "LogUtils", label, count, limiter)
+
+    def _submit_summary(self, tool_key: str, class_name: str, label: str, count: int,
+                        limiter: RateLimiter) -> None:
+        """Grava a linha de resumo de registros suprimidos de um ponto de chamada."""
+        writer = self._writer or self._start()
+        writer.submit((time.time(), LogLevel.INFO.value, tool_key, class_name,
+                       f"{count} registros suprimidos em {label} (limite {limiter.describe()})",
+                       {"suppressed": count, "site": label, "limit": limiter.describe()}))
+
+    def is_enabled_for(self, level: LogLevel, tool_key: str) -> bool:
+        """Indica se uma chamada com esse nível e ferramenta seria registrada."""
+        return LEVEL_NUMBERS[level] >= self._tool_levels.get(tool_key, self._min_level)
+
+    def span(self, tool_key: str, class_name: str, name: str = None,
+             level: LogLevel = LogLevel.DEBUG, **attributes) -> Span:
+        """
+        Cria um span de medição de duração (bloco `with` ou decorador).
+
+        Args:
+            tool_key: Identificador da ferramenta (ToolKey.xxx)
+            class_name: Nome da classe medida
+            name: Nome da operação (no decorador, o padrão é o nome da função)
+            level: Nível do registro gerado ao final (padrão DEBUG)
+            **attributes: Atributos registrados em extra_data
+        """
+        return Span(self, level, tool_key, class_name, name, attributes)
+
+    @property
+    def trace_dir(self) -> Path:
+        """Pasta padrão dos arquivos de trace."""
+        return self.LOG_DIR / self.TRACE_DIR_NAME
+
+    def is_tracing(self) -> bool:
+        """Indica se há um trace sendo gravado."""
+        return self._trace is not None
+
+    def start_trace(self, path: Optional[Path] = None,
+                    max_events: int = TraceRecorder.DEFAULT_MAX_EVENTS) -> None:
+        """
+        Começa a gravar spans e registros de log em um trace.
+
+        Args:
+            path: Arquivo de saída usado por stop_trace() (padrão: pasta de traces)
+            max_events: Eventos mantidos em memória (os mais antigos são descartados)
+        """
+        if self._trace is not None:
+            return
+        self._trace_path = Path(path) if path else None
+        self._trace = TraceRecorder(max_events)
+        self.info("system", "LogUtils", "Gravação de trace iniciada")
+
+    def stop_trace(self, path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Encerra a gravação e exporta o trace (Chrome Trace Event JSON).
+
+        Args:
+            path: Arquivo de saída (padrão: o informado em start_trace ou um
+                nome com timestamp na pasta de traces)
+
+        Returns:
+            Caminho do arquivo gravado, ou None se não havia trace ativo
+        """
+        trace = self._trace
+        if trace is None:
+            return None
+        self._sync_process_queues()  # Spans de processos filhos ainda em trânsito
+        self._trace = None
+        path = Path(path) if path else (self._trace_path or TraceRecorder.default_path(self.trace_dir))
+        try:
+            path = trace.export(path)
+        except Exception as e:
+            self.error("system", "LogUtils", "Erro ao exportar trace: %s", e)
+            return None
+        self.info("system", "LogUtils", "Trace exportado: %s (%d eventos)", path, len(trace),
+                  extra_data={"path": str(path), "events": len(trace)})
+        return path
+
+    def _load_env_levels(self):
+        """Lê os níveis mínimos das variáveis de ambiente."""
+        levels = {}
+        if os.getenv(self.ENV_LEVEL):
+            levels['default'] = os.getenv(self.ENV_LEVEL)
+        for item in os.getenv(self.ENV_TOOL_LEVELS, '').split(','):
+            key, sep, level = item.partition('=')
+            if sep and key.strip():
+                levels[key.strip()] = level
+        for key, level in levels.items():
+            try:
+                self.set_level(level, None if key == 'default' else key)
+            except ValueError as e:
+                print(f"Variável de ambiente de log ignorada: {e}")
+
+        for item in os.getenv(self.ENV_LIMITS, '').split(','):
+            key, sep, spec = item.partition('=')
+            if sep and key.strip():
+                try:
+                    self._limiters[key.strip()] = RateLimiter.parse(spec)
+                except ValueError as e:
+                    print(f"Variável de ambiente de log ignorada: {e}")
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        Aguarda a gravação dos registros já enviados (inclusive os recebidos
+        de processos filhos).
+
+        Returns:
+            True se a gravação terminou dentro do prazo
+        """
+        if self._writer is None:
+            return True
+        received = self._sync_process_queues(timeout) if self._process_queues else True
+        return self._writer.flush(timeout) and received
+
+    def close(self):
+        """Grava os registros pendentes e encerra a gravação em segundo plano."""
+        self._stop_process_listeners()
+        self._report_all_suppressed()
+        if isinstance(self._trace, TraceRecorder):
+            self.stop_trace()
+        if self._writer is not None:
+            self._writer.close()
+
+    def log(self, level: LogLevel, tool_key: str, class_name: str,
+            message: Union[str, Callable[[], str]], *args,
+            extra_data: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None):
         """
         Registra um log no arquivo atual.
 
+        O nível é verificado antes de qualquer formatação; a chamada apenas
+        enfileira o registro e a gravação ocorre na thread de gravação.
+
         Args:
             level: Nível do log (DEBUG, INFO, etc.)
             tool_key: Identificador da ferramenta (ToolKey.xxx)
             class_name: Nome da classe que gerou o log
-            message: Mensagem do log
-            extra_data: Dados extras opcionais
+            message: Mensagem, string de formato (com args) ou função que retorna a mensagem
+            *args: Argumentos da string de formato (formatados com %)
+            extra_data: Dados extras opcionais, ou função que os retorna
         """
-        if self._current_log_file is None:
-            return
+        if LEVEL_NUMBERS[level] >= self._tool_levels.get(tool_key, self._min_level):
+            self._emit(level, tool_key, class_name, message, args, extra_data)
 
-        log_entry = {
-            "timestamp": TimeUtils.get_current_timestamp(),
-            "level": level.value,
-            "tool_key": tool_key,
-            "class_name": class_name,
-            "message": message,
-            "extra_data": extra_data or {}
-        }
+    def _emit(self, level: LogLevel, tool_key: str, class_name: str, message, args, extra_data,
+              site: Any = None):
+        """
+        Monta a mensagem de uma chamada habilitada e a envia para gravação.
+
+        Args:
+            site: Chave do ponto de chamada para o limite de frequência
+                (padrão: arquivo e linha de quem chamou debug/info/...)
+        """
+        limiter = self._limiters.get(tool_key)
+        if limiter is not None and level in limiter.levels:
+            if site is None:
+                frame = sys._getframe(2)
+                site = (frame.f_code, frame.f_lineno)
+            allowed, suppressed = limiter.allow(site, time.monotonic())
+            if suppressed:
+                self._submit_summary(tool_key, class_name, RateLimiter.site_label(site),
+                                     suppressed, limiter)
+            if not allowed:
+                return
+
+        writer = self._writer
+        if writer is None:
+            writer = self._start()
 
         try:
-            with open(self._current_log_file, 'a', encoding='utf-8') as f:
-                json.dump(log_entry, f, ensure_ascii=False)
-                f.write('\n')
+            if callable(message):
+                message = message(*args)
+            elif args:
+                message = message % args
+            if callable(extra_data):
+                extra_data = extra_data()
         except Exception as e:
-            print(f"Erro ao escrever log: {e}")
+            # Um log mal formatado nunca deve interromper quem o chamou
+            message = f"{message!r} {args!r} (erro de formatação: {e})"
+            extra_data = None
+
+        job_id = getattr(self._local, 'job_id', None)
+        if job_id is not None:
+            extra_data = dict(extra_data or {}, job_id=job_id)
+
+        trace = self._trace
+        if trace is not None and not (extra_data and "span_id" in extra_data):
+            thread = threading.current_thread()
+            trace.add_instant(message, tool_key, time.perf_counter_ns(), os.getpid(), thread.ident,
+                              thread.name, {"level": level.value, "class_name": class_name})
+
+        writer.submit((time.time(), level.value, tool_key, class_name, message, extra_data))
 
-    # Métodos convenientes para diferentes níveis
-    def debug(self, tool_key: str, class_name: str, message: str, extra_data=None):
-        self.log(LogLevel.DEBUG, tool_key, class_name, message, extra_data)
+    # Métodos convenientes para diferentes níveis (o filtro é repetido aqui
+    # para que chamadas desabilitadas custem apenas uma consulta ao dicionário)
+    def debug(self, tool_key: str, class_name: str, message, *args, extra_data=None):
+        if self._tool_levels.get(tool_key, self._min_level) <= self._DEBUG:
+            self._emit(LogLevel.DEBUG, tool_key, class_name, message, args, extra_data)
 
-    def info(self, tool_key: str, class_name: str, message: str, extra_data=None):
-        self.log(LogLevel.INFO, tool_key, class_name, message, extra_data)
+    def info(self, tool_key: str, class_name: str, message, *args, extra_data=None):
+        if self._tool_levels.get(tool_key, self._min_level) <= self._INFO:
+            self._emit(LogLevel.INFO, tool_key, class_name, message, args, extra_data)
 
-    def warning(self, tool_key: str, class_name: str, message: str, extra_data=None):
-        self.log(LogLevel.WARNING, tool_key, class_name, message, extra_data)
+    def warning(self, tool_key: str, class_name: str, message, *args, extra_data=None):
+        if self._tool_levels.get(tool_key, self._min_level) <= self._WARNING:
+            self._emit(LogLevel.WARNING, tool_key, class_name, message, args, extra_data)
 
-    def error(self, tool_key: str, class_name: str, message: str, extra_data=None):
-        self.log(LogLevel.ERROR, tool_key, class_name, message, extra_data)
+    def error(self, tool_key: str, class_name: str, message, *args, extra_data=None):
+        if self._tool_levels.get(tool_key, self._min_level) <= self._ERROR:
+            self._emit(LogLevel.ERROR, tool_key, class_name, message, args, extra_data)
 
-    def critical(self, tool_key: str, class_name: str, message: str, extra_data=None):
-        self.log(LogLevel.CRITICAL, tool_key, class_name, message, extra_data)
+    def critical(self, tool_key: str, class_name: str, message, *args, extra_data=None):
+        if self._tool_levels.get(tool_key, self._min_level) <= self._CRITICAL:
+            self._emit(LogLevel.CRITICAL, tool_key, class_name, message, args, extra_data)
 
 
 # Instância global do logger
-logger = LogUtils()
\ No newline at end of file
+logger = LogUtils()
@@ -19,6 +19,7 @@ class PDFUtil:
     TOOL_KEY = ToolKey.IMAGE_MERGER
 
     @staticmethod
+    @logger.span(TOOL_KEY, "PDFUtil")
     def create_pdf_from_images(
         image_paths: List[str],
         output_path: str,
@@ -44,7 +45,7 @@ class PDFUtil:
 
         try:
             logger.debug(PDFUtil.TOOL_KEY, "PDFUtil",
-                        f"Iniciando mesclagem PDF: {len(image_paths)} imagens -> {output_path}")
+                        "Iniciando mesclagem PDF: %d imagens -> %s", len(image_paths), output_path)
 
             pil_images = []
 
@@ -62,7 +63,7 @@ class PDFUtil:
                     
                     pil_images.append(img)
                     logger.debug(PDFUtil.TOOL_KEY, "PDFUtil",
-                                f"[{idx}/{len(image_paths)}] Imagem processada: {os.path.basename(img_path)}")
+                                "[%d/%d] Imagem processada: %s", idx, len(image_paths), os.path.basename(img_path))
 
                 except Exception as e:
                     logger.warning(PDFUtil.TOOL_KEY, "PDFUtil",
@@ -75,12 +76,13 @@ class PDFUtil:
                     first_img = pil_images[0]
                     remaining_imgs = pil_images[1:] if len(pil_images) > 1 else []
                     
-                    first_img.save(
-                        output_path,
-                        format='PDF',
-                        save_all=True,
-                        append_images=remaining_imgs
-                    )
+                    with logger.span(PDFUtil.TOOL_KEY, "PDFUtil", "save_pdf", pages=len(pil_images)):
+                        first_img.save(
+                            output_path,
+                            format='PDF',
+                            save_all=True,
+                            append_images=remaining_imgs
+                        )
                     
                     logger.info(PDFUtil.TOOL_KEY, "PDFUtil",
                                f"PDF criado com sucesso: {output_path} ({len(pil_images)} páginas)")
@@ -97,6 +99,7 @@ class PDFUtil:
             return False, f"✗ Erro na mesclagem: {str(e)}"
 
     @staticmethod
+    @logger.span(TOOL_KEY, "PDFUtil")
     def export_images_resized(
         image_paths: List[str],
         output_dir: str,
@@ -123,7 +126,7 @@ class PDFUtil:
             try:
                 os.makedirs(output_dir, exist_ok=True)
                 logger.debug(PDFUtil.TOOL_KEY, "PDFUtil",
-                            f"Diretório criado: {output_dir}")
+                            "Diretório criado: %s", output_dir)
             except Exception as e:
                 logger.error(PDFUtil.TOOL_KEY, "PDFUtil",
                             f"Erro ao criar diretório: {e}")
@@ -131,7 +134,7 @@ class PDFUtil:
 
         try:
             logger.debug(PDFUtil.TOOL_KEY, "PDFUtil",
-                        f"Exportando {len(image_paths)} imagens em PNG para {output_dir}")
+                        "Exportando %d imagens em PNG para %s", len(image_paths), output_dir)
 
             exported_count = 0
 
@@ -155,7 +158,7 @@ class PDFUtil:
                     exported_count += 1
                     
                     logger.debug(PDFUtil.TOOL_KEY, "PDFUtil",
-                                f"[{idx}/{len(image_paths)}] PNG exportado: {output_path}")
+                                "[%d/%d] PNG exportado: %s", idx, len(image_paths), output_path)
 
                 except Exception as e:
                     logger.warning(PDFUtil.TOOL_KEY, "PDFUtil",
@@ -172,6 +175,7 @@ class PDFUtil:
             return False, f"✗ Erro na exportação: {str(e)}"
 
     @staticmethod
+    @logger.span(TOOL_KEY, "PDFUtil")
     def process_images_batch(
         image_paths: List[str],
         output_dir: str,
@@ -213,7 +217,7 @@ class PDFUtil:
 
         try:
             logger.debug(PDFUtil.TOOL_KEY, "PDFUtil",
-                        f"Processando lote: {len(image_paths)} imagens, PDF={export_pdf}, PNG={export_png}")
+                        "Processando lote: %d imagens, PDF=%s, PNG=%s", len(image_paths), export_pdf, export_png)
 
             # Exportar PNGs se solicitado
             if export_png:
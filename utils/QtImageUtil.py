@@ -0,0 +1,108 @@
+"""
+QtImageUtil - Conversão de imagens Pillow para QImage/QPixmap.
+
+Converte o buffer raster do Pillow diretamente em QImage (sem codificar
+e decodificar PNG em memória), usado na geração de thumbnails dos plugins.
+"""
+
+from typing import Optional, Tuple
+from PIL import Image
+from PySide6.QtGui import QImage, QPixmap
+from utils.LogUtils import logger
+from utils.ToolKey import ToolKey
+
+
+class QtImageUtil:
+    """Utilitário para conversão de imagens Pillow em objetos Qt."""
+
+    TOOL_KEY = ToolKey.SYSTEM
+
+    # Modo Pillow -> (formato QImage, bytes por pixel)
+    MODE_MAP = {
+        'RGBA': (QImage.Format_RGBA8888, 4),
+        'RGB': (QImage.Format_RGB888, 3),
+        'L': (QImage.Format_Grayscale8, 1),
+    }
+
+    @staticmethod
+    def pil_to_qimage(img: Image.Image, copy: bool = True) -> QImage:
+        """
+        Converte uma imagem Pillow em QImage usando o buffer raster bruto.
+
+        Modos sem equivalente direto no Qt (P, LA, CMYK, ...) são
+        convertidos para RGBA antes da conversão.
+
+        Args:
+            img: Imagem Pillow
+            copy: Se True, retorna uma QImage independente do buffer
+                  intermediário. Use False apenas quando a QImage for
+                  consumida imediatamente (ex: QPixmap.fromImage).
+
+        Returns:
+            QImage com os pixels da imagem
+        """
+        qimg, _ = QtImageUtil._wrap_raster(img)
+        return qimg.copy() if copy else qimg
+
+    @staticmethod
+    def pil_to_qpixmap(img: Image.Image) -> QPixmap:
+        """
+        Converte uma imagem Pillow em QPixmap.
+
+        A QImage intermediária apenas referencia o buffer do Pillow;
+        a única cópia é a feita pelo próprio QPixmap.
+
+        Args:
+            img: Imagem Pillow
+
+        Returns:
+            QPixmap com os pixels da imagem
+        """
+        qimg, buffer = QtImageUtil._wrap_raster(img)
+        # `buffer` precisa continuar vivo até o QPixmap copiar os pixels
+        pixmap = QPixmap.fromImage(qimg)
+        del buffer
+        return pixmap
+
+    @staticmethod
+    def create_thumbnail(file_path: str, size: Tuple[int, int]) -> Optional[QPixmap]:
+        """
+        Gera a miniatura de um arquivo de imagem.
+
+        Args:
+            file_path: Caminho do arquivo de imagem
+            size: Tamanho máximo da miniatura (width, height)
+
+        Returns:
+            QPixmap com a miniatura ou None se erro
+        """
+        try:
+            with Image.open(file_path) as img:
+                img.thumbnail(size, Image.LANCZOS)
+                return QtImageUtil.pil_to_qpixmap(img)
+        except Exception as e:
+            logger.warning(QtImageUtil.TOOL_KEY, "QtImageUtil",
+                           f"Erro ao gerar thumbnail de {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def _wrap_raster(img: Image.Image) -> Tuple[QImage, bytes]:
+        """
+        Cria uma QImage que referencia o buffer raster da imagem.
+
+        Args:
+            img: Imagem Pillow
+
+        Returns:
+            Tupla (QImage, buffer). O buffer deve ser mantido vivo
+            enquanto a QImage for usada.
+        """
+        if img.mode not in QtImageUtil.MODE_MAP:
+            img = img.convert('RGBA')
+
+        qformat, bytes_per_pixel = QtImageUtil.MODE_MAP[img.mode]
+        width, height = img.size
+        buffer = img.tobytes('raw', img.mode)
+        # Linhas do Pillow não têm padding; informar o stride real ao Qt
+        qimg = QImage(buffer, width, height, width * bytes_per_pixel, qformat)
+        return qimg, buffer
@@ -26,4 +26,9 @@ class ToolKey:
     THEME = "theme"
     ICON_GENERATOR = "icon_generator"
     DRAGGABLE_TAB = "draggable_tab"
-    DRAGGABLE_TOOLBAR = "draggable_toolbar"
\ No newline at end of file
+    DRAGGABLE_TOOLBAR = "draggable_toolbar"
+    FILE_INDEX = "file_index"
+    FOLDER_WATCHER = "folder_watcher"
+    FOLDER_STATS = "folder_stats"
+    DUPLICATE_FINDER = "duplicate_finder"
+    FILE_SORT = "file_sort"
\ No newline at end of file
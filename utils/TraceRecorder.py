@@ -0,0 +1,129 @@
+"""
+TraceRecorder - Gravação de spans e eventos no formato Chrome Trace Event.
+
+Enquanto ativo, o LogUtils entrega a este gravador cada span concluído e
+cada registro de log emitido. O arquivo exportado (JSON) abre offline no
+Perfetto (ui.perfetto.dev) ou em chrome://tracing, com uma faixa por
+processo e por thread.
+
+Os tempos vêm de time.perf_counter_ns, o mesmo relógio monotônico dos
+spans, convertidos para microssegundos como o formato exige.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class TraceRecorder:
+    """Acumula eventos em memória e exporta no formato Chrome Trace Event."""
+
+    DEFAULT_MAX_EVENTS = 500_000  # Eventos mais antigos são descartados além disso
+    PROCESS_NAME = "MTL_UTIL"
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        """
+        Args:
+            max_events: Quantidade máxima de eventos mantidos em memória
+        """
+        self._events = deque(maxlen=max_events)
+        self._threads: Dict[tuple, str] = {}   # (pid, tid) -> nome da thread
+        self._processes: Dict[int, str] = {os.getpid(): self.PROCESS_NAME}
+        self.added = 0  # Total recebido (inclui os descartados pelo limite)
+        self.started_ns = time.perf_counter_ns()
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add_span(self, name: str, category: str, start_ns: int, duration_ns: int,
+                 pid: int, tid: int, thread_name: str, args: Dict[str, Any]) -> None:
+        """Registra um span concluído (evento completo, fase 'X')."""
+        self._threads[(pid, tid)] = thread_name
+        self.added += 1
+        self._events.append(('X', name, category, start_ns, duration_ns, pid, tid, args))
+
+    def add_instant(self, name: str, category: str, ts_ns: int, pid: int, tid: int,
+                    thread_name: str, args: Dict[str, Any]) -> None:
+        """Registra um evento pontual na faixa da thread (fase 'i')."""
+        self._threads[(pid, tid)] = thread_name
+        self.added += 1
+        self._events.append(('i', name, category, ts_ns, 0, pid, tid, args))
+
+    def name_process(self, pid: int, name: str) -> None:
+        """Define o nome exibido na faixa de um processo (ex: processos filhos)."""
+        self._processes[pid] = name
+
+    def to_events(self) -> list:
+        """Converte os eventos gravados em dicionários do formato Trace Event."""
+        events = []
+        processes = dict(self._processes)
+        for pid, _ in list(self._threads):
+            processes.setdefault(pid, f"{self.PROCESS_NAME} worker")  # Processos filhos
+        for pid, name in processes.items():
+            events.append({"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                           "args": {"name": f"{name} ({pid})"}})
+        for (pid, tid), name in list(self._threads.items()):
+            events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+                           "args": {"name": name}})
+
+        for phase, name, category, ts_ns, dur_ns, pid, tid, args in list(self._events):
+            event = {"ph": phase, "name": name, "cat": category or "",
+                     "ts": ts_ns / 1000.0, "pid": pid, "tid": tid, "args": args or {}}
+            if phase == 'X':
+                event["dur"] = dur_ns / 1000.0
+            else:
+                event["s"] = "t"
+            events.append(event)
+        return events
+
+    def export(self, path: Path) -> Path:
+        """
+        Grava o trace em um arquivo JSON.
+
+        Args:
+            path: Arquivo de saída
+
+        Returns:
+            Caminho gravado
+        """
+        with self._lock:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "traceEvents": self.to_events(),
+                "displayTimeUnit": "ms",
+                "otherData": {
+                    "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+                    "dropped_events": max(0, self.added - len(self._events)),
+                },
+            }
+            tmp = path.with_name(path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            os.replace(tmp, path)
+            return path
+
+    @staticmethod
+    def default_path(trace_dir: Path, prefix: str = "trace") -> Path:
+        """Nome de arquivo com timestamp dentro da pasta de traces."""
+        return Path(trace_dir) / f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+
+    @staticmethod
+    def resolve_env_path(value: Optional[str], trace_dir: Path) -> Optional[Path]:
+        """
+        Interpreta o valor da variável de ambiente de trace.
+
+        '1'/'true'/'on' usam a pasta padrão; outro valor é o arquivo de saída;
+        vazio, '0'/'false'/'off' desativam.
+        """
+        if not value or value.strip().lower() in ('0', 'false', 'off', 'no'):
+            return None
+        if value.strip().lower() in ('1', 'true', 'on', 'yes'):
+            return TraceRecorder.default_path(trace_dir)
+        return Path(value)